@@ -0,0 +1,108 @@
+import secrets
+import time
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from config import get_settings
+from services.skill_taxonomy import pinned_taxonomy
+from services.job_fit_analyzer import get_jd_profile
+from services.candidate_index import get_candidate_index
+from api.limits import check_text_size
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Most candidates returned by one search
+MAX_CANDIDATE_RESULTS = 100
+
+def require_candidate_api_key(x_api_key: Optional[str] = Header(None)):
+    """Candidate data is only served to callers holding the configured key, and to no one without a key."""
+    expected = get_settings().candidate_api_key
+    if not expected:
+        raise HTTPException(status_code=403, detail="Candidate endpoints are disabled (no API key is configured)")
+    if not (x_api_key and secrets.compare_digest(x_api_key, expected)):
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+router = APIRouter(prefix="/candidates", dependencies=[Depends(require_candidate_api_key)])
+
+class CandidateSearchRequest(BaseModel):
+    jobDescription: str
+    topN: Optional[int] = 20
+    domain: Optional[str] = None
+
+class CandidateProfileRequest(BaseModel):
+    extractedSkills: Dict[str, List[str]]
+    readinessScore: int
+    domain: Optional[str] = None
+    analysisId: Optional[str] = None
+
+@router.post("/search")
+async def search_candidates(request: CandidateSearchRequest):
+    """
+    Rank stored candidates against a job description.
+
+    Returns:
+    - Top N candidates by JD skill coverage (ties: readiness score)
+    - Matched and missing JD skills per candidate
+    """
+    check_text_size(request.jobDescription, "jobDescription")
+
+    try:
+        top_n = request.topN if request.topN is not None else 20
+        if top_n < 1 or top_n > MAX_CANDIDATE_RESULTS:
+            raise ValueError(f"topN must be between 1 and {MAX_CANDIDATE_RESULTS}")
+        if not request.jobDescription.strip():
+            raise ValueError("Job description is required")
+
+        started = time.perf_counter()
+        with pinned_taxonomy() as taxonomy:
+            jd_profile = get_jd_profile(request.jobDescription)
+            index = get_candidate_index()
+            results = index.search(jd_profile.skill_ids, top_n, request.domain)
+
+        return {
+            "results": results,
+            "count": len(results),
+            "jdSkills": list(jd_profile.skills_flat),
+            "indexedCandidates": index.candidate_count,
+            "tookMs": round((time.perf_counter() - started) * 1000, 2),
+            "taxonomyVersion": taxonomy.version
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching candidates: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error searching candidates: {str(e)}")
+
+@router.put("/{user_id}")
+async def index_candidate(user_id: str, request: CandidateProfileRequest):
+    """
+    Index a user's latest analysis as soon as it is saved, replacing the previous one.
+    """
+    try:
+        with pinned_taxonomy() as taxonomy:
+            index = get_candidate_index()
+            index.upsert({
+                "userId": user_id,
+                "analysisId": request.analysisId,
+                "domain": request.domain,
+                "readinessScore": request.readinessScore,
+                "extractedSkills": request.extractedSkills,
+                # Database timestamps are naive UTC
+                "analyzedAt": datetime.now(timezone.utc).replace(tzinfo=None),
+            })
+
+        return {"userId": user_id, "indexedCandidates": index.candidate_count, "taxonomyVersion": taxonomy.version}
+
+    except Exception as e:
+        logger.error(f"Error indexing candidate: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error indexing candidate: {str(e)}")
+
+@router.delete("/{user_id}")
+async def remove_candidate(user_id: str):
+    """Remove a user from candidate search."""
+    if not get_candidate_index().remove(user_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"userId": user_id, "removed": True}
@@ -0,0 +1,177 @@
+import json
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Callable, Dict, List, Optional, Tuple
+import orjson
+from config import get_settings
+from services.cache import LRUCache, content_hash
+from services.skill_taxonomy import get_taxonomy
+from services.nlp_engine import normalize_skill
+from services.role_recommender import get_all_roles, get_role_by_id, role_summary
+from services.learning_resources import get_resources_index, get_resource_id, load_resources
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/catalog")
+
+# Pagination limits
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Recommendation fields that come from the role catalog
+ROLE_CATALOG_FIELDS = {
+    "title", "difficulty", "description", "companyTypes", "avgSalary",
+    "growthPath", "requiredSkills", "preferredSkills", "minReadiness"
+}
+
+# Encoded catalog bodies and their ETags, keyed by catalog version and page
+_encoded = LRUCache(256)
+_file_versions: Dict[str, str] = {}
+
+def _file_version(name: str, load: Callable) -> str:
+    """Content hash of a static data file, computed once (the files are cached for the process lifetime)."""
+    if name not in _file_versions:
+        _file_versions[name] = content_hash(json.dumps(load(), sort_keys=True))[:12]
+    return _file_versions[name]
+
+def roles_version() -> str:
+    return _file_version("roles", get_all_roles)
+
+def resources_version() -> str:
+    # Resource ids are canonical skill ids, so they change with the taxonomy too
+    return f"{_file_version('resources', load_resources)}-{get_taxonomy().version}"
+
+def role_entries() -> List[Dict]:
+    return [role_summary(role) for role in get_all_roles()]
+
+def resource_entries() -> List[Dict]:
+    return [
+        {"id": resource_id, "skill": entry.get("skill", resource_id), "resources": entry.get("resources", [])}
+        for resource_id, entry in get_resources_index().items()
+    ]
+
+def skill_entries() -> List[Dict]:
+    """Canonical skills of the active taxonomy with their display names and categories."""
+    taxonomy = get_taxonomy()
+    categories: Dict[str, List[str]] = {skill: [] for skill in taxonomy.display_names}
+    for category, patterns in taxonomy.categories.items():
+        for pattern in patterns:
+            skill_categories = categories.setdefault(taxonomy.normalize(pattern), [])
+            if category not in skill_categories:
+                skill_categories.append(category)
+    return [
+        {"id": skill, "name": taxonomy.display_name(skill), "categories": categories[skill]}
+        for skill in sorted(categories)
+    ]
+
+def _page_bounds(offset: int, limit: Optional[int]) -> Tuple[int, int]:
+    limit = limit if limit is not None else DEFAULT_PAGE_SIZE
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return offset, limit
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+def catalog_response(request: Request, cache_key: Tuple, build: Callable[[], Dict]) -> Response:
+    """
+    Serve a catalog body with a content-hash ETag, answering conditional requests with 304.
+
+    Bodies are encoded once per catalog version and page, so repeat requests
+    cost a cache lookup.
+    """
+    cached = _encoded.get(cache_key)
+    if cached is None:
+        body = orjson.dumps(build())
+        cached = (body, f'"{content_hash(body.decode("utf-8"))[:16]}"')
+        _encoded.set(cache_key, cached)
+    body, etag = cached
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={get_settings().catalog_cache_max_age}",
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+def paginated(entries: List[Dict], version: str, offset: int, limit: int) -> Dict:
+    return {
+        "items": entries[offset:offset + limit],
+        "total": len(entries),
+        "offset": offset,
+        "limit": limit,
+        "version": version,
+    }
+
+# Analysis responses can reference catalog entries instead of inlining them
+def reference_resources(items: List[Dict]) -> List[Dict]:
+    """Replace curated resource lists with their resource catalog id (generic search suggestions stay inline)."""
+    referenced = []
+    for item in items:
+        resource_id = get_resource_id(item["skill"])
+        if resource_id is None:
+            referenced.append(item)
+        else:
+            referenced.append({**{k: v for k, v in item.items() if k != "resources"}, "resourceId": resource_id})
+    return referenced
+
+def reference_roles(recommendations: List[Dict]) -> List[Dict]:
+    """Keep only the user-specific fit fields of role recommendations; the rest is in the role catalog."""
+    return [{k: v for k, v in role.items() if k not in ROLE_CATALOG_FIELDS} for role in recommendations]
+
+@router.get("/roles")
+async def list_roles(request: Request, offset: int = 0, limit: Optional[int] = None):
+    """List internship roles (the static part of role recommendations)."""
+    offset, limit = _page_bounds(offset, limit)
+    version = roles_version()
+    return catalog_response(
+        request, ("roles", version, offset, limit),
+        lambda: paginated(role_entries(), version, offset, limit)
+    )
+
+@router.get("/roles/{role_id}")
+async def get_role(request: Request, role_id: str):
+    """Get one internship role."""
+    role = get_role_by_id(role_id)
+    if role is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return catalog_response(request, ("role", roles_version(), role_id), lambda: role_summary(role))
+
+@router.get("/resources")
+async def list_resources(request: Request, offset: int = 0, limit: Optional[int] = None):
+    """List curated learning resources, one entry per skill."""
+    offset, limit = _page_bounds(offset, limit)
+    version = resources_version()
+    return catalog_response(
+        request, ("resources", version, offset, limit),
+        lambda: paginated(resource_entries(), version, offset, limit)
+    )
+
+@router.get("/resources/{resource_id}")
+async def get_resource(request: Request, resource_id: str):
+    """Get the learning resources of one skill (id as referenced by `resourceId`)."""
+    resource_id = normalize_skill(resource_id)
+    entry = get_resources_index().get(resource_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return catalog_response(
+        request, ("resource", resources_version(), resource_id),
+        lambda: {"id": resource_id, "skill": entry.get("skill", resource_id), "resources": entry.get("resources", [])}
+    )
+
+@router.get("/skills")
+async def list_skills(request: Request, offset: int = 0, limit: Optional[int] = None):
+    """List the canonical skills of the active taxonomy."""
+    offset, limit = _page_bounds(offset, limit)
+    version = get_taxonomy().version
+    return catalog_response(
+        request, ("skills", version, offset, limit),
+        lambda: paginated(skill_entries(), version, offset, limit)
+    )
@@ -0,0 +1,85 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+from config import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+def check_text_size(text: Optional[str], field: str):
+    """Reject a text field longer than max_text_chars with 413."""
+    limit = get_settings().max_text_chars
+    if text and len(text) > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{field} is too long ({len(text)} characters, the limit is {limit})"
+        )
+
+class _BodyTooLarge(Exception):
+    pass
+
+class RequestSizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_request_mb with 413.
+
+    A declared Content-Length is checked before the endpoint runs; bodies sent
+    without one are counted as they stream in and cut off at the limit.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = int(get_settings().max_request_mb * MB)
+        if scope["type"] != "http" or limit <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        declared = Headers(scope=scope).get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(scope, receive, send, limit)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    too_large = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            # Body parsing turns the cut-off into a 400, which the 413 below replaces
+            if too_large:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            if response_started:
+                raise
+        if too_large and not response_started:
+            await self._reject(scope, receive, send, limit)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, limit: int):
+        logger.warning(f"Rejected oversized request body to {scope['path']}")
+        response = JSONResponse(
+            {"detail": f"Request body is too large (the limit is {limit / MB:g} MB)"},
+            status_code=413
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from api.profiling import require_profiling_token
+from services.memory_monitor import memory_stats, recycle_model, snapshot_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/memory", dependencies=[Depends(require_profiling_token)])
+
+@router.get("")
+async def memory_endpoint():
+    """Get RSS, SpaCy vocabulary size, document counts and the recycling policy."""
+    return memory_stats()
+
+@router.post("/snapshots")
+async def take_snapshot(label: str = ""):
+    """
+    Take a tracemalloc snapshot. The first one starts allocation tracing
+    (which slows allocations down) and is the baseline for later diffs.
+    """
+    return await run_in_threadpool(snapshot_store.take, label)
+
+@router.get("/snapshots")
+async def list_snapshots():
+    """List the kept snapshots, oldest first."""
+    return {"snapshots": snapshot_store.list()}
+
+@router.get("/snapshots/{snapshot_id}/diff")
+async def diff_snapshots(
+    snapshot_id: int,
+    against: Optional[int] = None,
+    limit: int = Query(25, ge=1, le=200)
+):
+    """Allocation growth by source line since an earlier snapshot (by default the previous one)."""
+    try:
+        return await run_in_threadpool(snapshot_store.diff, snapshot_id, against, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+@router.delete("/snapshots")
+async def clear_snapshots():
+    """Drop all snapshots and stop allocation tracing."""
+    snapshot_store.clear()
+    return {"tracing": False}
+
+@router.post("/recycle-model")
+async def recycle_model_endpoint():
+    """Swap in a fresh SpaCy model without dropping in-flight requests."""
+    try:
+        return await run_in_threadpool(recycle_model)
+    except Exception as e:
+        logger.error(f"Error recycling the SpaCy model: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error recycling the SpaCy model: {str(e)}")
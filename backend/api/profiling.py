@@ -0,0 +1,110 @@
+import random
+import secrets
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+from config import get_settings
+from services.profiler import ProfileStore, SlowRequestTracker, start_profiler, stop_profiler
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile-token"
+
+profile_store = ProfileStore(get_settings().profiling_max_stored)
+slow_requests = SlowRequestTracker(get_settings().profiling_slow_percent)
+
+def valid_profiling_token(token: Optional[str]) -> bool:
+    expected = get_settings().profiling_token
+    return bool(expected and token and secrets.compare_digest(token, expected))
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None)):
+    """Profiles expose inputs and internals, so they are only served to holders of the profiling token."""
+    if not valid_profiling_token(x_profile_token):
+        raise HTTPException(status_code=403, detail="Profiling is disabled or the token is invalid")
+
+router = APIRouter(prefix="/profiles", dependencies=[Depends(require_profiling_token)])
+
+@router.get("")
+async def list_profiles():
+    """List captured request profiles, newest first."""
+    return {"profiles": profile_store.list()}
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str):
+    """Get a profile as folded stacks (flamegraph.pl, speedscope, inferno)."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile["folded"])
+
+class ProfilingMiddleware:
+    """
+    Profile requests to the analysis routes (api/routes.py).
+
+    A request carrying a valid X-Profile-Token header is always profiled and
+    gets an X-Profile-Id response header. Besides that, a configurable share
+    of requests is profiled in the background and kept only when the request
+    turns out to be among the slowest N%.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes = None
+
+    def _profiled_route(self, scope: Scope) -> bool:
+        if self._routes is None:
+            self._routes = [
+                route for route in scope["app"].routes
+                if getattr(getattr(route, "endpoint", None), "__module__", None) == "api.routes"
+            ]
+        return any(route.matches(scope)[0] == Match.FULL for route in self._routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._profiled_route(scope):
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+        if token is not None:
+            if not valid_profiling_token(token):
+                response = JSONResponse({"detail": "Profiling is disabled or the token is invalid"}, status_code=403)
+                await response(scope, receive, send)
+                return
+            trigger = "header"
+        elif settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+            trigger = "slow"
+        else:
+            trigger = None
+
+        profiler = start_profiler(settings.profiling_interval_ms / 1000) if trigger else None
+        profile_id = profile_store.new_id() if profiler else None
+
+        async def send_with_profile_id(message: Message):
+            if message["type"] == "http.response.start" and profile_id and trigger == "header":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            duration = time.perf_counter() - started
+            slow = slow_requests.observe(duration)
+            if profiler is not None:
+                stacks = stop_profiler(profiler)
+                if trigger == "header" or slow:
+                    profile_store.add(
+                        profile_id, stacks, profiler.samples,
+                        method=scope["method"],
+                        path=scope["path"],
+                        durationMs=round(duration * 1000, 2),
+                        trigger=trigger
+                    )
+                    if trigger == "slow":
+                        logger.info(f"Captured profile {profile_id} of slow request {scope['path']} ({duration * 1000:.0f} ms)")
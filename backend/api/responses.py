@@ -0,0 +1,135 @@
+import gzip
+from typing import Dict, List, Optional
+import anyio
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Bodies at least this large are compressed in a worker thread instead of on the event loop
+OFFLOAD_MIN_SIZE = 16 * 1024
+
+# Always returned, so clients can tell which taxonomy a partial response came from
+ALWAYS_INCLUDED = {"taxonomyVersion"}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[List[str]]]:
+    """Split a `fields` query value ("a,b.c") into key paths. None or blank selects everything."""
+    if not fields or not fields.strip():
+        return None
+    paths = [[key.strip() for key in field.split(".")] for field in fields.split(",") if field.strip()]
+    for path in paths:
+        if not all(path):
+            raise HTTPException(status_code=400, detail=f"Invalid field: {'.'.join(path)}")
+    return paths
+
+
+def _select(value, paths: List[List[str]], prefix: str):
+    """Keep only the given key paths of a dict, or of every dict in a list."""
+    if isinstance(value, list):
+        return [_select(item, paths, prefix) for item in value]
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail=f"Field {prefix.rstrip('.')} has no sub-fields")
+
+    # Group paths by their first key; a bare key keeps the whole value
+    nested: Dict[str, Optional[List[List[str]]]] = {}
+    for path in paths:
+        key, rest = path[0], path[1:]
+        if key not in value:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {prefix}{key}")
+        if not rest:
+            nested[key] = None
+        elif nested.get(key, []) is not None:
+            nested.setdefault(key, []).append(rest)
+
+    return {
+        key: value[key] if rest is None else _select(value[key], rest, f"{prefix}{key}.")
+        for key, rest in nested.items()
+    }
+
+
+def select_fields(content: Dict, fields: Optional[str]) -> Dict:
+    """
+    Reduce a response to the sections a client asked for.
+
+    Args:
+        content: Full response body
+        fields: Comma-separated top-level keys, with dotted paths into nested
+            objects and lists of objects (e.g. "readinessScore,missingSkills.skill")
+
+    Returns:
+        The selected part of the response (everything when no fields are given)
+    """
+    paths = parse_fields(fields)
+    if paths is None:
+        return content
+    paths += [[key] for key in ALWAYS_INCLUDED if key in content]
+    return _select(content, paths, "")
+
+
+def fast_response(content: Dict, fields: Optional[str] = None, status_code: int = 200) -> ORJSONResponse:
+    """
+    Encode service output with orjson, bypassing response model validation.
+
+    Service functions already return plain JSON types, so validating them
+    against the response model again only costs time; the model stays on
+    the route for the API docs.
+    """
+    return ORJSONResponse(select_fields(content, fields), status_code=status_code)
+
+
+class CompressionMiddleware:
+    """
+    Gzip complete responses, compressing large bodies in a worker thread.
+
+    Streamed responses (NDJSON rankings, server-sent events) pass through
+    uncompressed so every chunk reaches the client as soon as it is sent.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start_message["headers"]))
+            start_message["headers"] = headers.raw
+            if message.get("more_body", False) or len(body) < self.minimum_size or "content-encoding" in headers:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= OFFLOAD_MIN_SIZE:
+                compressed = await anyio.to_thread.run_sync(self.compress, body)
+            else:
+                compressed = self.compress(body)
+
+            headers["Content-Encoding"] = "gzip"
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def compress(self, body: bytes) -> bytes:
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
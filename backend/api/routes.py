@@ -1,13 +1,30 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 from services.document_parser import parse_document, clean_text
-from services.nlp_engine import extract_skills_from_text
+from services.nlp_engine import extract_skills_from_text, get_nlp_batcher
+from services.skill_taxonomy import pinned_taxonomy, reload_taxonomy, get_taxonomy
 from services.gap_analyzer import analyze_gap
 from services.job_fit_analyzer import analyze_job_fit
+from services.job_ranker import ResumeProfile, score_job_batch, rank_job_fits, rank_key
 from services.role_recommender import recommend_roles
 from services.resume_feedback import analyze_resume_quality
+from services.incremental_analyzer import analyze_segments
+from services.market_profiles import get_database_market_profile, get_market_profile, get_mock_jobs
+from services.demand_trends import get_demand_trends, recency_weighted_frequency
+from services.job_index import get_job_index
+from api.limits import check_text_size
+from config import get_settings
+from api.responses import fast_response
+from api.catalog import reference_resources, reference_roles
+from services.single_flight import get_flight, request_key, single_flight_stats
+from services.memory_monitor import memory_stats
+import json
 import logging
+import secrets
+import time
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -15,57 +32,69 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Cache for mock jobs data
-_mock_jobs_cache = None
+# Most job descriptions accepted by one ranking request
+MAX_RANKED_JOBS = 100
+# Jobs scored per batch when streaming a ranking
+RANK_STREAM_BATCH_SIZE = 8
+# Most results returned by a job search
+MAX_SEARCH_RESULTS = 100
 
-def get_mock_jobs():
-    """Get or create cached mock jobs data."""
-    global _mock_jobs_cache
-    if _mock_jobs_cache is not None:
-        return _mock_jobs_cache
+def validate_recency_half_life(recency_half_life: Optional[float]):
+    """Reject a recency half-life (days) that isn't positive."""
+    if recency_half_life is not None and recency_half_life <= 0:
+        raise ValueError("recencyHalfLifeDays must be positive")
+
+def run_gap_analysis(
+    user_skills: Dict[str, List[str]],
+    job_descriptions: Optional[List[Dict]],
+    domain: Optional[str],
+    semantic: bool = False,
+    recency_half_life: Optional[float] = None
+) -> Dict:
+    """
+    Run gap analysis against the provided job descriptions, or else the domain's market profile:
+    built from the jobs database when it has postings for the domain, the built-in data otherwise.
+    With a recency half-life (days), the readiness score weights recent postings more heavily.
+    """
+    validate_recency_half_life(recency_half_life)
     
-    _mock_jobs_cache = {
-        "Frontend Developer": [
-            {"skills": ["React", "JavaScript", "CSS", "HTML", "TypeScript", "Tailwind", "Next.js", "Redux", "Git"]},
-            {"skills": ["Vue", "JavaScript", "HTML", "CSS", "Sass", "Webpack"]},
-            {"skills": ["React", "TypeScript", "MaterialUI", "Jest", "GraphQL"]},
-            {"skills": ["Angular", "TypeScript", "RxJS", "HTML", "SCSS"]},
-            {"skills": ["JavaScript", "React", "Node.js", "CSS", "Figma"]}
-        ] * 20,
-        
-        "Backend Developer": [
-            {"skills": ["Python", "Django", "SQL", "PostgreSQL", "Docker", "AWS", "Git", "Redis"]},
-            {"skills": ["Node.js", "Express", "MongoDB", "JavaScript", "TypeScript", "REST API"]},
-            {"skills": ["Java", "Spring Boot", "MySQL", "Microservices", "Kafka"]},
-            {"skills": ["Go", "PostgreSQL", "Docker", "Kubernetes", "gRPC"]},
-            {"skills": ["Python", "Flask", "SQLAlchemy", "Celery", "RabbitMQ"]}
-        ] * 20,
-        
-        "Data Analyst": [
-            {"skills": ["Python", "Pandas", "NumPy", "SQL", "Tableau", "Excel", "Statistics"]},
-            {"skills": ["R", "SQL", "PowerBI", "Data Visualization", "Excel"]},
-            {"skills": ["Python", "SQL", "Machine Learning", "Scikit-Learn", "Jupyter"]},
-            {"skills": ["Excel", "VBA", "SQL", "Reporting", "Google Sheets"]},
-            {"skills": ["Python", "Spark", "Hadoop", "SQL", "AWS"]}
-        ] * 20,
-
-        "Full Stack Developer": [
-            {"skills": ["React", "Node.js", "Express", "MongoDB", "JavaScript", "TypeScript", "HTML", "CSS"]},
-            {"skills": ["Vue", "Laravel", "PHP", "MySQL", "JavaScript", "Tailwind"]},
-            {"skills": ["Next.js", "PostgreSQL", "Prisma", "TypeScript", "Tailwind", "Vercel"]},
-            {"skills": ["Angular", "Java", "Spring Boot", "SQL", "TypeScript"]},
-            {"skills": ["MERN Stack", "AWS", "Docker", "Git", "CI/CD"]}
-        ] * 20,
-
-        "Mobile Developer": [
-            {"skills": ["Flutter", "Dart", "Firebase", "Android", "iOS"]},
-            {"skills": ["React Native", "JavaScript", "TypeScript", "Redux", "Mobile UI"]},
-            {"skills": ["Swift", "iOS", "Xcode", "CoreData", "SwiftUI"]},
-            {"skills": ["Kotlin", "Android", "Jetpack Compose", "Java", "Gradle"]},
-            {"skills": ["Flutter", "Bloc", "Clean Architecture", "Git", "App Store"]}
-        ] * 20
-    }
-    return _mock_jobs_cache
+    if job_descriptions:
+        weights = recency_weighted_frequency(job_descriptions, recency_half_life) if recency_half_life else None
+        return analyze_gap(user_skills, job_descriptions, semantic=semantic, recency_weights=weights)
+    
+    try:
+        profile = get_database_market_profile(domain) or get_market_profile(domain)
+        weights = None
+        if recency_half_life:
+            # Trends hold the same postings as the profile: the domain's jobs, or the built-in ones
+            trends = get_demand_trends()
+            weights = trends.recency_weights(domain if domain in trends.domains else profile.domain, recency_half_life)
+    except Exception as e:
+        # The built-in data still gives an answer while the jobs database is unavailable
+        logger.error(f"Jobs database unavailable, using the built-in market profile: {str(e)}", exc_info=True)
+        profile = get_market_profile(domain)
+        weights = None
+        if recency_half_life:
+            weights = recency_weighted_frequency(get_mock_jobs().get(profile.domain, []), recency_half_life)
+    return analyze_gap(user_skills, market_profile=profile, semantic=semantic, recency_weights=weights)
+
+# Identical concurrent computations (e.g. a class uploading the same template resume) share one execution
+skill_extraction_flight = get_flight("extract-skills")
+gap_analysis_flight = get_flight("analyze-gap")
+
+def run_pinned(taxonomy, fn, *args):
+    """Run fn with a request's taxonomy snapshot pinned (single-flight calls run in worker threads)."""
+    with pinned_taxonomy(taxonomy):
+        return fn(*args)
+
+def skill_extraction_key(text: str, taxonomy) -> str:
+    return request_key(text, taxonomy.version)
+
+def gap_analysis_key(request: "GapAnalysisRequest", taxonomy) -> str:
+    return request_key(
+        request.userSkills, request.jobDescriptions, request.domain, bool(request.semanticMatching),
+        request.recencyHalfLifeDays, taxonomy.version
+    )
 
 # Request/Response Models
 class SkillExtractionRequest(BaseModel):
@@ -74,11 +103,14 @@ class SkillExtractionRequest(BaseModel):
 class SkillExtractionResponse(BaseModel):
     skills: Dict[str, List[str]]
     totalSkills: int
+    taxonomyVersion: str
 
 class GapAnalysisRequest(BaseModel):
     userSkills: Dict[str, List[str]]
     jobDescriptions: Optional[List[Dict]] = None
     domain: Optional[str] = "Frontend Developer"
+    semanticMatching: Optional[bool] = False
+    recencyHalfLifeDays: Optional[float] = None
 
 class GapAnalysisResponse(BaseModel):
     readinessScore: int
@@ -87,21 +119,50 @@ class GapAnalysisResponse(BaseModel):
     generatedRoadmap: List[Dict]
     totalMarketSkills: int
     userSkillCount: int
+    taxonomyVersion: str
+    partialMatches: Optional[List[Dict]] = None
 
 class JobFitRequest(BaseModel):
     userSkills: Dict[str, List[str]]
     jobDescription: str
     resumeText: Optional[str] = ""
     domain: Optional[str] = ""
+    semanticMatching: Optional[bool] = False
+
+class JobPostingInput(BaseModel):
+    description: str
+    id: Optional[str] = None
+    title: Optional[str] = ""
+    company: Optional[str] = ""
+
+class JobFitRankRequest(BaseModel):
+    userSkills: Dict[str, List[str]]
+    jobDescriptions: List[JobPostingInput]
+    resumeText: Optional[str] = ""
+    semanticMatching: Optional[bool] = False
+    maxResults: Optional[int] = None
+    stream: Optional[bool] = False
+
+class JobSearchRequest(BaseModel):
+    userSkills: Dict[str, List[str]]
+    k: Optional[int] = 10
+    domain: Optional[str] = None
 
 class RoleRecommendRequest(BaseModel):
     userSkills: Dict[str, List[str]]
     readinessScore: int
     maxRoles: Optional[int] = 5
+    semanticMatching: Optional[bool] = False
 
 class ResumeFeedbackRequest(BaseModel):
     resumeText: str
 
+class IncrementalAnalysisRequest(BaseModel):
+    text: str
+    baseAnalysisId: Optional[str] = None
+    jobDescriptions: Optional[List[Dict]] = None
+    domain: Optional[str] = None
+
 # Routes
 @router.post("/parse-document", response_model=SkillExtractionResponse)
 async def parse_document_endpoint(file: UploadFile = File(...)):
@@ -133,7 +194,11 @@ async def parse_document_endpoint(file: UploadFile = File(...)):
         cleaned_text = clean_text(text)
         
         # Extract skills
-        skills = extract_skills_from_text(cleaned_text)
+        with pinned_taxonomy() as taxonomy:
+            skills = await skill_extraction_flight.do_async(
+                skill_extraction_key(cleaned_text, taxonomy),
+                run_pinned, taxonomy, extract_skills_from_text, cleaned_text, taxonomy
+            )
         
         # Count total skills
         total_skills = sum(len(skill_list) for skill_list in skills.values())
@@ -142,7 +207,8 @@ async def parse_document_endpoint(file: UploadFile = File(...)):
         
         return {
             "skills": skills,
-            "totalSkills": total_skills
+            "totalSkills": total_skills,
+            "taxonomyVersion": taxonomy.version
         }
     
     except ValueError as e:
@@ -157,58 +223,71 @@ async def extract_skills_endpoint(request: SkillExtractionRequest):
     """
     Extract technical skills from plain text.
     """
+    check_text_size(request.text, "text")
+
     try:
         if not request.text or len(request.text.strip()) < 10:
             raise ValueError("Text is too short")
         
         # Extract skills
-        skills = extract_skills_from_text(request.text)
+        with pinned_taxonomy() as taxonomy:
+            skills = await skill_extraction_flight.do_async(
+                skill_extraction_key(request.text, taxonomy),
+                run_pinned, taxonomy, extract_skills_from_text, request.text, taxonomy
+            )
         
         # Count total skills
         total_skills = sum(len(skill_list) for skill_list in skills.values())
         
         return {
             "skills": skills,
-            "totalSkills": total_skills
+            "totalSkills": total_skills,
+            "taxonomyVersion": taxonomy.version
         }
     
     except Exception as e:
         logger.error(f"Error extracting skills: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error extracting skills: {str(e)}")
 
-@router.post("/analyze-gap", response_model=GapAnalysisResponse)
-async def analyze_gap_endpoint(request: GapAnalysisRequest):
+@router.post("/analyze-gap", response_model=GapAnalysisResponse, response_model_exclude_none=True)
+async def analyze_gap_endpoint(request: GapAnalysisRequest, fields: Optional[str] = None, catalogRefs: bool = False):
     """
     Perform gap analysis between user skills and market demand.
     Returns readiness score, matched/missing skills, and learning roadmap.
+    `fields` (e.g. "readinessScore,missingSkills.skill") limits the response to the listed sections.
+    `catalogRefs` replaces roadmap resource lists with `resourceId`s from /api/catalog/resources.
     """
     try:
         if request.userSkills is None:
             raise ValueError("User skills cannot be None")
+        validate_recency_half_life(request.recencyHalfLifeDays)
 
         logger.info(f"Analyzing gap for domain: '{request.domain}'")
         
-        # Use provided job descriptions or mock data based on domain
-        jobs = request.jobDescriptions
-        
-        if not jobs:
-            # Use cached mock jobs
-            mock_jobs = get_mock_jobs()
-            jobs = mock_jobs.get(request.domain) or mock_jobs.get("Frontend Developer")
-        
-        # Perform gap analysis
-        analysis = analyze_gap(request.userSkills, jobs)
+        # Perform gap analysis against provided jobs or the domain's market profile
+        with pinned_taxonomy() as taxonomy:
+            analysis = await gap_analysis_flight.do_async(
+                gap_analysis_key(request, taxonomy),
+                run_pinned, taxonomy, run_gap_analysis,
+                request.userSkills, request.jobDescriptions, request.domain, bool(request.semanticMatching),
+                request.recencyHalfLifeDays
+            )
+        analysis["taxonomyVersion"] = taxonomy.version
+        if catalogRefs:
+            analysis["generatedRoadmap"] = reference_resources(analysis["generatedRoadmap"])
         
         logger.info(f"Gap analysis completed. Readiness score: {analysis.get('readinessScore')}")
-        
-        return analysis
     
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error performing gap analysis: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error performing gap analysis: {str(e)}")
+    
+    return fast_response(analysis, fields)
 
 @router.post("/analyze-job-fit")
-async def analyze_job_fit_endpoint(request: JobFitRequest):
+async def analyze_job_fit_endpoint(request: JobFitRequest, fields: Optional[str] = None, catalogRefs: bool = False):
     """
     Analyze how well a user's resume matches a specific job description.
     
@@ -217,32 +296,162 @@ async def analyze_job_fit_endpoint(request: JobFitRequest):
     - Matched/missing/extra skills
     - ATS compatibility score
     - Improvement tips
+    
+    `fields` limits the response to the listed sections; `catalogRefs` replaces
+    resource lists with `resourceId`s from /api/catalog/resources.
     """
+    check_text_size(request.jobDescription, "jobDescription")
+    check_text_size(request.resumeText, "resumeText")
+
     try:
         logger.info(f"Analyzing job fit for domain: {request.domain}")
         
         if not request.jobDescription or len(request.jobDescription.strip()) < 50:
             raise ValueError("Job description is too short. Please provide more details.")
         
-        result = analyze_job_fit(
-            user_skills=request.userSkills,
-            job_description=request.jobDescription,
-            resume_text=request.resumeText or "",
-            domain=request.domain or ""
-        )
+        # Skill extraction waits on the NLP batcher, so it runs in a worker thread, not on the event loop
+        with pinned_taxonomy() as taxonomy:
+            result = await run_in_threadpool(
+                run_pinned, taxonomy, analyze_job_fit,
+                request.userSkills, request.jobDescription, request.resumeText or "", request.domain or "",
+                bool(request.semanticMatching)
+            )
+        result["taxonomyVersion"] = taxonomy.version
+        if catalogRefs:
+            result["missingWithResources"] = reference_resources(result["missingWithResources"])
         
         logger.info(f"Job fit analysis completed. Match: {result.get('matchPercentage')}%")
-        
-        return result
     
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error analyzing job fit: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error analyzing job fit: {str(e)}")
+    
+    return fast_response(result, fields)
+
+def validate_ranked_jobs(jobs: List[JobPostingInput], max_results: Optional[int] = None) -> List[Dict]:
+    """Check a ranking request's job descriptions and result count, and convert the jobs to plain dicts."""
+    if max_results is not None and max_results < 1:
+        raise ValueError("maxResults must be at least 1")
+    if not jobs:
+        raise ValueError("Provide at least one job description")
+    if len(jobs) > MAX_RANKED_JOBS:
+        raise ValueError(f"At most {MAX_RANKED_JOBS} job descriptions can be ranked at once")
+    for index, job in enumerate(jobs):
+        if len(job.description.strip()) < 50:
+            raise ValueError(f"Job description {index + 1} is too short. Please provide more details.")
+    return [job.model_dump() for job in jobs]
+
+async def stream_job_fits(request: JobFitRankRequest, jobs: List[Dict]):
+    """
+    Yield NDJSON lines: one "result" line per job as its batch finishes,
+    then a final "ranking" line with the job indices best fit first.
+    """
+    with pinned_taxonomy() as taxonomy:
+        resume = await run_in_threadpool(
+            ResumeProfile, request.userSkills, request.resumeText or "", bool(request.semanticMatching)
+        )
+    
+    def score_batch(start: int) -> List[Dict]:
+        # Runs in a worker thread, so the request's taxonomy snapshot is pinned again there
+        with pinned_taxonomy(taxonomy):
+            return score_job_batch(resume, jobs[start:start + RANK_STREAM_BATCH_SIZE], start)
+    
+    results = []
+    for start in range(0, len(jobs), RANK_STREAM_BATCH_SIZE):
+        for result in await run_in_threadpool(score_batch, start):
+            results.append(result)
+            yield json.dumps({"type": "result", "result": result}) + "\n"
+    
+    results.sort(key=rank_key)
+    if request.maxResults is not None:
+        results = results[:request.maxResults]
+    yield json.dumps({
+        "type": "ranking",
+        "ranking": [result["index"] for result in results],
+        "count": len(results),
+        "taxonomyVersion": taxonomy.version
+    }) + "\n"
+
+@router.post("/rank-job-fit")
+async def rank_job_fit_endpoint(request: JobFitRankRequest):
+    """
+    Rank many job descriptions by how well one resume fits them.
+    
+    The resume is prepared once and new job descriptions are extracted in
+    batches. With stream=true the response is NDJSON: a line per job as it
+    is scored, then a line with the final ranking.
+    
+    Returns:
+    - Jobs best fit first, with match percentage, fit level and ATS score
+    - Matched skills and the top missing skills per job
+    """
+    check_text_size(request.resumeText, "resumeText")
+    for index, job in enumerate(request.jobDescriptions):
+        check_text_size(job.description, f"Job description {index + 1}")
+
+    try:
+        jobs = validate_ranked_jobs(request.jobDescriptions, request.maxResults)
+        logger.info(f"Ranking job fit for {len(jobs)} job descriptions")
+        
+        if request.stream:
+            return StreamingResponse(stream_job_fits(request, jobs), media_type="application/x-ndjson")
+        
+        with pinned_taxonomy() as taxonomy:
+            results = await run_in_threadpool(
+                run_pinned, taxonomy, rank_job_fits,
+                request.userSkills, jobs, request.resumeText or "", bool(request.semanticMatching), request.maxResults
+            )
+        
+        return {
+            "results": results,
+            "count": len(results),
+            "totalJobs": len(jobs),
+            "taxonomyVersion": taxonomy.version
+        }
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error ranking job fit: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error ranking job fit: {str(e)}")
+
+@router.post("/jobs/search")
+async def search_jobs_endpoint(request: JobSearchRequest):
+    """
+    Find the stored job postings that best fit a skill profile.
+    
+    Returns:
+    - Top k jobs with score, skill coverage and matched/missing skills
+    - Size of the searched index
+    """
+    try:
+        k = request.k if request.k is not None else 10
+        if k < 1 or k > MAX_SEARCH_RESULTS:
+            raise ValueError(f"k must be between 1 and {MAX_SEARCH_RESULTS}")
+        
+        started = time.perf_counter()
+        with pinned_taxonomy() as taxonomy:
+            index = get_job_index()
+            results = index.search(request.userSkills, k, request.domain)
+        
+        return {
+            "results": results,
+            "count": len(results),
+            "indexedJobs": index.live_count,
+            "tookMs": round((time.perf_counter() - started) * 1000, 2),
+            "taxonomyVersion": taxonomy.version
+        }
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching jobs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error searching jobs: {str(e)}")
 
 @router.post("/recommend-roles")
-async def recommend_roles_endpoint(request: RoleRecommendRequest):
+async def recommend_roles_endpoint(request: RoleRecommendRequest, fields: Optional[str] = None, catalogRefs: bool = False):
     """
     Recommend suitable internship roles based on user's skills and readiness.
     
@@ -250,26 +459,34 @@ async def recommend_roles_endpoint(request: RoleRecommendRequest):
     - List of recommended roles with fit scores
     - Skill coverage analysis
     - Growth path information
+    
+    `fields` (e.g. "recommendations.title,recommendations.fitScore") limits the response to the listed sections.
+    `catalogRefs` leaves out the static role details served by /api/catalog/roles.
     """
     try:
         logger.info(f"Recommending roles for readiness score: {request.readinessScore}")
         
-        recommendations = recommend_roles(
-            user_skills=request.userSkills,
-            readiness_score=request.readinessScore,
-            max_roles=request.maxRoles or 5
-        )
+        with pinned_taxonomy() as taxonomy:
+            recommendations = recommend_roles(
+                user_skills=request.userSkills,
+                readiness_score=request.readinessScore,
+                max_roles=request.maxRoles or 5,
+                semantic=bool(request.semanticMatching)
+            )
+        if catalogRefs:
+            recommendations = reference_roles(recommendations)
         
         logger.info(f"Generated {len(recommendations)} role recommendations")
-        
-        return {
-            "recommendations": recommendations,
-            "count": len(recommendations)
-        }
     
     except Exception as e:
         logger.error(f"Error recommending roles: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error recommending roles: {str(e)}")
+    
+    return fast_response({
+        "recommendations": recommendations,
+        "count": len(recommendations),
+        "taxonomyVersion": taxonomy.version
+    }, fields)
 
 @router.post("/resume-feedback")
 async def resume_feedback_endpoint(request: ResumeFeedbackRequest):
@@ -283,6 +500,8 @@ async def resume_feedback_endpoint(request: ResumeFeedbackRequest):
     - Quantified achievements
     - Bullet point quality
     """
+    check_text_size(request.resumeText, "resumeText")
+
     try:
         logger.info("Analyzing resume quality...")
         
@@ -301,6 +520,75 @@ async def resume_feedback_endpoint(request: ResumeFeedbackRequest):
         logger.error(f"Error analyzing resume: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
 
+def run_incremental_analysis(request: "IncrementalAnalysisRequest") -> Dict:
+    """Analyze resume text segment by segment, plus a gap analysis when a domain or job descriptions are given."""
+    result = analyze_segments(request.text, request.baseAnalysisId)
+    if request.domain or request.jobDescriptions:
+        result["gapAnalysis"] = run_gap_analysis(result["skills"], request.jobDescriptions, request.domain)
+    return result
+
+@router.post("/analyze-resume/incremental")
+async def analyze_resume_incremental_endpoint(request: IncrementalAnalysisRequest):
+    """
+    Analyze resume text, re-using results from a previous analysis of it.
+    
+    Send the analysisId of the previous response as baseAnalysisId; only
+    paragraphs that changed since then are re-extracted and re-scored.
+    
+    Returns:
+    - Skills and resume feedback for the full text
+    - Gap analysis when a domain or job descriptions are given
+    - A new analysisId to use as the base for the next edit
+    """
+    check_text_size(request.text, "text")
+
+    try:
+        if not request.text or len(request.text.strip()) < 10:
+            raise ValueError("Text is too short")
+        
+        with pinned_taxonomy() as taxonomy:
+            return await run_in_threadpool(run_pinned, taxonomy, run_incremental_analysis, request)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error analyzing resume incrementally: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
+
+@router.get("/taxonomy")
+async def taxonomy_endpoint():
+    """Get the active skill taxonomy version and pattern counts."""
+    return get_taxonomy().summary()
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """A reload rebuilds every index and cache keyed on the taxonomy version, so only admin token holders may force one."""
+    expected = get_settings().taxonomy_admin_token
+    if not (expected and x_admin_token and secrets.compare_digest(x_admin_token, expected)):
+        raise HTTPException(status_code=403, detail="Taxonomy reloads are disabled or the token is invalid")
+
+@router.post("/taxonomy/reload", dependencies=[Depends(require_admin_token)])
+async def reload_taxonomy_endpoint():
+    """
+    Recompile the skill taxonomy from its data file and swap it in.
+    Requests already in flight finish on the version they started with.
+    """
+    try:
+        taxonomy = await run_in_threadpool(reload_taxonomy)
+        return taxonomy.summary()
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reloading taxonomy: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error reloading taxonomy: {str(e)}")
+
+@router.get("/metrics")
+async def metrics_endpoint():
+    """Get request coalescing, NLP batching and memory counters."""
+    batcher = get_nlp_batcher()
+    return {
+        "singleFlight": single_flight_stats(),
+        "nlpBatching": batcher.stats() if batcher else None,
+        "memory": memory_stats()
+    }
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
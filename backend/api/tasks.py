@@ -0,0 +1,352 @@
+import asyncio
+import base64
+import json
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from typing import Dict, Optional
+from config import get_settings
+from services.task_queue import TaskQueue, TaskWorkerPool, PermanentTaskError, QUEUED, DONE, FAILED
+from services.document_parser import parse_document, clean_text
+from services.nlp_engine import extract_skills_from_text
+from services.skill_taxonomy import pinned_taxonomy
+from services.job_fit_analyzer import analyze_job_fit
+from services.job_ranker import rank_job_fits
+from services.role_recommender import recommend_roles
+from services.resume_feedback import analyze_resume_quality
+from api.limits import check_text_size
+from api.routes import (
+    run_gap_analysis,
+    run_pinned,
+    skill_extraction_flight,
+    skill_extraction_key,
+    gap_analysis_flight,
+    gap_analysis_key,
+    SkillExtractionRequest,
+    GapAnalysisRequest,
+    JobFitRequest,
+    JobFitRankRequest,
+    validate_ranked_jobs,
+    validate_recency_half_life,
+    RoleRecommendRequest,
+    ResumeFeedbackRequest,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/tasks")
+
+_queue: Optional[TaskQueue] = None
+
+def get_task_queue() -> TaskQueue:
+    """Get the shared task queue, opening its database on first use."""
+    global _queue
+    if _queue is None:
+        settings = get_settings()
+        _queue = TaskQueue(settings.task_queue_path, result_ttl=settings.task_result_ttl)
+    return _queue
+
+# Task handlers: each takes the stored payload and returns the same body the synchronous endpoint would
+def _validate(model, payload: Dict):
+    try:
+        return model.model_validate(payload)
+    except ValidationError as e:
+        raise PermanentTaskError(str(e))
+
+def run_parse_document_task(payload: Dict) -> Dict:
+    file_bytes = base64.b64decode(payload["data"])
+    text = parse_document(file_bytes, payload["filename"])
+
+    if not text or len(text.strip()) < 50:
+        raise PermanentTaskError("Could not extract sufficient text from document")
+
+    cleaned_text = clean_text(text)
+    with pinned_taxonomy() as taxonomy:
+        skills = skill_extraction_flight.do(
+            skill_extraction_key(cleaned_text, taxonomy),
+            run_pinned, taxonomy, extract_skills_from_text, cleaned_text, taxonomy
+        )
+
+    return {
+        "skills": skills,
+        "totalSkills": sum(len(skill_list) for skill_list in skills.values()),
+        "taxonomyVersion": taxonomy.version
+    }
+
+def run_extract_skills_task(payload: Dict) -> Dict:
+    request = _validate(SkillExtractionRequest, payload)
+
+    with pinned_taxonomy() as taxonomy:
+        skills = skill_extraction_flight.do(
+            skill_extraction_key(request.text, taxonomy),
+            run_pinned, taxonomy, extract_skills_from_text, request.text, taxonomy
+        )
+
+    return {
+        "skills": skills,
+        "totalSkills": sum(len(skill_list) for skill_list in skills.values()),
+        "taxonomyVersion": taxonomy.version
+    }
+
+def run_analyze_gap_task(payload: Dict) -> Dict:
+    request = _validate(GapAnalysisRequest, payload)
+
+    with pinned_taxonomy() as taxonomy:
+        analysis = gap_analysis_flight.do(
+            gap_analysis_key(request, taxonomy),
+            run_pinned, taxonomy, run_gap_analysis,
+            request.userSkills, request.jobDescriptions, request.domain, bool(request.semanticMatching),
+            request.recencyHalfLifeDays
+        )
+    analysis["taxonomyVersion"] = taxonomy.version
+    return analysis
+
+def run_analyze_job_fit_task(payload: Dict) -> Dict:
+    request = _validate(JobFitRequest, payload)
+
+    with pinned_taxonomy() as taxonomy:
+        result = analyze_job_fit(
+            user_skills=request.userSkills,
+            job_description=request.jobDescription,
+            resume_text=request.resumeText or "",
+            domain=request.domain or "",
+            semantic=bool(request.semanticMatching)
+        )
+    result["taxonomyVersion"] = taxonomy.version
+    return result
+
+def run_rank_job_fit_task(payload: Dict) -> Dict:
+    request = _validate(JobFitRankRequest, payload)
+    try:
+        jobs = validate_ranked_jobs(request.jobDescriptions, request.maxResults)
+    except ValueError as e:
+        raise PermanentTaskError(str(e))
+
+    with pinned_taxonomy() as taxonomy:
+        results = rank_job_fits(
+            user_skills=request.userSkills,
+            jobs=jobs,
+            resume_text=request.resumeText or "",
+            semantic=bool(request.semanticMatching),
+            max_results=request.maxResults
+        )
+
+    return {
+        "results": results,
+        "count": len(results),
+        "totalJobs": len(jobs),
+        "taxonomyVersion": taxonomy.version
+    }
+
+def run_recommend_roles_task(payload: Dict) -> Dict:
+    request = _validate(RoleRecommendRequest, payload)
+
+    with pinned_taxonomy() as taxonomy:
+        recommendations = recommend_roles(
+            user_skills=request.userSkills,
+            readiness_score=request.readinessScore,
+            max_roles=request.maxRoles or 5,
+            semantic=bool(request.semanticMatching)
+        )
+
+    return {
+        "recommendations": recommendations,
+        "count": len(recommendations),
+        "taxonomyVersion": taxonomy.version
+    }
+
+def run_resume_feedback_task(payload: Dict) -> Dict:
+    request = _validate(ResumeFeedbackRequest, payload)
+    return analyze_resume_quality(request.resumeText)
+
+TASK_HANDLERS = {
+    "parse-document": run_parse_document_task,
+    "extract-skills": run_extract_skills_task,
+    "analyze-gap": run_analyze_gap_task,
+    "analyze-job-fit": run_analyze_job_fit_task,
+    "rank-job-fit": run_rank_job_fit_task,
+    "recommend-roles": run_recommend_roles_task,
+    "resume-feedback": run_resume_feedback_task,
+}
+
+def create_worker_pool() -> TaskWorkerPool:
+    """Create the in-process worker pool that runs queued tasks."""
+    return TaskWorkerPool(get_task_queue(), TASK_HANDLERS, workers=get_settings().task_workers)
+
+# Response helpers
+async def task_status(task: Dict, queue: TaskQueue) -> Dict:
+    """Public view of a task (without its result); the queue position is looked up off the event loop."""
+    status = {
+        "taskId": task["id"],
+        "kind": task["kind"],
+        "status": task["status"],
+        "priority": task["priority"],
+        "attempts": task["attempts"],
+        "createdAt": task["created_at"],
+        "updatedAt": task["updated_at"],
+        "resultUrl": f"/api/tasks/{task['id']}/result",
+    }
+    if task["status"] == QUEUED:
+        status["position"] = await run_in_threadpool(queue.position, task["id"])
+    if task["status"] == FAILED or (task["status"] == QUEUED and task["error"]):
+        status["error"] = task["error"]
+    if task["expires_at"] is not None:
+        status["expiresAt"] = task["expires_at"]
+    return status
+
+async def submit_task(kind: str, payload: Dict, priority: int) -> JSONResponse:
+    queue = get_task_queue()
+    task_id = await run_in_threadpool(
+        queue.enqueue, kind, payload, priority, get_settings().task_max_attempts
+    )
+    logger.info(f"Queued {kind} task {task_id} (priority {priority})")
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "taskId": task_id,
+            "status": QUEUED,
+            "statusUrl": f"/api/tasks/{task_id}",
+            "resultUrl": f"/api/tasks/{task_id}/result",
+        },
+        headers={"Location": f"/api/tasks/{task_id}"}
+    )
+
+async def load_task(task_id: str) -> Dict:
+    task = await run_in_threadpool(get_task_queue().get, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found or its result has expired")
+    return task
+
+# Routes
+@router.post("/parse-document", status_code=202)
+async def submit_parse_document(file: UploadFile = File(...), priority: int = 0):
+    """
+    Queue a CV/resume document (PDF or DOCX) for parsing and skill extraction.
+    """
+    allowed_types = ['application/pdf', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
+    if file.content_type not in allowed_types:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.content_type}")
+
+    file_bytes = await file.read()
+    if not file_bytes:
+        raise HTTPException(status_code=400, detail="File is empty")
+
+    payload = {"filename": file.filename, "data": base64.b64encode(file_bytes).decode("ascii")}
+    return await submit_task("parse-document", payload, priority)
+
+@router.post("/extract-skills", status_code=202)
+async def submit_extract_skills(request: SkillExtractionRequest, priority: int = 0):
+    """Queue skill extraction from plain text."""
+    check_text_size(request.text, "text")
+    if not request.text or len(request.text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Text is too short")
+    return await submit_task("extract-skills", request.model_dump(), priority)
+
+@router.post("/analyze-gap", status_code=202)
+async def submit_analyze_gap(request: GapAnalysisRequest, priority: int = 0):
+    """Queue a gap analysis."""
+    try:
+        validate_recency_half_life(request.recencyHalfLifeDays)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await submit_task("analyze-gap", request.model_dump(), priority)
+
+@router.post("/analyze-job-fit", status_code=202)
+async def submit_analyze_job_fit(request: JobFitRequest, priority: int = 0):
+    """Queue a job fit analysis."""
+    check_text_size(request.jobDescription, "jobDescription")
+    check_text_size(request.resumeText, "resumeText")
+    if not request.jobDescription or len(request.jobDescription.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Job description is too short. Please provide more details.")
+    return await submit_task("analyze-job-fit", request.model_dump(), priority)
+
+@router.post("/rank-job-fit", status_code=202)
+async def submit_rank_job_fit(request: JobFitRankRequest, priority: int = 0):
+    """Queue a ranking of many job descriptions against one resume."""
+    check_text_size(request.resumeText, "resumeText")
+    for index, job in enumerate(request.jobDescriptions):
+        check_text_size(job.description, f"Job description {index + 1}")
+    try:
+        validate_ranked_jobs(request.jobDescriptions, request.maxResults)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await submit_task("rank-job-fit", request.model_dump(), priority)
+
+@router.post("/recommend-roles", status_code=202)
+async def submit_recommend_roles(request: RoleRecommendRequest, priority: int = 0):
+    """Queue role recommendations."""
+    return await submit_task("recommend-roles", request.model_dump(), priority)
+
+@router.post("/resume-feedback", status_code=202)
+async def submit_resume_feedback(request: ResumeFeedbackRequest, priority: int = 0):
+    """Queue a resume quality analysis."""
+    check_text_size(request.resumeText, "resumeText")
+    if not request.resumeText or len(request.resumeText.strip()) < 100:
+        raise HTTPException(status_code=400, detail="Resume text is too short for meaningful analysis.")
+    return await submit_task("resume-feedback", request.model_dump(), priority)
+
+@router.get("/{task_id}")
+async def get_task_endpoint(task_id: str):
+    """
+    Get a task's status; includes the result once it is done.
+
+    Returns:
+    - status: queued, running, done or failed
+    - position: tasks ahead of it while queued
+    - result: the analysis once done
+    """
+    queue = get_task_queue()
+    task = await load_task(task_id)
+
+    status = await task_status(task, queue)
+    if task["status"] == DONE:
+        status["result"] = task["result"]
+    return status
+
+@router.get("/{task_id}/result")
+async def get_task_result_endpoint(task_id: str):
+    """
+    Get a finished task's result.
+    Responds 202 while the task is still queued or running.
+    """
+    task = await load_task(task_id)
+
+    if task["status"] == DONE:
+        return task["result"]
+    if task["status"] == FAILED:
+        raise HTTPException(status_code=422, detail=task["error"])
+    return JSONResponse(status_code=202, content=await task_status(task, get_task_queue()))
+
+@router.get("/{task_id}/events")
+async def task_events_endpoint(task_id: str, interval: float = 1.0):
+    """
+    Stream a task's status as server-sent events until it finishes.
+    The last event carries the result (or the error).
+    """
+    queue = get_task_queue()
+    await load_task(task_id)
+    interval = min(max(interval, 0.2), 10.0)
+
+    async def events():
+        last_state = None
+        while True:
+            task = await run_in_threadpool(queue.get, task_id)
+            if task is None:
+                yield f"event: expired\ndata: {json.dumps({'taskId': task_id})}\n\n"
+                return
+
+            status = await task_status(task, queue)
+            state = (task["status"], status.get("position"), task["attempts"])
+            if task["status"] == DONE:
+                status["result"] = task["result"]
+            if state != last_state or task["status"] in (DONE, FAILED):
+                yield f"event: {task['status']}\ndata: {json.dumps(status)}\n\n"
+                last_state = state
+            if task["status"] in (DONE, FAILED):
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
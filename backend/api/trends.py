@@ -0,0 +1,82 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+from services.skill_taxonomy import pinned_taxonomy
+from services.demand_trends import get_demand_trends
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/trends")
+
+# Longest window a trend query may cover
+MAX_TREND_DAYS = 3650
+MAX_TREND_RESULTS = 100
+MAX_SERIES_SKILLS = 20
+BUCKET_DAYS = {"day": 1, "week": 7}
+
+def _check_window(days: int, limit: int):
+    if days < 1 or days > MAX_TREND_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_TREND_DAYS}")
+    if limit < 1 or limit > MAX_TREND_RESULTS:
+        raise ValueError(f"limit must be between 1 and {MAX_TREND_RESULTS}")
+
+@router.get("/demand")
+async def skill_demand(domain: Optional[str] = None, days: int = 30, limit: int = 20):
+    """
+    Most requested skills in the last N days.
+
+    Returns:
+    - Postings in the window
+    - Top skills with their posting counts and shares
+    """
+    try:
+        _check_window(days, limit)
+        with pinned_taxonomy() as taxonomy:
+            result = get_demand_trends().demand(domain, days, limit)
+        return {**result, "taxonomyVersion": taxonomy.version}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing skill demand: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error computing skill demand: {str(e)}")
+
+@router.get("/trending")
+async def trending_skills(domain: Optional[str] = None, days: int = 30, limit: int = 10):
+    """
+    Skills whose share of postings grew most in the last N days compared to the N days before.
+    """
+    try:
+        _check_window(days, limit)
+        with pinned_taxonomy() as taxonomy:
+            result = get_demand_trends().trending(domain, days, limit)
+        return {**result, "taxonomyVersion": taxonomy.version}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing trending skills: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error computing trending skills: {str(e)}")
+
+@router.get("/series")
+async def demand_series(skills: str, domain: Optional[str] = None, days: int = 90, bucket: str = "week"):
+    """
+    Daily or weekly posting counts of comma-separated skills over the last N days.
+    """
+    try:
+        _check_window(days, 1)
+        if bucket not in BUCKET_DAYS:
+            raise ValueError(f"bucket must be one of: {', '.join(BUCKET_DAYS)}")
+        names = [skill.strip() for skill in skills.split(",") if skill.strip()]
+        if not names or len(names) > MAX_SERIES_SKILLS:
+            raise ValueError(f"Between 1 and {MAX_SERIES_SKILLS} skills are required")
+
+        with pinned_taxonomy() as taxonomy:
+            result = get_demand_trends().series(domain, names, days, BUCKET_DAYS[bucket])
+        return {**result, "taxonomyVersion": taxonomy.version}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing demand series: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error computing demand series: {str(e)}")
@@ -0,0 +1,86 @@
+"""
+Application Settings
+Environment-driven configuration for the NLP backend
+"""
+
+import os
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+
+class Settings(BaseSettings):
+    """Runtime settings, overridable through environment variables or a .env file."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Skill taxonomy
+    taxonomy_path: str = os.path.join(DATA_DIR, "skill_taxonomy.json")
+    taxonomy_reload_interval: float = 30.0  # Seconds between file checks, 0 disables the watcher
+    taxonomy_admin_token: str = ""  # Secret for the X-Admin-Token header of POST /taxonomy/reload; empty disables it
+
+    # Built-in market data used when no job postings are supplied
+    mock_jobs_path: str = os.path.join(DATA_DIR, "mock_jobs.json")
+
+    # Keyword document frequencies for ATS scoring (built with `python -m ingestion keyword-stats`)
+    keyword_stats_path: str = os.path.join(DATA_DIR, "keyword_stats.json")
+
+    # Input limits, and chunking of long texts for the SpaCy pipeline
+    max_request_mb: float = 10.0  # Larger request bodies (uploads included) are rejected with 413
+    max_text_chars: int = 100_000  # Longest text field accepted, 413 beyond
+    nlp_chunk_chars: int = 10_000  # Longer texts are split on paragraphs/sentences and parsed in chunks of this size
+
+    # Micro-batching of single-document SpaCy calls
+    nlp_batch_max_size: int = 16  # Documents per nlp.pipe call, 1 disables batching
+    nlp_batch_max_wait_ms: float = 5.0  # Longest wait for more documents under load
+
+    # Skill vectors for semantic matching, rebuilt when the taxonomy or SpaCy model changes
+    skill_embeddings_path: str = os.path.join(DATA_DIR, "skill_embeddings.npz")
+    skill_similarity_threshold: float = 0.65  # Cosine similarity for near-equivalent skills
+    skill_partial_credit: float = 0.5  # Credit share per unit of similarity
+
+    # Job postings database (postgresql://... or sqlite:///path/to/file.db)
+    database_url: str = ""
+    database_pool_min: int = 1  # Connections kept open for request handling
+    database_pool_max: int = 10
+    database_stream_batch_size: int = 2000  # Rows per round trip when streaming postings into an analysis
+    job_index_refresh_interval: float = 300.0  # Seconds between job index syncs, 0 disables them
+    candidate_index_refresh_interval: float = 60.0  # Seconds between candidate index syncs, 0 disables them
+
+    # Shared secret for the candidate endpoints (X-API-Key header); empty disables them
+    candidate_api_key: str = ""
+
+    # Response compression
+    response_compression_level: int = 6  # Gzip level 1-9, 0 disables compression
+    response_compression_min_size: int = 1000  # Smaller bodies are sent uncompressed
+
+    # Catalog endpoints (roles, learning resources, skills)
+    catalog_cache_max_age: int = 3600  # Seconds browsers and CDNs may reuse a catalog page before revalidating
+
+    # Request profiling of the analysis routes
+    profiling_token: str = ""  # Secret for the X-Profile-Token header and the profile and memory endpoints; empty disables them
+    profiling_sample_rate: float = 0.0  # Share of requests profiled in the background, 0 disables it
+    profiling_slow_percent: float = 5.0  # Background profiles are kept for the slowest N% of requests
+    profiling_interval_ms: float = 2.0  # Stack sampling interval
+    profiling_max_stored: int = 50  # Profiles kept in memory
+
+    # Memory recycling policy (the SpaCy vocabulary grows with every new string it sees), 0 disables a limit
+    memory_check_interval: float = 60.0  # Seconds between policy checks, 0 disables the monitor
+    model_recycle_docs: int = 0  # Load a fresh model after this many documents
+    model_recycle_growth_mb: float = 0.0  # ...or after RSS grew this much since the model was loaded
+    worker_recycle_docs: int = 0  # Restart the worker gracefully after this many documents
+    worker_recycle_growth_mb: float = 0.0  # ...or after RSS grew this much since the model was first loaded
+
+    # Asynchronous analysis tasks
+    task_queue_path: str = os.path.join(BASE_DIR, "task_queue.db")
+    task_workers: int = 2  # In-process worker threads, 0 to only accept tasks
+    task_result_ttl: float = 3600.0  # Seconds finished results are kept
+    task_max_attempts: int = 3
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get the cached application settings."""
+    return Settings()
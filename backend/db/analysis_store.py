@@ -0,0 +1,137 @@
+"""
+Analysis Store
+Read access to the users' stored analyses in the shared Postgres `analysis_results` table or a local SQLite stand-in
+"""
+
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+from db.pool import ConnectionPool, PooledStore, parse_database_url, pool_for
+import logging
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_results (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    domain TEXT,
+    readiness_score INTEGER NOT NULL,
+    extracted_skills TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS analysis_results_user_id_idx ON analysis_results (user_id);
+CREATE INDEX IF NOT EXISTS analysis_results_created_at_idx ON analysis_results (created_at);
+"""
+
+PROFILE_COLUMNS = ["id", "user_id", "domain", "readiness_score", "extracted_skills", "created_at"]
+
+
+def _profile_from_row(row) -> Dict:
+    """Convert a PROFILE_COLUMNS row into a candidate profile dict (API field names)."""
+    skills = row[4]
+    if isinstance(skills, str):
+        skills = json.loads(skills)
+    created_at = row[5]
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return {
+        "analysisId": row[0],
+        "userId": row[1],
+        "domain": row[2],
+        "readinessScore": row[3],
+        "extractedSkills": skills or {},
+        "analyzedAt": created_at,
+    }
+
+
+class AnalysisStore(PooledStore, ABC):
+    """Interface shared by the analysis store backends, each holding a connection borrowed from a pool."""
+
+    @abstractmethod
+    def iter_latest_profiles(self, since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream each user's most recent analysis that has extracted skills.
+
+        Args:
+            since: Only users with an analysis created after this time
+            batch_size: Rows fetched per round trip
+        """
+
+
+class SQLiteAnalysisStore(AnalysisStore):
+    """Local SQLite stand-in for the Postgres `analysis_results` table."""
+
+    def __init__(self, pool: ConnectionPool, owns_pool: bool = False):
+        super().__init__(pool, owns_pool)
+        try:
+            self.conn.executescript(SQLITE_SCHEMA)
+        except Exception:
+            self.close()
+            raise
+
+    def iter_latest_profiles(self, since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        query = (
+            f"SELECT {', '.join(PROFILE_COLUMNS)} FROM ("
+            f"SELECT {', '.join(PROFILE_COLUMNS)}, "
+            "ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC) AS position "
+            "FROM analysis_results WHERE extracted_skills IS NOT NULL"
+            ") WHERE position = 1"
+        )
+        params = ()
+        if since is not None:
+            # CURRENT_TIMESTAMP stores "YYYY-MM-DD HH:MM:SS" while isoformat() puts a T between date and
+            # time, so both sides are compared as times rather than as text
+            query += " AND julianday(created_at) > julianday(?)"
+            params = (since.isoformat(),)
+
+        cursor = self.conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _profile_from_row(row)
+
+
+class PostgresAnalysisStore(AnalysisStore):
+    """Reader for the shared Postgres `analysis_results` table."""
+
+    def iter_latest_profiles(self, since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        query = (
+            f"SELECT DISTINCT ON (user_id) {', '.join(PROFILE_COLUMNS)} FROM analysis_results "
+            "WHERE extracted_skills IS NOT NULL"
+        )
+        params = ()
+        if since is not None:
+            query += " AND created_at > %s"
+            params = (since,)
+        query += " ORDER BY user_id, created_at DESC"
+
+        # Named (server-side) cursor so the table is streamed instead of loaded at once
+        with self.conn, self.conn.cursor(name="latest_profiles") as cur:
+            cur.itersize = batch_size
+            cur.execute(query, params)
+            for row in cur:
+                yield _profile_from_row(row)
+
+
+def open_analysis_store(url: str) -> AnalysisStore:
+    """
+    Open an analysis store on the shared pool (for the configured database) or on a pool of its own.
+
+    Args:
+        url: Database URL (see db.pool.parse_database_url)
+
+    Returns:
+        Analysis store for the URL
+    """
+    pool, owned = pool_for(url)
+    store_class = PostgresAnalysisStore if parse_database_url(url)[0] == "postgres" else SQLiteAnalysisStore
+    try:
+        return store_class(pool, owned)
+    except Exception:
+        if owned:
+            pool.close()
+        raise
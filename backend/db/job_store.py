@@ -0,0 +1,381 @@
+"""
+Job Store
+Bulk storage for job postings in the shared Postgres `jobs` table or a local SQLite stand-in
+"""
+
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from db.pool import ConnectionPool, PooledStore, parse_database_url, pool_for
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns of the Prisma-managed `jobs` table, in insert order
+JOB_COLUMNS = [
+    "id", "title", "company", "description_text", "source_url",
+    "extracted_skills", "domain", "content_hash", "cluster_id", "minhash", "created_at"
+]
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    description_text TEXT NOT NULL,
+    source_url TEXT,
+    extracted_skills TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    content_hash TEXT UNIQUE,
+    cluster_id TEXT,
+    minhash BLOB,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS jobs_domain_idx ON jobs (domain);
+"""
+
+# Near-duplicate columns missing from SQLite files created before they were added
+SQLITE_MIGRATIONS = {
+    "cluster_id": "ALTER TABLE jobs ADD COLUMN cluster_id TEXT",
+    "minhash": "ALTER TABLE jobs ADD COLUMN minhash BLOB",
+}
+
+# Columns read back for indexing, demand trends and search results (no description text)
+SUMMARY_COLUMNS = ["id", "title", "company", "domain", "extracted_skills", "created_at", "cluster_id"]
+
+# One posting per near-duplicate cluster (postings ingested before clustering count on their own)
+REPRESENTATIVE_FILTER = "(cluster_id IS NULL OR cluster_id = id)"
+
+# Pooled reads made while serving requests (see db/pool.py), per domain or over all postings
+DOMAIN_STATS_QUERY = "SELECT COUNT(*), MAX(created_at), COUNT(cluster_id) FROM jobs WHERE domain = %s"
+ALL_STATS_QUERY = "SELECT COUNT(*), MAX(created_at), COUNT(cluster_id) FROM jobs"
+DOMAIN_SKILLS_QUERY = f"SELECT extracted_skills FROM jobs WHERE domain = %s AND {REPRESENTATIVE_FILTER}"
+ALL_SKILLS_QUERY = f"SELECT extracted_skills FROM jobs WHERE {REPRESENTATIVE_FILTER}"
+
+
+def _row_values(job: Dict) -> tuple:
+    """Convert a job dict (API field names) into a tuple in JOB_COLUMNS order."""
+    created_at = job.get("createdAt") or datetime.now(timezone.utc)
+    return (
+        job["id"],
+        job.get("title") or "",
+        job.get("company") or "",
+        job.get("descriptionText") or "",
+        job.get("sourceUrl"),
+        json.dumps(job.get("extractedSkills") or {}),
+        job["domain"],
+        job.get("contentHash"),
+        job.get("clusterId"),
+        job.get("minhash"),
+        created_at,
+    )
+
+
+def _summary_from_row(row) -> Dict:
+    """Convert a SUMMARY_COLUMNS row into a job dict (API field names)."""
+    skills = row[4]
+    if isinstance(skills, str):
+        skills = json.loads(skills)
+    return {
+        "id": row[0],
+        "title": row[1],
+        "company": row[2],
+        "domain": row[3],
+        "extractedSkills": skills or {},
+        "createdAt": row[5],
+        "clusterId": row[6],
+    }
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class JobStore(PooledStore, ABC):
+    """Interface shared by the job store backends, each holding a connection borrowed from a pool."""
+
+    @abstractmethod
+    def existing_hashes(self) -> Set[str]:
+        """Get the content hashes of every stored posting."""
+
+    @abstractmethod
+    def insert_jobs(self, jobs: List[Dict]) -> int:
+        """Insert postings in bulk, skipping ones already stored. Returns the number inserted."""
+
+    @abstractmethod
+    def iter_descriptions(self, batch_size: int = 1000) -> Iterator[str]:
+        """Stream the description text of every stored posting."""
+
+    @abstractmethod
+    def job_ids(self) -> Set[str]:
+        """Get the ids of every stored posting."""
+
+    @abstractmethod
+    def iter_job_summaries(self, ids: Optional[Iterable[str]] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream id, title, company, domain, extracted skills, creation time and cluster of all (or the given) postings."""
+
+    @abstractmethod
+    def iter_signatures(self, batch_size: int = 1000) -> Iterator[Tuple[str, str, Optional[str], bytes]]:
+        """Stream (id, domain, cluster id, MinHash signature) of every posting that has a signature."""
+
+    @abstractmethod
+    def iter_unsigned(self, batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream id, domain, description text and extracted skills of postings without a signature, oldest first."""
+
+    @abstractmethod
+    def set_clusters(self, rows: List[Tuple[str, str, bytes]]):
+        """Store (id, cluster id, MinHash signature) of existing postings."""
+
+
+class SQLiteJobStore(JobStore):
+    """Local SQLite stand-in for the Postgres `jobs` table."""
+
+    def __init__(self, pool: ConnectionPool, owns_pool: bool = False):
+        super().__init__(pool, owns_pool)
+        try:
+            self.conn.executescript(SQLITE_SCHEMA)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            with self.conn:
+                for column, statement in SQLITE_MIGRATIONS.items():
+                    if column not in columns:
+                        self.conn.execute(statement)
+        except Exception:
+            self.close()
+            raise
+
+    def existing_hashes(self) -> Set[str]:
+        rows = self.conn.execute("SELECT content_hash FROM jobs WHERE content_hash IS NOT NULL")
+        return {row[0] for row in rows}
+
+    def insert_jobs(self, jobs: List[Dict]) -> int:
+        if not jobs:
+            return 0
+        before = self.conn.total_changes
+        rows = []
+        for job in jobs:
+            values = list(_row_values(job))
+            values[-1] = values[-1].isoformat()
+            rows.append(values)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO jobs ({', '.join(JOB_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in JOB_COLUMNS)})",
+                rows
+            )
+        return self.conn.total_changes - before
+
+    def iter_descriptions(self, batch_size: int = 1000) -> Iterator[str]:
+        cursor = self.conn.execute("SELECT description_text FROM jobs")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield row[0]
+
+    def job_ids(self) -> Set[str]:
+        return {row[0] for row in self.conn.execute("SELECT id FROM jobs")}
+
+    def iter_job_summaries(self, ids: Optional[Iterable[str]] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM jobs"
+        if ids is None:
+            cursor = self.conn.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield _summary_from_row(row)
+
+        # Bounded IN lists stay under SQLite's parameter limit
+        for chunk in _chunks(list(ids), 500):
+            rows = self.conn.execute(f"{query} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+            for row in rows:
+                yield _summary_from_row(row)
+
+    def iter_signatures(self, batch_size: int = 1000) -> Iterator[Tuple[str, str, Optional[str], bytes]]:
+        cursor = self.conn.execute("SELECT id, domain, cluster_id, minhash FROM jobs WHERE minhash IS NOT NULL")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def iter_unsigned(self, batch_size: int = 1000) -> Iterator[Dict]:
+        cursor = self.conn.execute(
+            "SELECT id, domain, description_text, extracted_skills FROM jobs WHERE minhash IS NULL "
+            "ORDER BY created_at, id"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for job_id, domain, text, skills in rows:
+                yield {
+                    "id": job_id,
+                    "domain": domain,
+                    "descriptionText": text,
+                    "extractedSkills": json.loads(skills) if skills else {},
+                }
+
+    def set_clusters(self, rows: List[Tuple[str, str, bytes]]):
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE jobs SET cluster_id = ?, minhash = ? WHERE id = ?",
+                [(cluster_id, minhash, job_id) for job_id, cluster_id, minhash in rows]
+            )
+
+
+class PostgresJobStore(JobStore):
+    """Bulk writer for the shared Postgres `jobs` table."""
+
+    def existing_hashes(self) -> Set[str]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT content_hash FROM jobs WHERE content_hash IS NOT NULL")
+            return {row[0] for row in cur}
+
+    def insert_jobs(self, jobs: List[Dict]) -> int:
+        from psycopg2.extras import execute_values
+
+        if not jobs:
+            return 0
+        with self.conn, self.conn.cursor() as cur:
+            inserted = execute_values(
+                cur,
+                f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES %s "
+                "ON CONFLICT (content_hash) DO NOTHING RETURNING id",
+                [_row_values(job) for job in jobs],
+                template="(%s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s, %s)",
+                page_size=1000,
+                fetch=True
+            )
+        return len(inserted)
+
+    def iter_descriptions(self, batch_size: int = 1000) -> Iterator[str]:
+        # Named (server-side) cursor so the table is streamed instead of loaded at once
+        with self.conn, self.conn.cursor(name="job_descriptions") as cur:
+            cur.itersize = batch_size
+            cur.execute("SELECT description_text FROM jobs")
+            for row in cur:
+                yield row[0]
+
+    def job_ids(self) -> Set[str]:
+        with self.conn, self.conn.cursor() as cur:
+            cur.execute("SELECT id FROM jobs")
+            return {row[0] for row in cur}
+
+    def iter_job_summaries(self, ids: Optional[Iterable[str]] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM jobs"
+        if ids is None:
+            with self.conn, self.conn.cursor(name="job_summaries") as cur:
+                cur.itersize = batch_size
+                cur.execute(query)
+                for row in cur:
+                    yield _summary_from_row(row)
+            return
+
+        for chunk in _chunks(list(ids), batch_size):
+            with self.conn, self.conn.cursor() as cur:
+                cur.execute(f"{query} WHERE id = ANY(%s)", (chunk,))
+                for row in cur:
+                    yield _summary_from_row(row)
+
+    def iter_signatures(self, batch_size: int = 1000) -> Iterator[Tuple[str, str, Optional[str], bytes]]:
+        with self.conn, self.conn.cursor(name="job_signatures") as cur:
+            cur.itersize = batch_size
+            cur.execute("SELECT id, domain, cluster_id, minhash FROM jobs WHERE minhash IS NOT NULL")
+            for job_id, domain, cluster_id, minhash in cur:
+                yield job_id, domain, cluster_id, bytes(minhash)
+
+    def iter_unsigned(self, batch_size: int = 1000) -> Iterator[Dict]:
+        with self.conn, self.conn.cursor(name="job_unsigned") as cur:
+            cur.itersize = batch_size
+            cur.execute(
+                "SELECT id, domain, description_text, extracted_skills FROM jobs WHERE minhash IS NULL "
+                "ORDER BY created_at, id"
+            )
+            for job_id, domain, text, skills in cur:
+                yield {"id": job_id, "domain": domain, "descriptionText": text, "extractedSkills": skills or {}}
+
+    def set_clusters(self, rows: List[Tuple[str, str, bytes]]):
+        from psycopg2.extras import execute_values
+
+        with self.conn, self.conn.cursor() as cur:
+            execute_values(
+                cur,
+                "UPDATE jobs SET cluster_id = v.cluster_id, minhash = v.minhash "
+                "FROM (VALUES %s) AS v (id, cluster_id, minhash) WHERE jobs.id = v.id",
+                [(job_id, cluster_id, minhash) for job_id, cluster_id, minhash in rows],
+                template="(%s, %s, %s::bytea)",
+                page_size=1000
+            )
+
+
+def open_job_store(url: str) -> JobStore:
+    """
+    Open a job store on the shared pool (for the configured database) or on a pool of its own.
+
+    Args:
+        url: Database URL (see db.pool.parse_database_url)
+
+    Returns:
+        Job store for the URL
+    """
+    pool, owned = pool_for(url)
+    store_class = PostgresJobStore if parse_database_url(url)[0] == "postgres" else SQLiteJobStore
+    try:
+        return store_class(pool, owned)
+    except Exception:
+        if owned:
+            pool.close()
+        raise
+
+
+def job_stats(pool, domain: Optional[str] = None) -> Tuple[int, Optional[str], int]:
+    """
+    Count the postings of a domain (or all postings) and get the newest one's creation time.
+
+    Postings are only ever inserted, and only clustered once (at ingestion or
+    when older postings are backfilled), so the stats change whenever the
+    domain's market data does. Runs as a prepared statement on the pooled connection.
+
+    Args:
+        pool: Connection pool (db.pool.get_pool)
+        domain: Domain, or None for all postings
+
+    Returns:
+        (posting count, newest creation time as text, clustered posting count)
+    """
+    with pool.connection() as conn:
+        if domain:
+            rows = pool.fetch_prepared(conn, "job_stats_domain", DOMAIN_STATS_QUERY, (domain,))
+        else:
+            rows = pool.fetch_prepared(conn, "job_stats_all", ALL_STATS_QUERY)
+    count, newest, clustered = rows[0]
+    return count, str(newest) if newest is not None else None, clustered
+
+
+def iter_extracted_skills(pool, domain: Optional[str] = None, batch_size: int = 2000) -> Iterator[Dict]:
+    """
+    Stream the extracted skills of a domain's postings (or all postings) through a server-side cursor,
+    one posting per near-duplicate cluster.
+
+    Args:
+        pool: Connection pool (db.pool.get_pool)
+        domain: Domain, or None for all postings
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        {"extractedSkills": {...}} per posting, the shape the analyzers read
+    """
+    with pool.connection() as conn:
+        if domain:
+            rows = pool.stream(conn, DOMAIN_SKILLS_QUERY, (domain,), batch_size)
+        else:
+            rows = pool.stream(conn, ALL_SKILLS_QUERY, (), batch_size)
+        for (skills,) in rows:
+            if isinstance(skills, str):
+                skills = json.loads(skills)
+            yield {"extractedSkills": skills or {}}
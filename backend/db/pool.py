@@ -0,0 +1,281 @@
+"""
+Database Connection Pool
+Pooled connections to the shared Postgres database or a local SQLite stand-in, with prepared statements and streaming reads
+"""
+
+import queue
+import re
+import sqlite3
+import threading
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, Tuple
+from config import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%s")
+
+
+class ConnectionPool(ABC):
+    """
+    Interface shared by the pool backends.
+
+    Queries are written with %s placeholders (the psycopg2 style); each backend
+    adapts them to its own parameter syntax.
+    """
+
+    @abstractmethod
+    def connection(self):
+        """Borrow a connection for the duration of a `with` block (committed on success, rolled back on error)."""
+
+    @abstractmethod
+    def fetch_prepared(self, conn, name: str, query: str, params: Sequence = ()) -> List[tuple]:
+        """
+        Run a query through a statement prepared once per connection.
+
+        Args:
+            conn: Connection borrowed from this pool
+            name: Statement name, unique per query text
+            query: SQL with %s placeholders
+            params: Query parameters
+
+        Returns:
+            All result rows
+        """
+
+    @abstractmethod
+    def stream(self, conn, query: str, params: Sequence = (), batch_size: int = 1000) -> Iterator[tuple]:
+        """Stream result rows in batches of batch_size instead of loading them at once."""
+
+    def close(self):
+        """Close every pooled connection."""
+
+
+class PostgresPool(ConnectionPool):
+    """Thread-safe pool of psycopg2 connections to the shared Postgres database."""
+
+    def __init__(self, url: str, min_connections: int = 1, max_connections: int = 10):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self._pool = ThreadedConnectionPool(min_connections, max_connections, url)
+        # psycopg2 raises instead of waiting when every connection is out, so callers queue here
+        self._available = threading.BoundedSemaphore(max_connections)
+        # Statements prepared on each open connection (server-side prepared statements are per session);
+        # keyed by the connection object itself so a closed connection's entry goes with it
+        self._prepared: "weakref.WeakKeyDictionary[object, set]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        with self._available:
+            with self._borrow() as conn:
+                yield conn
+
+    @contextmanager
+    def _borrow(self):
+        conn = self._pool.getconn()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            broken = broken or bool(conn.closed)
+            if broken:
+                with self._lock:
+                    self._prepared.pop(conn, None)
+            self._pool.putconn(conn, close=broken)
+
+    def fetch_prepared(self, conn, name: str, query: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            prepared = self._prepared.setdefault(conn, set())
+        with conn.cursor() as cur:
+            if name not in prepared:
+                numbered = iter(range(1, len(params) + 1))
+                cur.execute(f"PREPARE {name} AS {_PLACEHOLDER.sub(lambda _: f'${next(numbered)}', query)}")
+                prepared.add(name)
+            arguments = f" ({', '.join('%s' for _ in params)})" if params else ""
+            cur.execute(f"EXECUTE {name}{arguments}", tuple(params))
+            return cur.fetchall()
+
+    def stream(self, conn, query: str, params: Sequence = (), batch_size: int = 1000) -> Iterator[tuple]:
+        # Named (server-side) cursor: rows arrive batch_size at a time
+        with conn.cursor(name=f"stream_{uuid.uuid4().hex[:12]}") as cur:
+            cur.itersize = batch_size
+            cur.execute(query, tuple(params))
+            for row in cur:
+                yield row
+
+    def close(self):
+        self._pool.closeall()
+
+
+class SQLitePool(ConnectionPool):
+    """
+    Local SQLite stand-in for tests and single-machine setups.
+
+    sqlite3 keeps a prepared statement cache per connection, so repeated
+    queries are only compiled once. An in-memory database exists per
+    connection, so ":memory:" pools share a single one.
+    """
+
+    def __init__(self, path: str, max_connections: int = 4):
+        self.path = path
+        self.max_connections = 1 if path == ":memory:" else max_connections
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_connections:
+                self._created += 1
+                return sqlite3.connect(self.path, check_same_thread=False)
+        return self._idle.get()
+
+    def fetch_prepared(self, conn, name: str, query: str, params: Sequence = ()) -> List[tuple]:
+        return conn.execute(_PLACEHOLDER.sub("?", query), tuple(params)).fetchall()
+
+    def stream(self, conn, query: str, params: Sequence = (), batch_size: int = 1000) -> Iterator[tuple]:
+        cursor = conn.execute(_PLACEHOLDER.sub("?", query), tuple(params))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class PooledStore:
+    """
+    Base of the database stores: holds one connection borrowed from a pool
+    until it is closed, then hands it back (and closes the pool if the store
+    was given one of its own).
+    """
+
+    def __init__(self, pool: ConnectionPool, owns_pool: bool = False):
+        self.pool = pool
+        self._owns_pool = owns_pool
+        self._lease = pool.connection()
+        self.conn = self._lease.__enter__()
+
+    def close(self, *exc):
+        """Return the connection to the pool (committed, or rolled back when given an exception)."""
+        lease, self._lease = self._lease, None
+        if lease is None:
+            return
+        try:
+            lease.__exit__(*(exc or (None, None, None)))
+        finally:
+            if self._owns_pool:
+                self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(*exc)
+
+
+def parse_database_url(url: str) -> Tuple[str, str]:
+    """
+    Tell which backend a database URL is for.
+
+    Args:
+        url: postgresql://... for Postgres, sqlite:///path, a *.db/*.sqlite path or :memory: for SQLite
+
+    Returns:
+        ("postgres", url) or ("sqlite", database path)
+    """
+    if url.startswith(("postgres://", "postgresql://")):
+        return "postgres", url
+    if url.startswith("sqlite:///"):
+        return "sqlite", url[len("sqlite:///"):]
+    if url.endswith((".db", ".sqlite", ".sqlite3")) or url == ":memory:":
+        return "sqlite", url
+    raise ValueError(f"Unsupported database URL: {url}")
+
+
+def create_pool(url: str) -> ConnectionPool:
+    """
+    Create a connection pool for a database URL (see parse_database_url).
+
+    Returns:
+        Connection pool for the URL
+    """
+    settings = get_settings()
+    backend, location = parse_database_url(url)
+    if backend == "postgres":
+        return PostgresPool(location, settings.database_pool_min, settings.database_pool_max)
+    return SQLitePool(location, settings.database_pool_max)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> Optional[ConnectionPool]:
+    """Get the shared pool for the configured database, or None when no database is configured."""
+    global _pool
+    if _pool is None:
+        database_url = get_settings().database_url
+        if not database_url:
+            return None
+        with _pool_lock:
+            if _pool is None:
+                _pool = create_pool(database_url)
+                logger.info(f"Opened {type(_pool).__name__} for the jobs database")
+    return _pool
+
+
+def pool_for(url: str) -> Tuple[ConnectionPool, bool]:
+    """
+    Get a pool for a database URL: the shared one for the configured database,
+    or a new one (which the caller owns and closes) for any other URL.
+
+    Returns:
+        (pool, whether the caller owns it)
+    """
+    if url == get_settings().database_url:
+        return get_pool(), False
+    return create_pool(url), True
+
+
+def close_pool():
+    """Close the shared pool (on shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
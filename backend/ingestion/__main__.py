@@ -0,0 +1,109 @@
+"""
+Job Posting Ingestion CLI
+
+Usage:
+    python -m ingestion run data/scrape_output --domain "Backend Developer" --workers 4
+    python -m ingestion worker data/incoming --interval 300
+    python -m ingestion keyword-stats
+
+Postings are written to --database-url (defaults to DATABASE_URL), which
+may be a Postgres URL or a local SQLite file.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from config import get_settings
+from db.job_store import open_job_store
+from ingestion.pipeline import IngestionPipeline
+from services.keyword_weights import build_keyword_stats, save_keyword_stats
+from services.near_duplicates import DEFAULT_THRESHOLD
+
+logger = logging.getLogger("ingestion")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m ingestion", description="Ingest raw job postings")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("run", "Ingest the given files/directories once"),
+                            ("worker", "Keep ingesting new files from the given directories")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("paths", nargs="+", help="Posting files or scrape output directories")
+        sub.add_argument("--database-url", default=None, help="postgresql://... or sqlite:///jobs.db")
+        sub.add_argument("--domain", default=None, help="Domain for postings that don't specify one")
+        sub.add_argument("--workers", type=int, default=1, help="Extraction worker processes")
+        sub.add_argument("--batch-size", type=int, default=64, help="Postings per extraction batch")
+        sub.add_argument("--checkpoint", default=".ingestion_checkpoint.json",
+                         help="Checkpoint file used to resume interrupted runs")
+        sub.add_argument("--similarity", type=float, default=DEFAULT_THRESHOLD,
+                         help="Estimated text/skill similarity (0-1) from which postings count as near-duplicates")
+        if name == "worker":
+            sub.add_argument("--interval", type=float, default=300.0, help="Seconds between scans")
+
+    sub = subparsers.add_parser("keyword-stats", help="Rebuild ATS keyword statistics from the stored postings")
+    sub.add_argument("--database-url", default=None, help="postgresql://... or sqlite:///jobs.db")
+    sub.add_argument("--output", default=None, help="Stats file (defaults to KEYWORD_STATS_PATH)")
+
+    return parser
+
+
+def resolve_database_url(args) -> str:
+    database_url = args.database_url or get_settings().database_url
+    if not database_url:
+        raise ValueError("No database configured: pass --database-url or set DATABASE_URL")
+    return database_url
+
+
+def run_once(args) -> dict:
+    if not 0 < args.similarity <= 1:
+        raise ValueError("--similarity must be between 0 and 1")
+    with open_job_store(resolve_database_url(args)) as store:
+        pipeline = IngestionPipeline(
+            store,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            default_domain=args.domain,
+            checkpoint_path=args.checkpoint,
+            similarity_threshold=args.similarity
+        )
+        return pipeline.run(args.paths)
+
+
+def rebuild_keyword_stats(args):
+    with open_job_store(resolve_database_url(args)) as store:
+        stats = build_keyword_stats(store.iter_descriptions())
+    save_keyword_stats(stats, args.output)
+    logger.info(f"Keyword stats built from {stats.document_count} postings ({len(stats.idf)} terms)")
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+
+    try:
+        if args.command == "run":
+            started = time.perf_counter()
+            stats = run_once(args)
+            elapsed = time.perf_counter() - started
+            rate = stats["read"] / elapsed if elapsed > 0 else 0
+            logger.info(f"Processed {stats['read']} postings in {elapsed:.1f}s ({rate:.0f}/s)")
+            return 0
+
+        if args.command == "keyword-stats":
+            rebuild_keyword_stats(args)
+            return 0
+
+        while True:
+            run_once(args)
+            time.sleep(args.interval)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
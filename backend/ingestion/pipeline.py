@@ -0,0 +1,215 @@
+"""
+Job Posting Ingestion Pipeline
+Deduplicates raw postings, extracts skills in batches across processes, clusters near-duplicates and bulk-writes them
+"""
+
+import json
+import os
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+from db.job_store import JobStore
+from ingestion.sources import iter_source_files, read_postings
+from services.cache import content_hash
+from services.near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, posting_signature, signature_from_bytes
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r'\w+')
+
+
+def posting_fingerprint(posting: Dict) -> str:
+    """Content hash used to deduplicate exact reposts (ignores case, spacing and punctuation)."""
+    text = " ".join(_WORD.findall(posting.get("descriptionText", "").lower()))
+    company = posting.get("company", "").strip().lower()
+    return content_hash(text, company)
+
+
+def _init_worker():
+    """Load the SpaCy model once per worker process."""
+    from services.nlp_engine import get_nlp
+    get_nlp()
+
+
+def _extract_batch(texts: List[str]) -> List[Dict[str, List[str]]]:
+    """Extract skills for one batch of posting texts (runs in a worker process)."""
+    from services.nlp_engine import extract_skills_batch
+    return extract_skills_batch(texts)
+
+
+class Checkpoint:
+    """Records fully ingested source files so interrupted runs can resume."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.completed: Dict[str, List[float]] = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.completed = json.load(f).get("completed", {})
+
+    @staticmethod
+    def _signature(source: str) -> List[float]:
+        stat = os.stat(source)
+        return [stat.st_size, stat.st_mtime]
+
+    def is_done(self, source: str) -> bool:
+        """Whether the file was fully ingested and has not changed since."""
+        return self.completed.get(os.path.abspath(source)) == self._signature(source)
+
+    def mark_done(self, source: str):
+        """Record a file as fully ingested and persist the checkpoint."""
+        self.completed[os.path.abspath(source)] = self._signature(source)
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"completed": self.completed}, f)
+        os.replace(tmp_path, self.path)
+
+
+class IngestionPipeline:
+    """
+    Batch ingestion of raw job postings into a job store.
+
+    Postings are read file by file, deduplicated by content hash against
+    the store and the current run, run through skill extraction in batches
+    spread over worker processes, and written in bulk. Inserts are
+    idempotent, so re-running a partially ingested file is safe.
+
+    Reposts that differ in wording (new dates, boilerplate, reordered
+    bullets) survive the content hash, so each posting is also given a
+    MinHash signature over its text and skills and assigned to a cluster of
+    near-duplicates in its domain. Market frequencies count one posting per
+    cluster.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 1,
+        batch_size: int = 64,
+        default_domain: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        similarity_threshold: float = DEFAULT_THRESHOLD
+    ):
+        self.store = store
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.default_domain = default_domain
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.similarity_threshold = similarity_threshold
+        self.stats = {
+            "files": 0,
+            "filesSkipped": 0,
+            "read": 0,
+            "duplicates": 0,
+            "nearDuplicates": 0,
+            "skipped": 0,
+            "inserted": 0,
+            "backfilled": 0,
+        }
+        self._seen = None
+        self._clusters = None
+        self._executor = None
+
+    def run(self, paths: List[str]) -> Dict:
+        """Ingest every supported posting file under the given paths."""
+        self._seen = self.store.existing_hashes()
+        self._clusters = self._load_clusters()
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        try:
+            for source in iter_source_files(paths):
+                if self.checkpoint.is_done(source):
+                    self.stats["filesSkipped"] += 1
+                    continue
+                self._ingest_file(source)
+                self.checkpoint.mark_done(source)
+                self.stats["files"] += 1
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        logger.info(f"Ingestion finished: {self.stats}")
+        return self.stats
+
+    def _load_clusters(self) -> NearDuplicateIndex:
+        """Index the stored cluster representatives, clustering postings stored before signatures were kept."""
+        clusters = NearDuplicateIndex(self.similarity_threshold)
+        for job_id, domain, cluster_id, minhash in self.store.iter_signatures():
+            if cluster_id in (None, job_id):
+                clusters.add_representative(job_id, signature_from_bytes(minhash), domain)
+
+        # Collected first: the store's read cursor has to be finished before it writes
+        backfill = []
+        for job in self.store.iter_unsigned():
+            signature = posting_signature(job["descriptionText"], job["extractedSkills"])
+            if signature is None:
+                continue
+            backfill.append((job["id"], clusters.assign(job["id"], signature, job["domain"]), signature.tobytes()))
+        if backfill:
+            self.store.set_clusters(backfill)
+            self.stats["backfilled"] = len(backfill)
+            logger.info(f"Clustered {len(backfill)} previously stored postings")
+
+        logger.info(f"Loaded {len(clusters)} near-duplicate clusters")
+        return clusters
+
+    def _ingest_file(self, source: str):
+        pending: List[Dict] = []
+        flush_size = self.batch_size * self.workers
+
+        for posting in self._unique_postings(read_postings(source)):
+            pending.append(posting)
+            if len(pending) >= flush_size:
+                self._flush(pending)
+                pending = []
+
+        self._flush(pending)
+        logger.info(f"Ingested {source} ({self.stats['inserted']} postings stored so far)")
+
+    def _unique_postings(self, postings: Iterator[Dict]) -> Iterator[Dict]:
+        for posting in postings:
+            self.stats["read"] += 1
+
+            posting["domain"] = posting.get("domain") or self.default_domain
+            if not posting.get("descriptionText") or not posting["domain"]:
+                self.stats["skipped"] += 1
+                continue
+
+            fingerprint = posting_fingerprint(posting)
+            if fingerprint in self._seen:
+                self.stats["duplicates"] += 1
+                continue
+            self._seen.add(fingerprint)
+
+            posting["contentHash"] = fingerprint
+            yield posting
+
+    def _flush(self, postings: List[Dict]):
+        if not postings:
+            return
+
+        texts = [posting["descriptionText"] for posting in postings]
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        if self._executor is not None:
+            results = self._executor.map(_extract_batch, batches)
+        else:
+            results = map(_extract_batch, batches)
+        extracted = [skills for batch in results for skills in batch]
+
+        for posting, skills in zip(postings, extracted):
+            posting["id"] = str(uuid.uuid4())
+            posting["extractedSkills"] = skills
+            signature = posting_signature(posting["descriptionText"], skills)
+            posting["clusterId"] = self._clusters.assign(posting["id"], signature, posting["domain"])
+            posting["minhash"] = signature.tobytes() if signature is not None else None
+            if posting["clusterId"] != posting["id"]:
+                self.stats["nearDuplicates"] += 1
+
+        self.stats["inserted"] += self.store.insert_jobs(postings)
@@ -0,0 +1,151 @@
+"""
+Raw Posting Sources
+Reads job postings from HTML, JSON, JSON Lines and CSV files or scrape output directories
+"""
+
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from bs4 import BeautifulSoup
+
+SUPPORTED_EXTENSIONS = (".html", ".htm", ".json", ".jsonl", ".csv")
+
+# Accepted spellings of each posting field in scraped records
+FIELD_ALIASES = {
+    "title": ["title", "jobTitle", "job_title", "position"],
+    "company": ["company", "companyName", "company_name", "employer"],
+    "descriptionText": ["descriptionText", "description_text", "description", "body", "text", "content", "html"],
+    "sourceUrl": ["sourceUrl", "source_url", "url", "link"],
+    "domain": ["domain", "category"],
+    "createdAt": ["createdAt", "created_at", "postedAt", "posted_at", "datePosted", "date_posted", "date"],
+}
+
+_WHITESPACE = re.compile(r'\s+')
+_LOOKS_LIKE_HTML = re.compile(r'<[a-zA-Z/][^>]*>')
+
+
+def strip_markup(text: str) -> str:
+    """Strip HTML markup (if any) and collapse whitespace."""
+    if _LOOKS_LIKE_HTML.search(text):
+        soup = BeautifulSoup(text, "html.parser")
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+        text = soup.get_text(" ")
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO-8601 date/time from a scraped record."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def normalize_record(record: Dict) -> Dict:
+    """Map a raw scraped record onto job posting fields."""
+    posting = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            value = record.get(alias)
+            if value:
+                posting[field] = value
+                break
+
+    posting["descriptionText"] = strip_markup(str(posting.get("descriptionText", "")))
+    posting["title"] = strip_markup(str(posting.get("title", "")))
+    posting["company"] = strip_markup(str(posting.get("company", "")))
+    posting["createdAt"] = parse_timestamp(posting.get("createdAt"))
+    return posting
+
+
+def read_html_file(path: str) -> Iterator[Dict]:
+    """Read one posting from a saved HTML page."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    heading = soup.find("h1") or soup.find("title")
+    body = soup.body or soup
+
+    yield {
+        "title": heading.get_text(" ", strip=True) if heading else "",
+        "company": "",
+        "descriptionText": _WHITESPACE.sub(" ", body.get_text(" ")).strip(),
+        "sourceUrl": None,
+        "createdAt": None,
+    }
+
+
+def read_json_file(path: str) -> Iterator[Dict]:
+    """Read postings from a JSON array (or an object wrapping one)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        for key in ("jobs", "items", "results", "data"):
+            if isinstance(data.get(key), list):
+                data = data[key]
+                break
+        else:
+            data = [data]
+
+    for record in data:
+        if isinstance(record, dict):
+            yield normalize_record(record)
+
+
+def read_jsonl_file(path: str) -> Iterator[Dict]:
+    """Read postings from a JSON Lines file (e.g. Scrapy feed output)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield normalize_record(record)
+
+
+def read_csv_file(path: str) -> Iterator[Dict]:
+    """Read postings from a CSV file with a header row."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for record in csv.DictReader(f):
+            yield normalize_record(record)
+
+
+def read_postings(path: str) -> Iterator[Dict]:
+    """Read postings from a file based on its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".html", ".htm"):
+        return read_html_file(path)
+    if extension == ".json":
+        return read_json_file(path)
+    if extension == ".jsonl":
+        return read_jsonl_file(path)
+    if extension == ".csv":
+        return read_csv_file(path)
+    raise ValueError(f"Unsupported posting file: {path}")
+
+
+def iter_source_files(paths: List[str]) -> Iterator[str]:
+    """Expand files and directories into supported posting files, in a stable order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                # Skip hidden entries such as checkpoint files
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for name in sorted(files):
+                    if not name.startswith(".") and name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            yield path
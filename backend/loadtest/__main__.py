@@ -0,0 +1,104 @@
+"""
+Load Test CLI
+
+Usage:
+    python -m loadtest --users 20 --ramp 10 --duration 60
+    python -m loadtest --base-url http://localhost:8001 --users 50 --mix job-fit=0.3,template=0.2 --json report.json
+
+Each virtual user replays the frontend's flow (upload, gap analysis with the
+domain's job list, role recommendations, job fit, resume feedback) with
+generated resumes. Without --base-url the FastAPI app runs in this process.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Dict
+from config import get_settings
+from loadtest.runner import format_report, open_client, run_load_test
+from loadtest.scenario import DEFAULT_MIX, ResumePool, load_job_corpus
+
+logger = logging.getLogger("loadtest")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse "job-fit=0.5,template=0.2" into step probabilities."""
+    mix = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, share = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown step '{name}' (expected one of {', '.join(DEFAULT_MIX)})")
+        try:
+            mix[name] = float(share)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid probability for '{name}': {share}")
+        if not 0 <= mix[name] <= 1:
+            raise argparse.ArgumentTypeError(f"Probability for '{name}' must be between 0 and 1")
+    return mix
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Replay the analysis flow under load")
+    parser.add_argument("--base-url", default=None, help="Server to test (default: run the app in-process)")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which users start")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run (0 to only use --iterations)")
+    parser.add_argument("--iterations", type=int, default=None, help="Flows per user")
+    parser.add_argument("--mix", type=parse_mix, default={},
+                        help=f"Optional step probabilities, e.g. job-fit=0.5,feedback=1,template=0.2 "
+                             f"(defaults: {', '.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())})")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds between a user's flows")
+    parser.add_argument("--database-url", default=None,
+                        help="Job corpus: postgresql://... or sqlite:///jobs.db (default: DATABASE_URL, else mock jobs)")
+    parser.add_argument("--resumes", type=int, default=50, help="Distinct generated resumes")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    return parser
+
+
+async def run(args) -> Dict:
+    corpus = load_job_corpus(args.database_url or get_settings().database_url)
+    resumes = ResumePool(corpus, args.resumes, args.seed)
+    logger.info(f"Running {args.users} users against {args.base_url or 'the in-process app'}")
+
+    async with open_client(args.base_url, args.timeout) as client:
+        result = await run_load_test(
+            client, corpus, resumes,
+            users=args.users,
+            ramp=args.ramp,
+            duration=args.duration or None,
+            iterations=args.iterations,
+            mix=args.mix,
+            think_time=args.think_time,
+            seed=args.seed
+        )
+    return result.report()
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    if not args.duration and args.iterations is None:
+        logger.error("Pass --duration or --iterations")
+        return 1
+
+    try:
+        report = asyncio.run(run(args))
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["overall"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
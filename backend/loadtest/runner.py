@@ -0,0 +1,191 @@
+"""
+Load Test Runner
+Virtual users replaying the analysis flow, with per-route throughput, latency percentiles and error rates
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
+import numpy as np
+from loadtest.scenario import DEFAULT_MIX, JobCorpus, ResumePool, run_flow
+import logging
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class RouteStats:
+    """Latencies and outcomes of one route's requests."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Counter = Counter()
+
+    def record(self, seconds: float, status: str, ok: bool):
+        self.latencies.append(seconds)
+        self.statuses[status] += 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        count = len(self.latencies)
+        latencies_ms = np.array(self.latencies) * 1000 if count else np.zeros(1)
+        summary = {
+            "requests": count,
+            "errors": self.errors,
+            "errorRate": round(self.errors / count, 4) if count else 0.0,
+            "throughput": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            "meanMs": round(float(latencies_ms.mean()), 1),
+            "maxMs": round(float(latencies_ms.max()), 1),
+            "statuses": dict(self.statuses),
+        }
+        for percentile, value in zip(PERCENTILES, np.percentile(latencies_ms, PERCENTILES)):
+            summary[f"p{percentile}Ms"] = round(float(value), 1)
+        return summary
+
+
+class LoadTestResult:
+    """Measurements of a load test run."""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+        self.flows_completed = 0
+        self.flows_failed = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def route(self, name: str) -> RouteStats:
+        return self.routes.setdefault(name, RouteStats())
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self) -> Dict:
+        """Per-route and overall statistics."""
+        elapsed = self.elapsed
+        overall = RouteStats()
+        for stats in self.routes.values():
+            overall.latencies.extend(stats.latencies)
+            overall.errors += stats.errors
+            overall.statuses.update(stats.statuses)
+        return {
+            "durationSeconds": round(elapsed, 2),
+            "flowsCompleted": self.flows_completed,
+            "flowsFailed": self.flows_failed,
+            "flowsPerSecond": round(self.flows_completed / elapsed, 2) if elapsed > 0 else 0.0,
+            "routes": {name: stats.summary(elapsed) for name, stats in sorted(self.routes.items())},
+            "overall": overall.summary(elapsed),
+        }
+
+
+def format_report(report: Dict) -> str:
+    """Render a report as a plain-text table."""
+    header = f"{'route':<18}{'reqs':>7}{'err%':>7}{'req/s':>8}" + "".join(f"{'p' + str(p):>9}" for p in PERCENTILES) + f"{'max':>9}"
+    lines = [
+        f"Duration {report['durationSeconds']}s, {report['flowsCompleted']} flows completed "
+        f"({report['flowsPerSecond']}/s), {report['flowsFailed']} failed",
+        "",
+        header,
+        "-" * len(header),
+    ]
+    rows = list(report["routes"].items()) + [("overall", report["overall"])]
+    for name, stats in rows:
+        lines.append(
+            f"{name:<18}{stats['requests']:>7}{stats['errorRate'] * 100:>7.1f}{stats['throughput']:>8.1f}"
+            + "".join(f"{stats[f'p{p}Ms']:>9.1f}" for p in PERCENTILES)
+            + f"{stats['maxMs']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str] = None, timeout: float = 120.0) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Client for a running server, or for the FastAPI app in this process (with its startup and shutdown).
+
+    In-process runs share the CPU between the app and the load generator, so use
+    them for relative comparisons and a real server for sizing.
+    """
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+            yield client
+        return
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            yield client
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    corpus: JobCorpus,
+    resumes: ResumePool,
+    users: int = 10,
+    ramp: float = 0.0,
+    duration: Optional[float] = 60.0,
+    iterations: Optional[int] = None,
+    mix: Optional[Dict[str, float]] = None,
+    think_time: float = 0.0,
+    seed: int = 0
+) -> LoadTestResult:
+    """
+    Run virtual users through the analysis flow.
+
+    Args:
+        client: API client (see open_client)
+        corpus: Job corpus
+        resumes: Resume pool
+        users: Concurrent virtual users
+        ramp: Seconds over which users start, evenly spaced
+        duration: Seconds to keep starting flows (None to only use iterations)
+        iterations: Flows per user (None to run until the duration ends)
+        mix: Probability of each optional flow step
+        think_time: Mean seconds a user pauses between flows (exponentially distributed)
+        seed: Random seed for reproducible runs
+
+    Returns:
+        Measurements of the run
+    """
+    mix = {**DEFAULT_MIX, **(mix or {})}
+    result = LoadTestResult()
+    deadline = result.started + duration if duration else None
+
+    async def call(route: str, request):
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            result.route(route).record(time.perf_counter() - started, type(e).__name__, False)
+            return None
+        ok = response.is_success
+        result.route(route).record(time.perf_counter() - started, str(response.status_code), ok)
+        return response.json() if ok else None
+
+    async def virtual_user(index: int):
+        rng = random.Random(seed * 100003 + index)
+        if ramp > 0 and users > 1:
+            await asyncio.sleep(ramp * index / (users - 1))
+
+        completed = 0
+        while (iterations is None or completed < iterations) and (deadline is None or time.perf_counter() < deadline):
+            if await run_flow(client, rng, corpus, resumes, mix, call):
+                result.flows_completed += 1
+            else:
+                result.flows_failed += 1
+            completed += 1
+            if think_time > 0:
+                await asyncio.sleep(rng.expovariate(1 / think_time))
+
+    await asyncio.gather(*(virtual_user(i) for i in range(users)))
+    result.finished = time.perf_counter()
+    return result
@@ -0,0 +1,220 @@
+"""
+Load Test Scenario
+Generated resumes, a local job corpus and the frontend's analysis flow replayed as API calls
+"""
+
+import io
+import random
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from docx import Document
+import logging
+
+logger = logging.getLogger(__name__)
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Optional flow steps and how often an iteration runs them, overridable with --mix
+DEFAULT_MIX = {
+    "job-fit": 0.5,  # The dashboard's job fit check against a pasted job description
+    "feedback": 1.0,  # Resume feedback, loaded with the dashboard
+    "template": 0.0,  # Share of uploads that are the same template resume (exercises request coalescing)
+}
+
+ACTION_VERBS = ["Built", "Developed", "Designed", "Implemented", "Optimized", "Automated", "Led", "Migrated"]
+PROJECT_NOUNS = ["REST API", "dashboard", "data pipeline", "mobile app", "web portal", "recommendation service"]
+
+
+class JobCorpus:
+    """Job postings per domain (for generating resumes with in-demand skills) and sample descriptions."""
+
+    def __init__(self, by_domain: Dict[str, List[Dict]], descriptions: List[str]):
+        self.by_domain = by_domain
+        self.descriptions = descriptions
+        self.domains = sorted(by_domain)
+        # Most requested skills per domain, for generating plausible resumes
+        self.domain_skills: Dict[str, List[str]] = {}
+        for domain, jobs in by_domain.items():
+            counts = Counter(skill for job in jobs for skills in job["extractedSkills"].values() for skill in skills)
+            self.domain_skills[domain] = [skill for skill, _ in counts.most_common(40)]
+
+
+def _synthetic_description(job: Dict) -> str:
+    skills = [skill for skills in job["extractedSkills"].values() for skill in skills]
+    return (
+        f"We are hiring a {job['title']} intern to join our engineering team. "
+        f"You will work with {', '.join(skills[:-1]) or 'modern tools'}"
+        f"{' and ' + skills[-1] if len(skills) > 1 else ''} on production features, "
+        "write tests, review code and collaborate with designers and product managers. "
+        "Strong communication skills and a willingness to learn are expected."
+    )
+
+
+def load_job_corpus(database_url: Optional[str] = None, max_descriptions: int = 200) -> JobCorpus:
+    """
+    Load the job corpus from a jobs database, or the built-in mock postings.
+
+    Args:
+        database_url: postgresql://... or sqlite:///jobs.db; mock postings when empty
+        max_descriptions: Job descriptions kept for job fit requests
+
+    Returns:
+        Job corpus
+    """
+    by_domain: Dict[str, List[Dict]] = {}
+    descriptions: List[str] = []
+
+    if database_url:
+        from db.job_store import open_job_store
+
+        with open_job_store(database_url) as store:
+            for job in store.iter_job_summaries():
+                by_domain.setdefault(job["domain"] or "Other", []).append(job)
+            for description in store.iter_descriptions():
+                if description and len(description.strip()) >= 50:
+                    descriptions.append(description)
+                    if len(descriptions) >= max_descriptions:
+                        break
+    else:
+        from services.job_index import iter_mock_job_summaries
+        from services.market_profiles import get_mock_jobs
+
+        # Mock postings repeated by their weight, as many as the domain's job list would hold
+        for domain, postings in get_mock_jobs().items():
+            by_domain[domain] = [
+                {
+                    "id": f"mock-{domain.lower().replace(' ', '-')}-{i + 1}",
+                    "title": posting.get("title") or domain,
+                    "company": posting.get("company") or "",
+                    "domain": domain,
+                    "extractedSkills": {"skills": posting.get("skills", [])},
+                }
+                for i, posting in enumerate(postings)
+            ]
+        descriptions = [_synthetic_description(job) for job in iter_mock_job_summaries()]
+
+    if not by_domain:
+        raise ValueError("The job corpus is empty")
+    logger.info(f"Job corpus: {sum(len(jobs) for jobs in by_domain.values())} postings in {len(by_domain)} domains")
+    return JobCorpus(by_domain, descriptions[:max_descriptions])
+
+
+def generate_resume(rng: random.Random, corpus: JobCorpus, domain: str) -> str:
+    """Generate the text of a student resume for a domain, with a random share of its in-demand skills."""
+    in_demand = corpus.domain_skills.get(domain) or [skill for skills in corpus.domain_skills.values() for skill in skills]
+    skills = rng.sample(in_demand, min(len(in_demand), rng.randint(3, 12)))
+
+    lines = [
+        f"Student {rng.randint(1000, 9999)}",
+        f"Aspiring {domain} | student@example.com | github.com/student",
+        "",
+        "SUMMARY",
+        f"Computer science student focused on {domain.lower()} work with hands-on project experience.",
+        "",
+        "PROJECTS",
+    ]
+    for _ in range(rng.randint(2, 4)):
+        used = rng.sample(skills, min(len(skills), 3))
+        lines.append(
+            f"- {rng.choice(ACTION_VERBS)} a {rng.choice(PROJECT_NOUNS)} using {', '.join(used)}, "
+            f"serving {rng.randint(50, 5000)} users and cutting load time by {rng.randint(10, 60)}%"
+        )
+    lines += [
+        "",
+        "EDUCATION",
+        "B.Sc. in Computer Science and Engineering, expected 2026",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+    ]
+    return "\n".join(lines)
+
+
+def resume_docx(text: str) -> bytes:
+    """Render resume text as a DOCX upload."""
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class ResumePool:
+    """Pre-generated resumes, so building uploads doesn't compete with the server during the run."""
+
+    def __init__(self, corpus: JobCorpus, size: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.resumes: List[Tuple[str, str, bytes]] = []
+        for i in range(max(size, 1)):
+            domain = corpus.domains[i % len(corpus.domains)]
+            text = generate_resume(rng, corpus, domain)
+            self.resumes.append((domain, text, resume_docx(text)))
+        # One resume a whole class might upload unchanged
+        self.template = self.resumes[0]
+
+    def pick(self, rng: random.Random, template_share: float) -> Tuple[str, str, bytes]:
+        if rng.random() < template_share:
+            return self.template
+        return rng.choice(self.resumes)
+
+
+async def run_flow(
+    client,
+    rng: random.Random,
+    corpus: JobCorpus,
+    resumes: ResumePool,
+    mix: Dict[str, float],
+    call: Callable
+) -> bool:
+    """
+    Replay one student's session: upload, gap analysis against the domain's jobs,
+    role recommendations, then the optional job fit and feedback calls.
+
+    Args:
+        client: httpx.AsyncClient for the API
+        rng: Random source for this virtual user
+        corpus: Job corpus
+        resumes: Resume pool
+        mix: Probability of each optional step
+        call: Coroutine (route, request coroutine) -> response or None, which records timing and errors
+
+    Returns:
+        Whether every step succeeded
+    """
+    domain, text, docx_bytes = resumes.pick(rng, mix["template"])
+
+    parsed = await call("parse-document", client.post(
+        "/api/parse-document", files={"file": ("resume.docx", docx_bytes, DOCX_CONTENT_TYPE)}
+    ))
+    if parsed is None:
+        return False
+    user_skills = parsed["skills"]
+
+    # The analyze route only sends the domain; the backend reads its jobs from the database
+    gap = await call("analyze-gap", client.post("/api/analyze-gap", json={"userSkills": user_skills, "domain": domain}))
+    if gap is None:
+        return False
+
+    roles = await call("recommend-roles", client.post("/api/recommend-roles", json={
+        "userSkills": user_skills, "readinessScore": gap["readinessScore"], "maxRoles": 5
+    }))
+    if roles is None:
+        return False
+
+    if corpus.descriptions and rng.random() < mix["job-fit"]:
+        fit = await call("analyze-job-fit", client.post("/api/analyze-job-fit", json={
+            "userSkills": user_skills,
+            "jobDescription": rng.choice(corpus.descriptions),
+            "resumeText": text,
+            "domain": domain
+        }))
+        if fit is None:
+            return False
+
+    if rng.random() < mix["feedback"]:
+        feedback = await call("resume-feedback", client.post("/api/resume-feedback", json={"resumeText": text}))
+        if feedback is None:
+            return False
+
+    return True
@@ -1,16 +1,85 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from config import get_settings
 from api.routes import router
+from api.tasks import router as tasks_router, create_worker_pool
+from api.candidates import router as candidates_router
+from api.catalog import router as catalog_router
+from api.responses import CompressionMiddleware
+from api.profiling import ProfilingMiddleware, router as profiling_router
+from api.limits import RequestSizeLimitMiddleware
+from api.memory import router as memory_router
+from api.trends import router as trends_router
+from services.skill_taxonomy import TaxonomyWatcher, reload_taxonomy
+from services.market_profiles import warm_market_profiles
+from services.keyword_weights import load_keyword_stats
+from services.job_index import JobIndexRefresher, get_job_index
+from services.candidate_index import CandidateIndexRefresher, get_candidate_index
+from services.memory_monitor import MemoryMonitor
+from db.pool import close_pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not get_settings().database_url:
+        logger.warning(
+            "DATABASE_URL is not set: gap analysis, job search and trends use the built-in sample postings"
+        )
+    # Compile the skill taxonomy before serving and watch its file for changes
+    reload_taxonomy()
+    warm_market_profiles()
+    load_keyword_stats()
+    watcher = TaxonomyWatcher()
+    watcher.start()
+    # Build the job search index and keep it in sync with the jobs table
+    get_job_index()
+    index_refresher = JobIndexRefresher()
+    index_refresher.start()
+    # Index users' latest analyses for candidate search (disabled without an API key)
+    if get_settings().candidate_api_key:
+        get_candidate_index()
+    candidate_refresher = CandidateIndexRefresher()
+    candidate_refresher.start()
+    # Run queued analysis tasks in background worker threads
+    workers = create_worker_pool()
+    workers.start()
+    # Recycle the SpaCy model or this worker when memory grows past the configured limits
+    memory_monitor = MemoryMonitor()
+    memory_monitor.start()
+    yield
+    memory_monitor.stop()
+    workers.stop()
+    candidate_refresher.stop()
+    index_refresher.stop()
+    watcher.stop()
+    close_pool()
 
 app = FastAPI(
     title="SkillBridge NLP API",
     description="NLP-powered skill analysis and gap detection for job seekers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add GZIP compression middleware for responses
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Profile analysis requests on demand (X-Profile-Token) or when sampled and slow
+app.add_middleware(ProfilingMiddleware)
+
+# Reject oversized request bodies (413) before they are parsed
+app.add_middleware(RequestSizeLimitMiddleware)
+
+# Gzip responses, compressing large bodies off the event loop
+settings = get_settings()
+if settings.response_compression_level > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.response_compression_min_size,
+        level=settings.response_compression_level
+    )
 
 # Configure CORS for Next.js frontend
 app.add_middleware(
@@ -30,6 +99,12 @@ app.add_middleware(
 
 # Include API routes
 app.include_router(router, prefix="/api")
+app.include_router(tasks_router, prefix="/api")
+app.include_router(candidates_router, prefix="/api")
+app.include_router(catalog_router, prefix="/api")
+app.include_router(profiling_router, prefix="/api")
+app.include_router(memory_router, prefix="/api")
+app.include_router(trends_router, prefix="/api")
 
 @app.get("/")
 async def root():
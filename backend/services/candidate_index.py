@@ -0,0 +1,319 @@
+"""
+Candidate Index Service
+Per-skill bitsets over users' latest analyses for ranking candidates against a job description
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+import numpy as np
+from config import get_settings
+from services.nlp_engine import get_all_skills_flat, normalize_skill, skill_display_name
+from services.job_fit_analyzer import get_fit_level
+from services.skill_taxonomy import get_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+
+_index: Optional["CandidateIndex"] = None
+_index_lock = threading.Lock()
+
+
+def _set_bit(bits: np.ndarray, slot: int, value: bool) -> np.ndarray:
+    """Set or clear one bit of a packed bitset, growing it if needed. Returns the (possibly new) array."""
+    byte = slot >> 3
+    if byte >= bits.size:
+        if not value:
+            return bits
+        grown = np.zeros(max(byte + 1, bits.size * 2), dtype=np.uint8)
+        grown[:bits.size] = bits
+        bits = grown
+    mask = np.uint8(0x80 >> (slot & 7))
+    if value:
+        bits[byte] |= mask
+    else:
+        bits[byte] &= ~mask
+    return bits
+
+
+class CandidateIndex:
+    """
+    Skill -> candidate bitsets over each user's latest analysis.
+
+    Every user gets a dense slot; bit `slot` of a skill's bitset is set when
+    the user has that skill. Ranking a job description adds up the unpacked
+    bitsets of its skills, so one query costs a pass over the JD's skills and
+    never touches individual profiles. Freed slots are reused by new users.
+    """
+
+    def __init__(self, taxonomy_version: str):
+        self.taxonomy_version = taxonomy_version
+        self.bitsets: Dict[str, np.ndarray] = {}
+        self.alive = np.zeros(0, dtype=np.uint8)
+        self.readiness = np.zeros(0, dtype=np.float32)
+        self.domains = np.zeros(0, dtype=np.int32)
+        self.domain_codes: Dict[str, int] = {"": 0}
+        self.slot_skills: List[Optional[Set[str]]] = []
+        self.slot_info: List[Optional[Dict]] = []
+        self.slots: Dict[str, int] = {}
+        self.free_slots: List[int] = []
+        # Newest analysis time read from the database, for incremental refreshes
+        self.synced_until: Optional[datetime] = None
+        self._lock = threading.RLock()
+
+    @property
+    def candidate_count(self) -> int:
+        return len(self.slots)
+
+    def upsert(self, profile: Dict) -> bool:
+        """
+        Index a user's analysis, replacing their previous one.
+
+        Args:
+            profile: Dict with "userId", "extractedSkills", "readinessScore" and
+                optional "analysisId", "domain", "analyzedAt"
+
+        Returns:
+            False when the stored analysis is newer and the profile was ignored
+        """
+        skills = {normalize_skill(s) for s in get_all_skills_flat(profile.get("extractedSkills") or {})}
+        analyzed_at = profile.get("analyzedAt")
+        domain = profile.get("domain") or ""
+
+        with self._lock:
+            slot = self.slots.get(profile["userId"])
+            if slot is not None:
+                previous = self.slot_info[slot]["analyzedAt"]
+                if previous is not None and analyzed_at is not None and analyzed_at < previous:
+                    return False
+                for skill in self.slot_skills[slot] - skills:
+                    self.bitsets[skill] = _set_bit(self.bitsets[skill], slot, False)
+            else:
+                slot = self.free_slots.pop() if self.free_slots else len(self.slot_skills)
+                if slot == len(self.slot_skills):
+                    self.slot_skills.append(None)
+                    self.slot_info.append(None)
+                    self._grow(slot + 1)
+                self.slots[profile["userId"]] = slot
+                self.alive = _set_bit(self.alive, slot, True)
+
+            for skill in skills:
+                self.bitsets[skill] = _set_bit(self.bitsets.get(skill, np.zeros(0, dtype=np.uint8)), slot, True)
+            self.slot_skills[slot] = skills
+            self.slot_info[slot] = {
+                "userId": profile["userId"],
+                "analysisId": profile.get("analysisId"),
+                "domain": domain or None,
+                "analyzedAt": analyzed_at,
+            }
+            self.readiness[slot] = profile.get("readinessScore") or 0
+            self.domains[slot] = self.domain_codes.setdefault(domain, len(self.domain_codes))
+            return True
+
+    def upsert_many(self, profiles: Iterable[Dict]) -> int:
+        """Index several analyses. Returns the number indexed."""
+        count = 0
+        for profile in profiles:
+            count += self.upsert(profile)
+        return count
+
+    def remove(self, user_id: str) -> bool:
+        """Drop a user from the index. Returns whether they were indexed."""
+        with self._lock:
+            slot = self.slots.pop(user_id, None)
+            if slot is None:
+                return False
+            for skill in self.slot_skills[slot]:
+                self.bitsets[skill] = _set_bit(self.bitsets[skill], slot, False)
+            self.alive = _set_bit(self.alive, slot, False)
+            self.slot_skills[slot] = None
+            self.slot_info[slot] = None
+            self.free_slots.append(slot)
+            return True
+
+    def _grow(self, size: int):
+        if size <= self.readiness.size:
+            return
+        capacity = max(size, self.readiness.size * 2, 64)
+        readiness = np.zeros(capacity, dtype=np.float32)
+        readiness[:self.readiness.size] = self.readiness
+        domains = np.zeros(capacity, dtype=np.int32)
+        domains[:self.domains.size] = self.domains
+        self.readiness, self.domains = readiness, domains
+
+    def search(self, jd_skills: Iterable[str], top_n: int = 20, domain: Optional[str] = None) -> List[Dict]:
+        """
+        Rank candidates by how many of a job description's skills they have.
+
+        Args:
+            jd_skills: Canonical skill ids required by the job description
+            top_n: Number of candidates to return
+            domain: Only candidates whose latest analysis targeted this domain
+
+        Returns:
+            Best matching candidates (match percentage, then readiness score), each with a match breakdown
+        """
+        required = sorted(set(jd_skills))
+
+        with self._lock:
+            slot_count = len(self.slot_skills)
+            if not required or not self.slots or top_n <= 0:
+                return []
+
+            # Per candidate: number of JD skills they have
+            matched_counts = np.zeros(slot_count, dtype=np.int32)
+            for skill in required:
+                bits = self.bitsets.get(skill)
+                if bits is not None and bits.size:
+                    matched_counts += np.unpackbits(bits, count=slot_count)
+
+            eligible = np.unpackbits(self.alive, count=slot_count).astype(bool) & (matched_counts > 0)
+            if domain:
+                code = self.domain_codes.get(domain)
+                if code is None:
+                    return []
+                eligible &= self.domains[:slot_count] == code
+            candidates = np.nonzero(eligible)[0]
+            if not candidates.size:
+                return []
+
+            # Keep only candidates that can make the top N, then order them (ties: lowest slot)
+            rank_scores = matched_counts[candidates] * 1000.0 + self.readiness[candidates]
+            if candidates.size > top_n:
+                cutoff = np.partition(rank_scores, candidates.size - top_n)[candidates.size - top_n]
+                keep = rank_scores >= cutoff
+                candidates, rank_scores = candidates[keep], rank_scores[keep]
+            order = np.lexsort((candidates, -rank_scores))[:top_n]
+
+            return [self._result(int(candidates[i]), required) for i in order]
+
+    def _result(self, slot: int, required: List[str]) -> Dict:
+        skills = self.slot_skills[slot]
+        matched = [skill for skill in required if skill in skills]
+        missing = [skill for skill in required if skill not in skills]
+        match_pct = round(len(matched) / len(required) * 100, 1)
+        fit_level, fit_color, _ = get_fit_level(match_pct)
+        info = self.slot_info[slot]
+        return {
+            "userId": info["userId"],
+            "analysisId": info["analysisId"],
+            "domain": info["domain"],
+            "readinessScore": int(self.readiness[slot]),
+            "analyzedAt": info["analyzedAt"].isoformat() if info["analyzedAt"] else None,
+            "matchPercentage": match_pct,
+            "fitLevel": fit_level,
+            "fitColor": fit_color,
+            "matchedSkills": sorted(skill_display_name(s) for s in matched),
+            "missingSkills": sorted(skill_display_name(s) for s in missing),
+            "matchedCount": len(matched),
+            "jdSkillCount": len(required),
+        }
+
+    def summary(self) -> Dict:
+        """Size of the index."""
+        return {
+            "candidates": self.candidate_count,
+            "skills": sum(1 for bits in self.bitsets.values() if bits.any()),
+            "taxonomyVersion": self.taxonomy_version,
+        }
+
+
+def _note_synced(index: CandidateIndex, profiles: Iterable[Dict]) -> Iterable[Dict]:
+    """Pass profiles through while tracking the newest analysis time read from the database."""
+    for profile in profiles:
+        analyzed_at = profile.get("analyzedAt")
+        if analyzed_at is not None and (index.synced_until is None or analyzed_at > index.synced_until):
+            index.synced_until = analyzed_at
+        yield profile
+
+
+def build_candidate_index() -> CandidateIndex:
+    """Build the index from the stored analyses, or an empty one if no database is configured."""
+    from db.analysis_store import open_analysis_store
+
+    started = time.perf_counter()
+    index = CandidateIndex(get_taxonomy().version)
+    database_url = get_settings().database_url
+
+    if database_url:
+        with open_analysis_store(database_url) as store:
+            index.upsert_many(_note_synced(index, store.iter_latest_profiles()))
+
+    logger.info(f"Indexed {index.candidate_count} candidates in {time.perf_counter() - started:.2f}s")
+    return index
+
+
+def refresh_candidate_index(index: CandidateIndex) -> int:
+    """
+    Apply analyses stored since the last sync.
+
+    Returns:
+        Number of candidates updated
+    """
+    from db.analysis_store import open_analysis_store
+
+    database_url = get_settings().database_url
+    if not database_url:
+        return 0
+
+    with open_analysis_store(database_url) as store:
+        updated = index.upsert_many(_note_synced(index, store.iter_latest_profiles(since=index.synced_until)))
+    if updated:
+        logger.info(f"Candidate index refreshed: {updated} updated")
+    return updated
+
+
+def get_candidate_index() -> CandidateIndex:
+    """
+    Get the candidate index, rebuilding it when the taxonomy version changes.
+
+    If the database can't be read, the current index is kept (an empty one at
+    first) and the next call or refresher tick tries again.
+    """
+    global _index
+
+    version = get_taxonomy().version
+    index = _index
+    if index is not None and index.taxonomy_version == version:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.taxonomy_version != version:
+            try:
+                _index = build_candidate_index()
+            except Exception as e:
+                logger.error(f"Could not read stored analyses, keeping the current candidate index: {e}")
+                if _index is None:
+                    _index = CandidateIndex(version)
+        return _index
+
+
+class CandidateIndexRefresher:
+    """Background thread that picks up analyses written to the database by other processes."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval if interval is not None else get_settings().candidate_index_refresh_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        settings = get_settings()
+        # Candidate search is disabled without an API key, so there is nothing to keep in sync
+        if self.interval <= 0 or not settings.database_url or not settings.candidate_api_key:
+            return
+        self._thread = threading.Thread(target=self._run, name="candidate-index-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                refresh_candidate_index(get_candidate_index())
+            except Exception as e:
+                logger.error(f"Candidate index refresh failed, keeping current index: {e}")
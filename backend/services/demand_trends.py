@@ -0,0 +1,299 @@
+"""
+Demand Trends Service
+Daily per-domain skill counts, updated incrementally with the job index, for windowed demand, trending skills and recency weighting
+"""
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from services.nlp_engine import get_all_skills_flat, normalize_skill, skill_display_name
+import logging
+
+logger = logging.getLogger(__name__)
+
+EPOCH = date(1970, 1, 1)
+# Postings in the recent window below which a skill isn't reported as trending (too few to call a trend)
+MIN_TRENDING_COUNT = 2
+
+def day_number(value) -> int:
+    """Days since 1970-01-01 (UTC) of a datetime, date or ISO string; today when missing."""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        value = value.date()
+    return (value - EPOCH).days
+
+
+def today() -> int:
+    return day_number(None)
+
+
+class _DomainBuckets:
+    """Posting and per-skill counts of one domain, one row per day."""
+
+    def __init__(self):
+        self.origin = 0
+        self.counts = np.zeros((0, 0), dtype=np.int32)
+        self.postings = np.zeros(0, dtype=np.int32)
+
+    def add(self, day: int, columns: np.ndarray, width: int, delta: int):
+        self._fit(day, width)
+        row = day - self.origin
+        self.counts[row, columns] += delta
+        self.postings[row] += delta
+
+    def _fit(self, day: int, width: int):
+        rows, cols = self.counts.shape
+        if rows == 0:
+            self.origin = day
+        before = max(self.origin - day, 0)
+        after = max(day - self.origin - rows + 1, 0)
+        extra_cols = max(width - cols, 0)
+        if before or after or extra_cols:
+            # Grow with headroom so steady ingest doesn't copy the matrix every day or new skill
+            after = max(after, rows // 4) if after else 0
+            extra_cols = max(extra_cols, cols // 4) if extra_cols else 0
+            self.counts = np.pad(self.counts, ((before, after), (0, extra_cols)))
+            self.postings = np.pad(self.postings, (before, after))
+            self.origin -= before
+
+    def rows(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Count rows and posting counts of days start..end (inclusive), and the first row's day."""
+        first = max(start - self.origin, 0)
+        last = min(end - self.origin + 1, len(self.postings))
+        if last <= first:
+            return self.counts[:0], self.postings[:0], start
+        return self.counts[first:last], self.postings[first:last], self.origin + first
+
+
+class DemandTrends:
+    """
+    Skill demand per domain in daily buckets.
+
+    Each domain holds a days x skills count matrix, so a window query sums its
+    rows (one per day, whatever the number of postings) and recency weighting
+    is a single weighted sum over them. Postings are added and removed one at
+    a time as the job index syncs with the database.
+    """
+
+    def __init__(self, taxonomy_version: str):
+        self.taxonomy_version = taxonomy_version
+        self.columns: Dict[str, int] = {}
+        self.skills: List[str] = []
+        self.domains: Dict[str, _DomainBuckets] = {}
+        # Job id -> (domain, day, skill columns), so a removal undoes exactly what was added
+        self.jobs: Dict[str, Tuple[str, int, np.ndarray]] = {}
+        self._lock = threading.RLock()
+
+    def add_job(self, job: Dict):
+        """
+        Count a job (dict with "id", "domain", "extractedSkills" and optional "createdAt"
+        and "clusterId"), replacing any previous version. Near-duplicates of an earlier
+        posting aren't counted: a repost isn't new demand.
+        """
+        skills = {normalize_skill(s) for s in get_all_skills_flat(job.get("extractedSkills") or {})}
+        domain = job.get("domain") or "Other"
+        day = day_number(job.get("createdAt"))
+        with self._lock:
+            self.remove_job(job["id"])
+            if job.get("clusterId") not in (None, job["id"]):
+                return
+            for skill in skills:
+                if skill not in self.columns:
+                    self.columns[skill] = len(self.skills)
+                    self.skills.append(skill)
+            columns = np.fromiter((self.columns[s] for s in skills), dtype=np.intp, count=len(skills))
+            self.domains.setdefault(domain, _DomainBuckets()).add(day, columns, len(self.skills), 1)
+            self.jobs[job["id"]] = (domain, day, columns)
+
+    def remove_job(self, job_id: str) -> bool:
+        with self._lock:
+            entry = self.jobs.pop(job_id, None)
+            if entry is None:
+                return False
+            domain, day, columns = entry
+            self.domains[domain].add(day, columns, len(self.skills), -1)
+            return True
+
+    def _window(self, domain: Optional[str], start: int, end: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Per-day skill counts and posting counts of a domain (all domains when None) over days start..end."""
+        width = len(self.skills)
+        counts = np.zeros((end - start + 1, width), dtype=np.int64)
+        postings = np.zeros(end - start + 1, dtype=np.int64)
+        for name in ([domain] if domain else self.domains):
+            buckets = self.domains.get(name)
+            if buckets is None:
+                continue
+            rows, posted, first = buckets.rows(start, end)
+            offset = first - start
+            counts[offset:offset + len(rows), :rows.shape[1]] += rows[:, :width]
+            postings[offset:offset + len(posted)] += posted
+        return counts, postings, width
+
+    def demand(self, domain: Optional[str], days: int, top_n: int = 20, now: Optional[int] = None) -> Dict:
+        """
+        Most requested skills in the last days days.
+
+        Args:
+            domain: Domain, or None for all domains
+            days: Window length, ending today
+            top_n: Skills returned
+            now: Day number the window ends on (defaults to today)
+
+        Returns:
+            Posting count and the skills' counts and posting shares
+        """
+        end = today() if now is None else now
+        with self._lock:
+            counts, postings, _ = self._window(domain, end - days + 1, end)
+        totals = counts.sum(axis=0)
+        posting_count = int(postings.sum())
+        return {
+            "domain": domain,
+            "days": days,
+            "postings": posting_count,
+            "skills": self._entries(totals, posting_count, top_n),
+        }
+
+    def trending(self, domain: Optional[str], days: int, top_n: int = 10, now: Optional[int] = None) -> Dict:
+        """
+        Skills whose share of postings grew most between the previous and the last days days.
+
+        Shares rather than counts are compared, so a busy week of scraping doesn't
+        make every skill look like it is trending.
+        """
+        end = today() if now is None else now
+        with self._lock:
+            counts, postings, _ = self._window(domain, end - 2 * days + 1, end)
+        previous, recent = counts[:days].sum(axis=0), counts[days:].sum(axis=0)
+        previous_postings, recent_postings = int(postings[:days].sum()), int(postings[days:].sum())
+
+        recent_share = recent / recent_postings if recent_postings else np.zeros_like(recent, dtype=float)
+        previous_share = previous / previous_postings if previous_postings else np.zeros_like(previous, dtype=float)
+        change = recent_share - previous_share
+        candidates = np.flatnonzero(recent >= MIN_TRENDING_COUNT)
+        ranked = candidates[np.lexsort((candidates, -change[candidates]))][:top_n]
+        return {
+            "domain": domain,
+            "days": days,
+            "postings": recent_postings,
+            "previousPostings": previous_postings,
+            "skills": [
+                {
+                    "skill": skill_display_name(self.skills[column]),
+                    "count": int(recent[column]),
+                    "previousCount": int(previous[column]),
+                    "share": round(float(recent_share[column]), 4),
+                    "previousShare": round(float(previous_share[column]), 4),
+                    "change": round(float(change[column]), 4),
+                }
+                for column in ranked
+                if change[column] > 0
+            ],
+        }
+
+    def series(
+        self,
+        domain: Optional[str],
+        skills: List[str],
+        days: int,
+        bucket_days: int = 1,
+        now: Optional[int] = None
+    ) -> Dict:
+        """Posting counts and per-skill counts over the last days days, in buckets of bucket_days (1 daily, 7 weekly)."""
+        end = today() if now is None else now
+        buckets = -(-days // bucket_days)
+        start = end - buckets * bucket_days + 1
+        with self._lock:
+            counts, postings, _ = self._window(domain, start, end)
+            columns = {skill: self.columns.get(normalize_skill(skill)) for skill in skills}
+        postings = postings.reshape(buckets, bucket_days).sum(axis=1)
+        grouped = counts.reshape(buckets, bucket_days, -1).sum(axis=1)
+        return {
+            "domain": domain,
+            "bucketDays": bucket_days,
+            "buckets": [(EPOCH + timedelta(days=start + i * bucket_days)).isoformat() for i in range(buckets)],
+            "postings": postings.tolist(),
+            "skills": {
+                skill_display_name(normalize_skill(skill)): (
+                    grouped[:, column].tolist() if column is not None else [0] * buckets
+                )
+                for skill, column in columns.items()
+            },
+        }
+
+    def recency_weights(self, domain: Optional[str], half_life_days: float, now: Optional[int] = None) -> Dict[str, float]:
+        """
+        Skill demand with each posting weighted by 0.5 ** (age in days / half_life_days).
+
+        Args:
+            domain: Domain, or None for all domains
+            half_life_days: Age at which a posting counts half
+            now: Day number ages are measured from (defaults to today)
+
+        Returns:
+            Skill id -> weighted posting count (empty when the domain has no postings)
+        """
+        end = today() if now is None else now
+        with self._lock:
+            names = [domain] if domain else list(self.domains)
+            starts = [self.domains[name].origin for name in names if name in self.domains and len(self.domains[name].postings)]
+            if not starts or min(starts) > end:
+                return {}
+            counts, _, _ = self._window(domain, min(starts), end)
+        ages = np.arange(len(counts) - 1, -1, -1, dtype=float)
+        weighted = (0.5 ** (ages / half_life_days)) @ counts
+        return {self.skills[column]: float(weighted[column]) for column in np.flatnonzero(weighted)}
+
+    def _entries(self, totals: np.ndarray, posting_count: int, top_n: int) -> List[Dict]:
+        nonzero = np.flatnonzero(totals)
+        ranked = nonzero[np.lexsort((nonzero, -totals[nonzero]))][:top_n]
+        return [
+            {
+                "skill": skill_display_name(self.skills[column]),
+                "count": int(totals[column]),
+                "share": round(totals[column] / posting_count, 4) if posting_count else 0.0,
+            }
+            for column in ranked
+        ]
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "jobs": len(self.jobs),
+                "domains": len(self.domains),
+                "skills": len(self.skills),
+                "taxonomyVersion": self.taxonomy_version,
+            }
+
+
+def recency_weighted_frequency(postings: Iterable[Dict], half_life_days: float, now: Optional[int] = None) -> Dict[str, float]:
+    """Recency weighted skill demand of postings supplied with a request (undated ones count as posted today)."""
+    end = today() if now is None else now
+    weighted: Dict[str, float] = {}
+    for posting in postings:
+        age = max(end - day_number(posting.get("createdAt")), 0)
+        weight = 0.5 ** (age / half_life_days)
+        skills = posting["skills"] if "skills" in posting else get_all_skills_flat(posting.get("extractedSkills") or {})
+        for skill in {normalize_skill(s) for s in skills}:
+            weighted[skill] = weighted.get(skill, 0.0) + weight
+    return weighted
+
+
+def counting_into(trends: DemandTrends, jobs: Iterable[Dict]) -> Iterable[Dict]:
+    """Pass jobs through, adding each to the trends on the way (one read of the store feeds both indexes)."""
+    for job in jobs:
+        trends.add_job(job)
+        yield job
+
+
+def get_demand_trends() -> DemandTrends:
+    """Get the demand trends, built with the job index (and rebuilt with it when the taxonomy version changes)."""
+    from services.job_index import get_job_index
+
+    return get_job_index().trends
@@ -1,15 +1,29 @@
-from typing import List, Dict, Tuple
+import heapq
+from typing import List, Dict, Set, Tuple, Optional
+import numpy as np
 from services.nlp_engine import (
     extract_skills_from_text,
     get_all_skills_flat,
     calculate_skill_frequency,
-    normalize_skill
+    normalize_skill,
+    skill_display_name
 )
-from services.learning_resources import get_resources_for_skill, get_priority_learning_path
+from services.learning_resources import DEFAULT_SKILL_HOURS, get_resources_for_skill, get_priority_learning_path
+from services.skill_embeddings import get_skill_embeddings, partial_match_entries
+
+def missing_priority(frequency: int) -> str:
+    """Priority tier for a high-demand skill the user is missing."""
+    return "Critical" if frequency >= 7 else "High" if frequency >= 4 else "Medium"
+
+def matched_demand(frequency: int) -> str:
+    """Demand tier for a skill the user already has."""
+    return "High" if frequency >= 5 else "Medium"
 
 def calculate_readiness_score(
     user_skills: Dict[str, List[str]],
-    market_skills_frequency: Dict[str, int]
+    market_skills_frequency: Dict[str, int],
+    total_market_weight: Optional[int] = None,
+    partial_credit: Optional[Dict[str, float]] = None
 ) -> int:
     """
     Calculate internship readiness score (0-100) based on skill matching.
@@ -17,6 +31,8 @@ def calculate_readiness_score(
     Args:
         user_skills: User's categorized skills
         market_skills_frequency: Market demand for skills (skill -> count)
+        total_market_weight: Precomputed sum of the market frequencies, if known
+        partial_credit: Share of demand earned for skills the user only has a near-equivalent of
         
     Returns:
         Readiness score (0-100)
@@ -24,20 +40,37 @@ def calculate_readiness_score(
     if not market_skills_frequency:
         return 0
     
-    user_skills_flat = [normalize_skill(s) for s in get_all_skills_flat(user_skills)]
+    user_skills_flat = {normalize_skill(s) for s in get_all_skills_flat(user_skills)}
     
     if not user_skills_flat:
         return 0
     
-    # Calculate weighted match score
-    total_market_weight = sum(market_skills_frequency.values())
+    if total_market_weight is None:
+        total_market_weight = sum(market_skills_frequency.values())
+    matched_weight = matched_market_weight(user_skills_flat, market_skills_frequency, partial_credit)
+    
+    return readiness_from_weight(matched_weight, total_market_weight)
+
+def matched_market_weight(
+    user_skills_flat: Set[str],
+    market_skills_frequency: Dict[str, int],
+    partial_credit: Optional[Dict[str, float]] = None
+) -> float:
+    """Market demand covered by the user's normalized skills, plus partial credit for near-equivalents."""
     matched_weight = 0
     
     for skill in user_skills_flat:
         if skill in market_skills_frequency:
             matched_weight += market_skills_frequency[skill]
     
-    # Calculate percentage
+    if partial_credit:
+        for skill, credit in partial_credit.items():
+            matched_weight += market_skills_frequency.get(skill, 0) * credit
+    
+    return matched_weight
+
+def readiness_from_weight(matched_weight: float, total_market_weight: float) -> int:
+    """Readiness score (0-100) for a matched share of the market weight."""
     if total_market_weight > 0:
         score = int((matched_weight / total_market_weight) * 100)
         return min(score, 100)  # Cap at 100
@@ -54,20 +87,22 @@ def identify_matched_skills(
     Returns:
         List of matched skills with frequency data
     """
-    user_skills_flat = [normalize_skill(s) for s in get_all_skills_flat(user_skills)]
-    matched = []
+    user_skills_flat = {normalize_skill(s) for s in get_all_skills_flat(user_skills)}
     
-    for skill in user_skills_flat:
-        if skill in market_skills_frequency:
-            matched.append({
-                "skill": skill.title(),
-                "frequency": market_skills_frequency[skill],
-                "demand": "High" if market_skills_frequency[skill] >= 5 else "Medium"
-            })
-    
-    # Sort by frequency (most in-demand first)
-    matched.sort(key=lambda x: x["frequency"], reverse=True)
-    return matched
+    # Sort by frequency (most in-demand first), ties broken by skill id
+    matched_ids = sorted(
+        (skill for skill in user_skills_flat if skill in market_skills_frequency),
+        key=lambda skill: (-market_skills_frequency[skill], skill)
+    )
+    
+    return [
+        {
+            "skill": skill_display_name(skill),
+            "frequency": market_skills_frequency[skill],
+            "demand": matched_demand(market_skills_frequency[skill])
+        }
+        for skill in matched_ids
+    ]
 
 def identify_missing_skills(
     user_skills: Dict[str, List[str]],
@@ -85,21 +120,27 @@ def identify_missing_skills(
     Returns:
         List of missing skills with priority
     """
-    user_skills_flat = [normalize_skill(s) for s in get_all_skills_flat(user_skills)]
-    missing = []
-    
-    for skill, frequency in market_skills_frequency.items():
-        if skill not in user_skills_flat:
-            priority = "Critical" if frequency >= 7 else "High" if frequency >= 4 else "Medium"
-            missing.append({
-                "skill": skill.title(),
-                "frequency": frequency,
-                "priority": priority
-            })
-    
-    # Sort by frequency and return top N
-    missing.sort(key=lambda x: x["frequency"], reverse=True)
-    return missing[:top_n]
+    user_skills_flat = {normalize_skill(s) for s in get_all_skills_flat(user_skills)}
+    
+    # Partial selection of the top N by frequency, ties broken by skill id
+    top_missing = heapq.nsmallest(
+        top_n,
+        (
+            (-frequency, skill)
+            for skill, frequency in market_skills_frequency.items()
+            if skill not in user_skills_flat
+        )
+    )
+    
+    # Build response entries only for the returned skills
+    return [
+        {
+            "skill": skill_display_name(skill),
+            "frequency": -neg_frequency,
+            "priority": missing_priority(-neg_frequency)
+        }
+        for neg_frequency, skill in top_missing
+    ]
 
 def get_skill_resources(skill: str) -> Dict:
     """
@@ -149,10 +190,21 @@ def get_skill_resources(skill: str) -> Dict:
 
 def generate_learning_roadmap(
     missing_skills: List[Dict[str, any]],
-    current_score: int
+    market_weights: Dict[str, float],
+    matched_weight: float,
+    total_market_weight: float,
+    partial_credit: Optional[Dict[str, float]] = None
 ) -> List[Dict]:
     """
-    Generate a personalized structured learning roadmap with curated resources.
+    Generate a personalized structured learning roadmap with curated resources,
+    ordered by readiness gain per estimated learning hour.
+    
+    Args:
+        missing_skills: Missing skill entries
+        market_weights: Skill weights the readiness score is computed from (frequencies, or recency weighted)
+        matched_weight: Market weight the user already matches
+        total_market_weight: Total market weight
+        partial_credit: Share of demand already earned for near-equivalent skills
     
     Returns:
         List of roadmap items with details and learning resources
@@ -167,27 +219,73 @@ def generate_learning_roadmap(
         max_resources_per_skill=3
     )
     
-    # Add additional metadata
-    for i, item in enumerate(roadmap):
-        item["order"] = i + 1
-        item["scoreImpact"] = _calculate_score_impact(item.get("frequency", 0), current_score)
+    partial_credit = partial_credit or {}
+    skill_ids = [normalize_skill(item["skill"]) for item in roadmap]
+    gains = np.array([
+        market_weights.get(skill, 0) * (1 - partial_credit.get(skill, 0.0))
+        for skill in skill_ids
+    ], dtype=float)
+    hours = np.array([item["estimatedHours"] or DEFAULT_SKILL_HOURS for item in roadmap], dtype=float)
+    order, score_gains, cumulative = simulate_score_impact(matched_weight, total_market_weight, gains, hours)
+    
+    ordered = []
+    for step, i in enumerate(order):
+        item = roadmap[i]
+        item["order"] = step + 1
+        item["scoreGain"] = int(score_gains[i])
+        item["scoreImpact"] = f"+{score_gains[i]}%" if score_gains[i] > 0 else "+<1%"
+        item["gainPerHour"] = round(float(gains[i] / total_market_weight * 100 / hours[i]), 3) if total_market_weight > 0 else 0.0
+        item["cumulativeScore"] = int(cumulative[step])
+        ordered.append(item)
     
-    return roadmap
+    return ordered
 
-def _calculate_score_impact(frequency: int, current_score: int) -> str:
-    """Estimate how much learning this skill could boost the score."""
-    if frequency >= 10:
-        return "+10-15%"
-    elif frequency >= 5:
-        return "+5-10%"
-    elif frequency >= 3:
-        return "+3-5%"
-    else:
-        return "+1-3%"
+def simulate_score_impact(
+    matched_weight: float,
+    total_market_weight: float,
+    gains: np.ndarray,
+    hours: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Exact readiness score changes from learning missing skills.
+    
+    Learning a skill adds its remaining market weight (its frequency, less any
+    partial credit already earned) to the matched weight. Gains don't interact,
+    so ordering by gain per hour gives the greedy sequence, and both the single
+    skill gains and the score after each step of the sequence are computed in
+    one pass over the vectors.
+    
+    Args:
+        matched_weight: Market weight the user already matches
+        total_market_weight: Total market weight
+        gains: Weight each candidate skill would add
+        hours: Estimated learning hours of each candidate
+    
+    Returns:
+        Candidate indices by gain per hour (ties by larger gain, then input order),
+        the score gain of each candidate learned alone, and the readiness score
+        after each step of the ordered sequence
+    """
+    if total_market_weight <= 0:
+        zeros = np.zeros(len(gains), dtype=int)
+        return np.arange(len(gains)), zeros, zeros
+    
+    def readiness(weights: np.ndarray) -> np.ndarray:
+        # Same arithmetic as readiness_from_weight, so the gains match the reported score exactly
+        return np.minimum(np.floor(weights / total_market_weight * 100), 100).astype(int)
+    
+    current = readiness(np.array([matched_weight], dtype=float))[0]
+    score_gains = readiness(matched_weight + gains) - current
+    order = np.lexsort((np.arange(len(gains)), -gains, -(gains / hours)))
+    cumulative = readiness(matched_weight + np.cumsum(gains[order]))
+    return order, score_gains, cumulative
 
 def analyze_gap(
     user_skills: Dict[str, List[str]],
-    job_descriptions: List[Dict]
+    job_descriptions: Optional[List[Dict]] = None,
+    market_profile=None,
+    semantic: bool = False,
+    recency_weights: Optional[Dict[str, float]] = None
 ) -> Dict:
     """
     Perform comprehensive gap analysis.
@@ -195,24 +293,51 @@ def analyze_gap(
     Args:
         user_skills: User's categorized skills
         job_descriptions: List of job postings with extracted skills
+        market_profile: Precomputed MarketProfile to use instead of counting postings
+        semantic: Give partial credit for near-equivalent skills (e.g. MySQL for PostgreSQL)
+        recency_weights: Recency weighted skill demand (see DemandTrends.recency_weights) to compute
+            the readiness score and roadmap gains from instead of plain posting counts
         
     Returns:
         Complete analysis results
     """
-    # Calculate market skill frequency
-    market_frequency = calculate_skill_frequency(job_descriptions)
+    if market_profile is not None:
+        market_frequency = market_profile.frequency
+        total_weight = market_profile.total_weight
+    else:
+        # Calculate market skill frequency
+        market_frequency = calculate_skill_frequency(job_descriptions or [])
+        total_weight = sum(market_frequency.values())
     
-    # Calculate readiness score
-    readiness_score = calculate_readiness_score(user_skills, market_frequency)
+    user_skills_flat = [normalize_skill(s) for s in get_all_skills_flat(user_skills)]
     
-    # Identify matched and missing skills
-    matched_skills = identify_matched_skills(user_skills, market_frequency)
-    missing_skills = identify_missing_skills(user_skills, market_frequency)
+    partial_matches = {}
+    partial_credit = None
+    if semantic:
+        embeddings = get_skill_embeddings()
+        partial_matches = embeddings.partial_matches(set(user_skills_flat), market_frequency)
+        partial_credit = embeddings.partial_credits(partial_matches)
+    
+    # Calculate readiness score (the matched weight also drives the roadmap's score simulation)
+    market_weights = market_frequency
+    if recency_weights:
+        market_weights, total_weight = recency_weights, sum(recency_weights.values())
+    matched_weight = matched_market_weight(set(user_skills_flat), market_weights, partial_credit)
+    readiness_score = readiness_from_weight(matched_weight, total_weight)
+    
+    if market_profile is not None:
+        # Served from the precomputed profile: no per-posting work
+        matched_skills = market_profile.matched_skills(user_skills_flat)
+        missing_skills = market_profile.missing_skills(set(user_skills_flat))
+    else:
+        # Identify matched and missing skills
+        matched_skills = identify_matched_skills(user_skills, market_frequency)
+        missing_skills = identify_missing_skills(user_skills, market_frequency)
     
     # Generate roadmap
-    roadmap = generate_learning_roadmap(missing_skills, readiness_score)
+    roadmap = generate_learning_roadmap(missing_skills, market_weights, matched_weight, total_weight, partial_credit)
     
-    return {
+    result = {
         "readinessScore": readiness_score,
         "matchedSkills": matched_skills,
         "missingSkills": missing_skills,
@@ -220,3 +345,7 @@ def analyze_gap(
         "totalMarketSkills": len(market_frequency),
         "userSkillCount": len(get_all_skills_flat(user_skills))
     }
+    if semantic:
+        result["partialMatches"] = partial_match_entries(partial_matches, market_frequency)
+    
+    return result
@@ -0,0 +1,97 @@
+"""
+Incremental Resume Analysis Service
+Re-analyzes an edited resume by reusing per-segment results from a previous analysis
+"""
+
+import uuid
+from typing import Dict, List, Optional
+from services.cache import LRUCache, content_hash
+from services.nlp_engine import extract_skills_batch, merge_skill_results
+from services.resume_feedback import (
+    collect_feedback_evidence,
+    merge_feedback_evidence,
+    build_resume_feedback
+)
+from services.skill_taxonomy import get_taxonomy
+from services.text_segments import split_segments
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Per-segment results shared across analyses: (taxonomy version, segment hash) -> result
+_segment_cache = LRUCache(max_entries=20000)
+# Stored analyses: analysis id -> {"taxonomyVersion": ..., "segments": {hash: result}}
+_analyses = LRUCache(max_entries=2000)
+
+
+def analyze_segments(text: str, base_analysis_id: Optional[str] = None) -> Dict:
+    """
+    Analyze resume text segment by segment, reusing results for unchanged segments.
+
+    Args:
+        text: Full (possibly edited) resume text
+        base_analysis_id: Id of a previous analysis of an earlier version of the text
+
+    Returns:
+        Merged skills and quality feedback plus a new analysis id for the next edit
+    """
+    taxonomy = get_taxonomy()
+    segments = split_segments(text)
+    keys = [content_hash(segment) for segment in segments]
+
+    base = _analyses.get(base_analysis_id) if base_analysis_id else None
+    known: Dict[str, Dict] = {}
+    if base is not None and base["taxonomyVersion"] == taxonomy.version:
+        known = base["segments"]
+
+    # Diff against the base analysis by segment content
+    results: Dict[str, Dict] = {}
+    pending: List[int] = []
+    for i, key in enumerate(keys):
+        if key in results:
+            continue
+        cached = known.get(key) or _segment_cache.get((taxonomy.version, key))
+        if cached is not None:
+            results[key] = cached
+        else:
+            results[key] = None
+            pending.append(i)
+
+    # Re-run extraction and feedback only for changed segments
+    extracted = extract_skills_batch([segments[i] for i in pending], taxonomy)
+    for i, skills in zip(pending, extracted):
+        result = {
+            "skills": skills,
+            "evidence": collect_feedback_evidence(segments[i])
+        }
+        _segment_cache.set((taxonomy.version, keys[i]), result)
+        results[keys[i]] = result
+
+    ordered = [results[key] for key in keys]
+    skills = merge_skill_results(result["skills"] for result in ordered)
+    if not ordered:
+        skills = taxonomy.empty_result()
+    feedback = build_resume_feedback(merge_feedback_evidence([result["evidence"] for result in ordered]))
+
+    analysis_id = uuid.uuid4().hex
+    _analyses.set(analysis_id, {"taxonomyVersion": taxonomy.version, "segments": results})
+
+    logger.info(
+        f"Incremental analysis {analysis_id}: {len(pending)} of {len(keys)} segments recomputed"
+        f" (base: {base_analysis_id if base is not None else 'none'})"
+    )
+
+    return {
+        "analysisId": analysis_id,
+        "baseAnalysisId": base_analysis_id,
+        "incremental": base is not None,
+        "skills": skills,
+        "totalSkills": sum(len(skill_list) for skill_list in skills.values()),
+        "feedback": feedback,
+        "segments": {
+            "total": len(keys),
+            "reused": len(keys) - len(pending),
+            "recomputed": len(pending)
+        },
+        "taxonomyVersion": taxonomy.version
+    }
@@ -3,13 +3,20 @@ Job Fit Analyzer Service
 Analyzes how well a user's resume matches a specific job description
 """
 
-from typing import Dict, List, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 from services.nlp_engine import (
     extract_skills_from_text,
+    extract_skills_batch,
     get_all_skills_flat,
-    normalize_skill
+    normalize_skill,
+    skill_display_name
 )
 from services.learning_resources import get_resources_for_skill
+from services.keyword_weights import tokenize, get_keyword_stats
+from services.skill_embeddings import get_skill_embeddings, partial_match_entries
+from services.skill_taxonomy import get_taxonomy
+from services.cache import LRUCache, content_hash
 import re
 
 # Common action verbs and keywords for ATS scoring
@@ -29,6 +36,83 @@ ATS_KEYWORDS = {
     ]
 }
 
+# Precomputed JD profiles keyed by (taxonomy version, JD fingerprint)
+_jd_profiles = LRUCache(max_entries=2048)
+
+
+class JDProfile:
+    """
+    Everything analyze_job_fit needs from a job description, computed once per distinct JD.
+
+    Shared between requests, so it must be treated as read-only.
+    """
+
+    def __init__(self, job_description: str, skills: Optional[Dict[str, List[str]]] = None):
+        self.skills = skills if skills is not None else extract_jd_skills(job_description)
+        self.skills_flat = get_all_skills_flat(self.skills)
+        self.skill_ids = {normalize_skill(s) for s in self.skills_flat}
+        self.terms: Counter = tokenize(job_description)
+        # Learning resources for every JD skill, so missing skills need no lookups
+        self.resources: Dict[str, List[Dict]] = {
+            skill_display_name(skill): get_resources_for_skill(skill_display_name(skill), 2)
+            for skill in self.skills_flat
+        }
+
+
+def jd_fingerprint(job_description: str) -> str:
+    """Hash of a job description that ignores case and whitespace differences."""
+    return content_hash(" ".join(job_description.lower().split()))
+
+
+def get_jd_profile(job_description: str) -> JDProfile:
+    """
+    Get the profile of a job description, reusing it when the same JD was seen before.
+    
+    Args:
+        job_description: The raw job description text
+        
+    Returns:
+        Cached or freshly computed JD profile for the active taxonomy
+    """
+    key = (get_taxonomy().version, jd_fingerprint(job_description))
+    profile = _jd_profiles.get(key)
+    if profile is None:
+        profile = JDProfile(job_description)
+        _jd_profiles.set(key, profile)
+    return profile
+
+
+def get_jd_profiles(job_descriptions: List[str]) -> List[JDProfile]:
+    """
+    Get the profiles of several job descriptions, extracting all uncached ones in one batch.
+    
+    Args:
+        job_descriptions: Raw job description texts
+        
+    Returns:
+        JD profiles in input order
+    """
+    version = get_taxonomy().version
+    keys = [(version, jd_fingerprint(text)) for text in job_descriptions]
+    profiles = [_jd_profiles.get(key) for key in keys]
+    
+    # First occurrence of each uncached JD
+    pending = {}
+    for index, (key, profile) in enumerate(zip(keys, profiles)):
+        if profile is None and key not in pending:
+            pending[key] = index
+    
+    if pending:
+        # Kept locally: with more new JDs than the cache holds, early ones would already be evicted
+        built = {}
+        texts = [job_descriptions[index] for index in pending.values()]
+        for (key, index), skills in zip(pending.items(), extract_skills_batch(texts)):
+            built[key] = JDProfile(job_descriptions[index], skills)
+            _jd_profiles.set(key, built[key])
+        profiles = [profile or built[key] for key, profile in zip(keys, profiles)]
+    
+    return profiles
+
 
 def extract_jd_skills(job_description: str) -> Dict[str, List[str]]:
     """
@@ -45,11 +129,17 @@ def extract_jd_skills(job_description: str) -> Dict[str, List[str]]:
 
 def calculate_skill_match(
     user_skills: Dict[str, List[str]], 
-    jd_skills: Dict[str, List[str]]
+    jd_skills: Dict[str, List[str]],
+    partial_credit: Optional[Dict[str, float]] = None
 ) -> Tuple[float, List[str], List[str], List[str]]:
     """
     Calculate how well user skills match job description skills.
     
+    Args:
+        user_skills: User's categorized skills
+        jd_skills: Skills extracted from the job description
+        partial_credit: Share of a missing skill earned through a near-equivalent user skill
+    
     Returns:
         Tuple of (match_percentage, matched_skills, missing_skills, extra_skills)
     """
@@ -58,7 +148,8 @@ def calculate_skill_match(
     jd_flat = set(normalize_skill(s) for s in get_all_skills_flat(jd_skills))
     
     if not jd_flat:
-        return 100.0, list(user_flat), [], list(user_flat)
+        user_names = sorted(skill_display_name(s) for s in user_flat)
+        return 100.0, user_names, [], user_names
     
     # Find matches
     matched = user_flat.intersection(jd_flat)
@@ -66,56 +157,82 @@ def calculate_skill_match(
     extra = user_flat - jd_flat
     
     # Calculate match percentage
-    match_percentage = (len(matched) / len(jd_flat)) * 100
+    matched_weight = len(matched)
+    if partial_credit:
+        matched_weight += sum(partial_credit.get(skill, 0.0) for skill in missing)
+    match_percentage = (matched_weight / len(jd_flat)) * 100
     
     return (
         round(match_percentage, 1),
-        sorted(list(matched)),
-        sorted(list(missing)),
-        sorted(list(extra))
+        sorted(skill_display_name(s) for s in matched),
+        sorted(skill_display_name(s) for s in missing),
+        sorted(skill_display_name(s) for s in extra)
     )
 
 
-def calculate_ats_score(resume_text: str, job_description: str) -> Dict:
+def resume_ats_features(resume_text: str) -> Dict:
     """
-    Calculate ATS (Applicant Tracking System) compatibility score.
+    Resume-side ATS inputs, which don't depend on the job description.
     
-    Analyzes:
-    - Keyword matches
-    - Action verbs usage
-    - Quantifiable achievements
-    - Skill keyword density
+    Returns:
+        Dict with the resume's term vector and its action verb, impact word and metrics scores
     """
-    resume_lower = resume_text.lower()
-    jd_lower = job_description.lower()
-    
-    scores = {
-        "keyword_match": 0,
-        "action_verbs": 0,
-        "impact_words": 0,
-        "metrics": 0
-    }
-    
-    # Extract JD keywords and check in resume
-    jd_words = set(re.findall(r'\b[a-z]{3,}\b', jd_lower))
-    resume_words = set(re.findall(r'\b[a-z]{3,}\b', resume_lower))
-    
-    # Keyword overlap
-    keyword_overlap = len(jd_words.intersection(resume_words))
-    scores["keyword_match"] = min(100, (keyword_overlap / max(len(jd_words), 1)) * 150)
+    # Tokenize once into a sparse term-frequency vector
+    resume_terms = tokenize(resume_text)
     
     # Action verbs in resume
-    action_count = sum(1 for verb in ATS_KEYWORDS["action_verbs"] if verb in resume_lower)
-    scores["action_verbs"] = min(100, (action_count / 5) * 100)
+    action_count = sum(1 for verb in ATS_KEYWORDS["action_verbs"] if verb in resume_terms)
     
     # Impact words
-    impact_count = sum(1 for word in ATS_KEYWORDS["impact_words"] if word in resume_lower)
-    scores["impact_words"] = min(100, (impact_count / 3) * 100)
+    impact_count = sum(1 for word in ATS_KEYWORDS["impact_words"] if word in resume_terms)
     
     # Metrics/quantifiable achievements
     metrics_found = sum(1 for pattern in ATS_KEYWORDS["metrics_patterns"] 
                        if re.search(pattern, resume_text))
-    scores["metrics"] = min(100, (metrics_found / 2) * 100)
+    
+    return {
+        "terms": resume_terms,
+        "action_verbs": min(100, (action_count / 5) * 100),
+        "impact_words": min(100, (impact_count / 3) * 100),
+        "metrics": min(100, (metrics_found / 2) * 100)
+    }
+
+
+def calculate_ats_score(
+    resume_text: str,
+    job_description: str,
+    jd_terms: Optional[Counter] = None,
+    resume_features: Optional[Dict] = None
+) -> Dict:
+    """
+    Calculate ATS (Applicant Tracking System) compatibility score.
+    
+    Analyzes:
+    - Keyword matches (BM25-weighted against the job posting corpus)
+    - Action verbs usage
+    - Quantifiable achievements
+    - Skill keyword density
+    
+    Args:
+        resume_text: Raw resume text
+        job_description: Target job description text
+        jd_terms: The JD's precomputed term frequencies, if known
+        resume_features: Precomputed resume_ats_features(resume_text), if known
+    """
+    if resume_features is None:
+        resume_features = resume_ats_features(resume_text)
+    if jd_terms is None:
+        jd_terms = tokenize(job_description)
+    
+    # Keyword overlap, weighted by how distinctive each JD keyword is across postings
+    coverage = get_keyword_stats().keyword_coverage(resume_features["terms"], jd_terms)
+    
+    scores = {
+        "keyword_match": coverage * 100,
+        "action_verbs": resume_features["action_verbs"],
+        "impact_words": resume_features["impact_words"],
+        "metrics": resume_features["metrics"]
+    }
     
     # Overall ATS score (weighted average)
     overall = (
@@ -159,11 +276,24 @@ def generate_ats_tips(scores: Dict) -> List[str]:
     return tips
 
 
+def get_fit_level(match_pct: float) -> Tuple[str, str, str]:
+    """Fit level, color and message for a match percentage."""
+    if match_pct >= 80:
+        return "Excellent", "green", "You're a strong match for this role!"
+    elif match_pct >= 60:
+        return "Good", "blue", "You have most of the required skills"
+    elif match_pct >= 40:
+        return "Moderate", "yellow", "Consider upskilling in the missing areas"
+    else:
+        return "Needs Work", "red", "Focus on building the core required skills"
+
+
 def analyze_job_fit(
     user_skills: Dict[str, List[str]],
     job_description: str,
     resume_text: str = "",
-    domain: str = ""
+    domain: str = "",
+    semantic: bool = False
 ) -> Dict:
     """
     Comprehensive job fit analysis.
@@ -173,49 +303,46 @@ def analyze_job_fit(
         job_description: Target job description text
         resume_text: Optional raw resume text for ATS analysis
         domain: Optional domain context
+        semantic: Give partial credit for near-equivalent skills
         
     Returns:
         Complete job fit analysis results
     """
-    # Extract skills from JD
-    jd_skills = extract_jd_skills(job_description)
+    # Skills, keywords and resources of the JD (cached for repeat JDs)
+    jd_profile = get_jd_profile(job_description)
+    jd_skills = jd_profile.skills
+    
+    # Near-equivalent skills for the JD skills the user lacks
+    partial_matches = {}
+    partial_credit = None
+    if semantic:
+        embeddings = get_skill_embeddings()
+        partial_matches = embeddings.partial_matches(
+            (normalize_skill(s) for s in get_all_skills_flat(user_skills)),
+            (normalize_skill(s) for s in jd_profile.skills_flat)
+        )
+        partial_credit = embeddings.partial_credits(partial_matches)
     
     # Calculate skill match
-    match_pct, matched, missing, extra = calculate_skill_match(user_skills, jd_skills)
+    match_pct, matched, missing, extra = calculate_skill_match(user_skills, jd_skills, partial_credit)
     
     # Calculate ATS score if resume text provided
     ats_result = None
     if resume_text:
-        ats_result = calculate_ats_score(resume_text, job_description)
+        ats_result = calculate_ats_score(resume_text, job_description, jd_profile.terms)
     
     # Get learning resources for missing skills
     missing_with_resources = []
     for skill in missing[:10]:  # Top 10 missing skills
-        resources = get_resources_for_skill(skill, 2)
         missing_with_resources.append({
             "skill": skill,
-            "resources": resources
+            "resources": jd_profile.resources.get(skill) or get_resources_for_skill(skill, 2)
         })
     
     # Determine fit level
-    if match_pct >= 80:
-        fit_level = "Excellent"
-        fit_color = "green"
-        fit_message = "You're a strong match for this role!"
-    elif match_pct >= 60:
-        fit_level = "Good"
-        fit_color = "blue"
-        fit_message = "You have most of the required skills"
-    elif match_pct >= 40:
-        fit_level = "Moderate"
-        fit_color = "yellow"
-        fit_message = "Consider upskilling in the missing areas"
-    else:
-        fit_level = "Needs Work"
-        fit_color = "red"
-        fit_message = "Focus on building the core required skills"
+    fit_level, fit_color, fit_message = get_fit_level(match_pct)
     
-    return {
+    result = {
         "matchPercentage": match_pct,
         "fitLevel": fit_level,
         "fitColor": fit_color,
@@ -227,8 +354,12 @@ def analyze_job_fit(
         "missingWithResources": missing_with_resources,
         "extraSkills": extra,
         "extraCount": len(extra),
-        "jdSkillsExtracted": get_all_skills_flat(jd_skills),
-        "jdSkillCount": len(get_all_skills_flat(jd_skills)),
+        "jdSkillsExtracted": list(jd_profile.skills_flat),
+        "jdSkillCount": len(jd_profile.skills_flat),
         "atsScore": ats_result,
         "domain": domain
     }
+    if semantic:
+        result["partialMatches"] = partial_match_entries(partial_matches)
+    
+    return result
@@ -0,0 +1,401 @@
+"""
+Job Index Service
+In-memory inverted index from canonical skill to job postings for "jobs that fit me" search
+"""
+
+import heapq
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from config import get_settings
+from services.nlp_engine import get_all_skills_flat, normalize_skill, skill_display_name
+from services.skill_taxonomy import get_taxonomy
+from services.demand_trends import DemandTrends, counting_into
+import logging
+
+logger = logging.getLogger(__name__)
+
+# BM25 length normalization: jobs listing many skills count each match for less
+K1 = 1.2
+B = 0.75
+
+# Job skills (missing from the user's profile) listed per search result
+MISSING_SUMMARY_SIZE = 5
+
+_index: Optional["JobIndex"] = None
+_index_lock = threading.Lock()
+# Taxonomy version of the latest background rebuild, and whether one is running
+_rebuild_version: Optional[str] = None
+_rebuilding = False
+
+
+class JobIndex:
+    """
+    Inverted index over job postings' canonical skills.
+
+    Each skill's posting list is split by job length (number of skills),
+    because the BM25 length factor is the only per-job part of a score:
+    searching shortest jobs first gives a tight upper bound for everything
+    not yet visited. Jobs get dense internal doc ids in insertion order, so
+    every list stays sorted by appending; removed jobs leave tombstones
+    that searches skip.
+    """
+
+    def __init__(self, taxonomy_version: str):
+        self.taxonomy_version = taxonomy_version
+        # skill -> job length -> doc ids
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        # Array copies of posting lists, dropped when the list grows
+        self._arrays: Dict[Tuple[str, int], np.ndarray] = {}
+        self.document_frequency: Dict[str, int] = {}
+        self.doc_skills: List[Optional[Set[str]]] = []
+        self.doc_info: List[Optional[Dict]] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.live_count = 0
+        self.total_length = 0
+        # Demand trends over the same postings, built and synced together with the index
+        self.trends = DemandTrends(taxonomy_version)
+        self._lock = threading.RLock()
+
+    def add_job(self, job: Dict):
+        """Index a job (dict with "id", "extractedSkills" and optional title/company/domain), replacing any previous version."""
+        skills = {normalize_skill(s) for s in get_all_skills_flat(job.get("extractedSkills") or {})}
+        with self._lock:
+            if job["id"] in self.doc_ids:
+                self.remove_job(job["id"])
+
+            doc = len(self.doc_skills)
+            self.doc_ids[job["id"]] = doc
+            self.doc_skills.append(skills)
+            self.doc_info.append({
+                "id": job["id"],
+                "title": job.get("title") or "",
+                "company": job.get("company") or "",
+                "domain": job.get("domain") or "",
+            })
+            for skill in skills:
+                self.postings.setdefault(skill, {}).setdefault(len(skills), []).append(doc)
+                self._arrays.pop((skill, len(skills)), None)
+                self.document_frequency[skill] = self.document_frequency.get(skill, 0) + 1
+            self.live_count += 1
+            self.total_length += len(skills)
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> int:
+        """Index several jobs. Returns the number indexed."""
+        count = 0
+        for job in jobs:
+            self.add_job(job)
+            count += 1
+        return count
+
+    def remove_job(self, job_id: str) -> bool:
+        """Drop a job from search results. Returns whether it was indexed."""
+        with self._lock:
+            doc = self.doc_ids.pop(job_id, None)
+            if doc is None:
+                return False
+            skills = self.doc_skills[doc]
+            for skill in skills:
+                self.document_frequency[skill] -= 1
+            self.total_length -= len(skills)
+            self.doc_skills[doc] = None
+            self.doc_info[doc] = None
+            self.live_count -= 1
+            return True
+
+    def idf(self, skill: str) -> float:
+        """Rarer skills say more about fit than ones every posting lists."""
+        df = self.document_frequency.get(skill, 0)
+        return math.log(1 + (self.live_count - df + 0.5) / (df + 0.5))
+
+    def search(self, user_skills: Dict[str, List[str]], k: int = 10, domain: Optional[str] = None) -> List[Dict]:
+        """
+        Find the k jobs that best match a skill profile.
+
+        Jobs are scored by BM25 over the user's skills. Length buckets are
+        visited shortest first and the search stops as soon as no longer
+        job can beat the k-th best score. Within a bucket, MaxScore pruning
+        keeps skills whose combined weight cannot lift a job into the top k
+        from generating candidates; they are only looked up for jobs reached
+        through the remaining skills.
+
+        Args:
+            user_skills: User's categorized skills
+            k: Number of jobs to return
+            domain: Only return jobs in this domain
+
+        Returns:
+            Best matching jobs, best first
+        """
+        query = {normalize_skill(s) for s in get_all_skills_flat(user_skills)}
+
+        with self._lock:
+            if not self.live_count or k <= 0:
+                return []
+            average_length = max(self.total_length / self.live_count, 1.0)
+
+            # Query skills by weight, smallest first, with running weight totals
+            terms = sorted((self.idf(skill), skill) for skill in query if self.document_frequency.get(skill))
+            if not terms:
+                return []
+            prefix_weights = []
+            running = 0.0
+            for weight, _ in terms:
+                running += weight
+                prefix_weights.append(running)
+            total_weight = running
+
+            lengths = sorted({length for _, skill in terms for length in self.postings[skill]})
+            top: List[tuple] = []  # min-heap of (score, -doc)
+            threshold = 0.0
+
+            for length in lengths:
+                saturation = self._saturation(length, average_length)
+                full = len(top) >= k
+                # Every remaining job is at least this long, so none can score higher
+                if full and saturation * total_weight < threshold:
+                    break
+
+                # Skills that can't lift a job past the threshold on their own are non-essential
+                first_essential = 0
+                if full:
+                    while first_essential < len(terms) and saturation * prefix_weights[first_essential] < threshold:
+                        first_essential += 1
+
+                # Candidates come from the essential skills' lists only
+                lists = [(weight, self._posting_array(skill, length)) for weight, skill in terms[first_essential:]]
+                lists = [(weight, docs) for weight, docs in lists if docs.size]
+                if not lists:
+                    continue
+                candidates, positions = np.unique(
+                    np.concatenate([docs for _, docs in lists]), return_inverse=True
+                )
+                weight_sums = np.bincount(
+                    positions,
+                    weights=np.concatenate([np.full(docs.size, weight) for weight, docs in lists]),
+                    minlength=candidates.size
+                )
+
+                # Non-essential skills are only looked up for those candidates
+                for weight, skill in terms[:first_essential]:
+                    docs = self._posting_array(skill, length)
+                    if docs.size:
+                        weight_sums += weight * np.isin(candidates, docs, assume_unique=True)
+
+                # Best first (ties: earliest job), until nothing left can enter the top k
+                scores = weight_sums * saturation
+                for position in np.lexsort((candidates, -scores)):
+                    score = float(scores[position])
+                    if len(top) >= k and score < threshold:
+                        break
+                    doc = int(candidates[position])
+                    if self.doc_skills[doc] is None or (domain and self.doc_info[doc]["domain"] != domain):
+                        continue
+
+                    entry = (score, -doc)
+                    if len(top) < k:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+                    if len(top) >= k:
+                        threshold = top[0][0]
+
+            ranked = sorted(top, reverse=True)
+            return [self._result(-neg_doc, score, query) for score, neg_doc in ranked]
+
+    def _posting_array(self, skill: str, length: int) -> np.ndarray:
+        docs = self._arrays.get((skill, length))
+        if docs is None:
+            docs = np.array(self.postings.get(skill, {}).get(length, ()), dtype=np.int64)
+            self._arrays[(skill, length)] = docs
+        return docs
+
+    @staticmethod
+    def _saturation(length: int, average_length: float) -> float:
+        return (K1 + 1) / (1 + K1 * (1 - B + B * length / average_length))
+
+    def _result(self, doc: int, score: float, query: Set[str]) -> Dict:
+        skills = self.doc_skills[doc]
+        matched = sorted(skill_display_name(s) for s in skills & query)
+        missing = sorted(skills - query, key=lambda s: (-self.idf(s), s))[:MISSING_SUMMARY_SIZE]
+        return {
+            **self.doc_info[doc],
+            "score": round(score, 3),
+            "coverage": round(len(matched) / len(skills) * 100, 1) if skills else 0.0,
+            "matchedSkills": matched,
+            "missingSkills": [skill_display_name(s) for s in missing],
+            "jobSkillCount": len(skills),
+        }
+
+    def summary(self) -> Dict:
+        """Size of the index."""
+        return {
+            "jobs": self.live_count,
+            "skills": sum(1 for df in self.document_frequency.values() if df),
+            "taxonomyVersion": self.taxonomy_version,
+        }
+
+
+def iter_mock_job_summaries() -> Iterable[Dict]:
+    """The built-in mock postings as indexable jobs, for running without a database."""
+    from services.market_profiles import load_mock_jobs
+
+    for domain, postings in load_mock_jobs().items():
+        for i, posting in enumerate(postings):
+            yield {
+                "id": f"mock-{domain.lower().replace(' ', '-')}-{i + 1}",
+                "title": posting.get("title") or f"{domain} (sample posting)",
+                "company": posting.get("company") or "",
+                "domain": domain,
+                "extractedSkills": {"skills": posting.get("skills", [])},
+            }
+
+
+def build_job_index(use_database: bool = True) -> JobIndex:
+    """
+    Build the index, and the demand trends alongside it, from the jobs database
+    or the mock postings (counted as posted today) if none is configured.
+
+    Args:
+        use_database: Read the jobs database when one is configured (False indexes the mock postings)
+    """
+    from db.job_store import open_job_store
+
+    started = time.perf_counter()
+    index = JobIndex(get_taxonomy().version)
+    database_url = get_settings().database_url
+
+    if database_url and use_database:
+        with open_job_store(database_url) as store:
+            index.add_jobs(counting_into(index.trends, store.iter_job_summaries()))
+    else:
+        index.add_jobs(counting_into(index.trends, iter_mock_job_summaries()))
+
+    logger.info(f"Indexed {index.live_count} jobs in {time.perf_counter() - started:.2f}s")
+    return index
+
+
+def refresh_job_index(index: JobIndex) -> Dict[str, int]:
+    """
+    Apply jobs added to or deleted from the database since the index was built,
+    to the index and the demand trends.
+
+    Returns:
+        Number of jobs added and removed
+    """
+    from db.job_store import open_job_store
+
+    database_url = get_settings().database_url
+    if not database_url:
+        return {"added": 0, "removed": 0}
+
+    with open_job_store(database_url) as store:
+        stored = store.job_ids()
+        with index._lock:
+            indexed = set(index.doc_ids)
+        added = stored - indexed
+        removed = indexed - stored
+        if added:
+            index.add_jobs(counting_into(index.trends, store.iter_job_summaries(added)))
+
+    for job_id in removed:
+        index.remove_job(job_id)
+        index.trends.remove_job(job_id)
+    if added or removed:
+        logger.info(f"Job index refreshed: {len(added)} added, {len(removed)} removed")
+    return {"added": len(added), "removed": len(removed)}
+
+
+def get_job_index() -> JobIndex:
+    """
+    Get the job index.
+
+    The first call builds it, from the mock postings if the database can't be
+    read (the refresher syncs it with the database once it is back). After a
+    taxonomy change the index is rebuilt in the background, and the previous
+    one is served until the new one is swapped in.
+    """
+    global _index
+
+    version = get_taxonomy().version
+    index = _index
+    if index is not None:
+        if index.taxonomy_version != version:
+            rebuild_job_index(version)
+        return index
+
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = build_job_index()
+            except Exception as e:
+                logger.error(f"Could not read the jobs database, indexing the mock postings until it is back: {e}")
+                _index = build_job_index(use_database=False)
+        return _index
+
+
+def rebuild_job_index(version: str, retry: bool = False):
+    """
+    Rebuild the index for a taxonomy version in a background thread, unless a rebuild is running.
+
+    Args:
+        version: Taxonomy version the rebuild is for
+        retry: Start it even if a rebuild for this version already ran (and failed)
+    """
+    global _rebuild_version, _rebuilding
+
+    with _index_lock:
+        if _rebuilding or (version == _rebuild_version and not retry):
+            return
+        _rebuild_version = version
+        _rebuilding = True
+    threading.Thread(target=_rebuild, args=(version,), name="job-index-rebuild", daemon=True).start()
+
+
+def _rebuild(version: str):
+    global _index, _rebuilding
+
+    try:
+        index = build_job_index()
+        with _index_lock:
+            _index = index
+    except Exception as e:
+        logger.error(f"Rebuilding the job index for taxonomy {version} failed, keeping the current index: {e}")
+    finally:
+        with _index_lock:
+            _rebuilding = False
+
+
+class JobIndexRefresher:
+    """Background thread that keeps the job index in sync with the jobs database."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval if interval is not None else get_settings().job_index_refresh_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0 or not get_settings().database_url:
+            return
+        self._thread = threading.Thread(target=self._run, name="job-index-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                index = get_job_index()
+                version = get_taxonomy().version
+                if index.taxonomy_version != version:
+                    # Retries a rebuild that failed (e.g. while the database was down)
+                    rebuild_job_index(version, retry=True)
+                refresh_job_index(index)
+            except Exception as e:
+                logger.error(f"Job index refresh failed, keeping current index: {e}")
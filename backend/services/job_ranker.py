@@ -0,0 +1,149 @@
+"""
+Job Fit Ranking Service
+Scores one resume against many job descriptions and ranks them by fit
+"""
+
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from services.nlp_engine import get_all_skills_flat, normalize_skill, skill_display_name
+from services.job_fit_analyzer import (
+    calculate_ats_score,
+    get_fit_level,
+    get_jd_profiles,
+    resume_ats_features
+)
+from services.skill_embeddings import get_skill_embeddings
+
+# Missing skills listed per job in the ranking
+MISSING_SUMMARY_SIZE = 5
+
+
+class ResumeProfile:
+    """The user side of a job fit comparison, prepared once and reused for every job."""
+
+    def __init__(self, user_skills: Dict[str, List[str]], resume_text: str = "", semantic: bool = False):
+        self.skill_ids = {normalize_skill(s) for s in get_all_skills_flat(user_skills)}
+        self.resume_text = resume_text
+        self.ats_features = resume_ats_features(resume_text) if resume_text else None
+        self.embeddings = get_skill_embeddings() if semantic else None
+
+
+def score_job_batch(resume: ResumeProfile, jobs: List[Dict], offset: int = 0) -> List[Dict]:
+    """
+    Score a batch of jobs against a prepared resume.
+
+    Uncached job descriptions are extracted together, then skill coverage for
+    the whole batch comes from one job x skill matrix product.
+
+    Args:
+        resume: Prepared resume profile
+        jobs: Job dicts with "description" and optional "id", "title", "company"
+        offset: Position of the first job in the full request, reported as "index"
+
+    Returns:
+        Fit summaries in input order
+    """
+    if not jobs:
+        return []
+
+    profiles = get_jd_profiles([job["description"] for job in jobs])
+
+    # Job x skill incidence matrix over every skill the batch mentions
+    vocabulary = sorted(set().union(*(profile.skill_ids for profile in profiles)))
+    column = {skill: i for i, skill in enumerate(vocabulary)}
+    incidence = np.zeros((len(profiles), len(vocabulary)), dtype=np.float32)
+    for row, profile in enumerate(profiles):
+        incidence[row, [column[skill] for skill in profile.skill_ids]] = 1.0
+
+    # Credit per skill: 1 for skills the user has, partial credit for near-equivalents
+    credit = np.array([1.0 if skill in resume.skill_ids else 0.0 for skill in vocabulary], dtype=np.float32)
+    if resume.embeddings is not None and vocabulary:
+        matches = resume.embeddings.partial_matches(resume.skill_ids, vocabulary)
+        for skill, share in resume.embeddings.partial_credits(matches).items():
+            credit[column[skill]] = share
+
+    covered = incidence @ credit
+    totals = incidence.sum(axis=1)
+    match_percentages = np.where(totals > 0, covered / np.maximum(totals, 1) * 100, 100.0)
+
+    results = []
+    for row, (job, profile) in enumerate(zip(jobs, profiles)):
+        match_pct = round(float(match_percentages[row]), 1)
+        fit_level, fit_color, _ = get_fit_level(match_pct)
+        matched = sorted(skill_display_name(s) for s in profile.skill_ids & resume.skill_ids)
+        missing = sorted(skill_display_name(s) for s in profile.skill_ids - resume.skill_ids)
+
+        ats_score = None
+        if resume.ats_features is not None:
+            ats_score = calculate_ats_score(
+                resume.resume_text, job["description"], profile.terms, resume.ats_features
+            )
+
+        results.append({
+            "index": offset + row,
+            "id": job.get("id"),
+            "title": job.get("title") or "",
+            "company": job.get("company") or "",
+            "matchPercentage": match_pct,
+            "fitLevel": fit_level,
+            "fitColor": fit_color,
+            "matchedSkills": matched,
+            "matchedCount": len(matched),
+            "missingSkills": missing[:MISSING_SUMMARY_SIZE],
+            "missingCount": len(missing),
+            "jdSkillCount": len(profile.skill_ids),
+            "atsScore": ats_score["overallScore"] if ats_score else None,
+            "keywordMatch": ats_score["breakdown"]["keywordMatch"] if ats_score else None
+        })
+
+    return results
+
+
+def iter_job_fits(
+    user_skills: Dict[str, List[str]],
+    jobs: List[Dict],
+    resume_text: str = "",
+    semantic: bool = False,
+    batch_size: int = 8
+) -> Iterator[List[Dict]]:
+    """Score jobs batch by batch, yielding each batch's fit summaries as soon as it is done."""
+    resume = ResumeProfile(user_skills, resume_text, semantic)
+    for start in range(0, len(jobs), batch_size):
+        yield score_job_batch(resume, jobs[start:start + batch_size], start)
+
+
+def rank_key(result: Dict):
+    """Best fit first: match percentage, then ATS score, then request order."""
+    return (-result["matchPercentage"], -(result["atsScore"] or 0), result["index"])
+
+
+def rank_job_fits(
+    user_skills: Dict[str, List[str]],
+    jobs: List[Dict],
+    resume_text: str = "",
+    semantic: bool = False,
+    max_results: Optional[int] = None
+) -> List[Dict]:
+    """
+    Rank job descriptions by how well a resume fits them.
+
+    Args:
+        user_skills: User's categorized skills
+        jobs: Job dicts with "description" and optional "id", "title", "company"
+        resume_text: Optional raw resume text for ATS scoring
+        semantic: Give partial credit for near-equivalent skills
+        max_results: Number of top jobs to return (all by default)
+
+    Returns:
+        Fit summaries, best fit first, each with its "rank"
+    """
+    if max_results is not None and max_results < 1:
+        raise ValueError("maxResults must be at least 1")
+    results = [result for batch in iter_job_fits(user_skills, jobs, resume_text, semantic, batch_size=32)
+               for result in batch]
+    results.sort(key=rank_key)
+    if max_results is not None:
+        results = results[:max_results]
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    return results
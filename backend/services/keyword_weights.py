@@ -0,0 +1,178 @@
+"""
+Keyword Weighting Service
+BM25 keyword statistics over the job posting corpus, used to weight resume/JD keyword overlap
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional
+from spacy.lang.en.stop_words import STOP_WORDS
+from config import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Words, keeping tech spellings such as c++, c#, node.js and ci/cd together
+_TOKEN = re.compile(r'[a-z][a-z0-9+#]*(?:[./][a-z0-9+#]+)*')
+
+_stats: Optional["KeywordStats"] = None
+_stats_lock = threading.Lock()
+
+
+def tokenize(text: str) -> Counter:
+    """
+    Tokenize text into a sparse term-frequency vector.
+
+    Stop words and single letters are dropped.
+    """
+    return Counter(
+        token for token in _TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    )
+
+
+class KeywordStats:
+    """
+    Document frequencies for the job posting corpus.
+
+    IDF weights are computed once when the stats are loaded; terms that
+    never appear in the corpus get the highest weight.
+    """
+
+    def __init__(self, document_count: int, average_length: float, document_frequency: Dict[str, int]):
+        self.document_count = document_count
+        self.average_length = average_length or 1.0
+        self.document_frequency = document_frequency
+        self.idf: Dict[str, float] = {
+            term: self._idf(df) for term, df in document_frequency.items()
+        }
+        self.default_idf = self._idf(0)
+
+    def _idf(self, df: int) -> float:
+        if not self.document_count:
+            return 1.0
+        return math.log(1 + (self.document_count - df + 0.5) / (df + 0.5))
+
+    def weight(self, term: str) -> float:
+        """IDF weight of a term."""
+        return self.idf.get(term, self.default_idf)
+
+    def term_saturation(self, tf: int, document_length: int) -> float:
+        """BM25 term frequency saturation (1.0 for one mention in an average-length posting)."""
+        norm = K1 * (1 - B + B * document_length / self.average_length)
+        return tf * (K1 + 1) / (tf + norm)
+
+    def keyword_coverage(self, resume_terms: Counter, jd_terms: Counter) -> float:
+        """
+        Share of the job description's keyword weight covered by the resume.
+
+        Each JD term is weighted by its IDF times its BM25-saturated frequency
+        in the JD, so repeated requirements count more without dominating;
+        the resume earns a term's weight by mentioning it.
+
+        Returns:
+            Coverage between 0.0 and 1.0
+        """
+        if not jd_terms:
+            return 0.0
+
+        jd_length = sum(jd_terms.values())
+        total = 0.0
+        covered = 0.0
+
+        for term, tf in jd_terms.items():
+            weight = self.weight(term) * self.term_saturation(tf, jd_length)
+            total += weight
+            if term in resume_terms:
+                covered += weight
+
+        return covered / total if total else 0.0
+
+    def to_dict(self, min_df: int = 2) -> Dict:
+        """Compact serializable form; terms seen in fewer than min_df postings are dropped."""
+        terms = sorted(term for term, df in self.document_frequency.items() if df >= min_df)
+        return {
+            "documentCount": self.document_count,
+            "averageLength": round(self.average_length, 2),
+            "terms": " ".join(terms),
+            "documentFrequency": [self.document_frequency[term] for term in terms],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KeywordStats":
+        terms = data["terms"].split()
+        return cls(
+            data["documentCount"],
+            data["averageLength"],
+            dict(zip(terms, data["documentFrequency"]))
+        )
+
+
+def build_keyword_stats(texts: Iterable[str]) -> KeywordStats:
+    """
+    Count document frequencies over a stream of job descriptions.
+
+    Args:
+        texts: Job description texts
+
+    Returns:
+        Keyword statistics for the corpus
+    """
+    document_frequency: Counter = Counter()
+    document_count = 0
+    total_length = 0
+
+    for text in texts:
+        terms = tokenize(text)
+        document_frequency.update(terms.keys())
+        document_count += 1
+        total_length += sum(terms.values())
+
+    average_length = total_length / document_count if document_count else 1.0
+    return KeywordStats(document_count, average_length, dict(document_frequency))
+
+
+def save_keyword_stats(stats: KeywordStats, path: Optional[str] = None):
+    """Write keyword statistics to disk, replacing the previous file atomically."""
+    path = path or get_settings().keyword_stats_path
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(stats.to_dict(), f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_keyword_stats(path: Optional[str] = None) -> KeywordStats:
+    """
+    Load keyword statistics from disk and make them the active ones.
+
+    Without a stats file every non-stop-word keyword weighs the same.
+    """
+    global _stats
+
+    path = path or get_settings().keyword_stats_path
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            stats = KeywordStats.from_dict(json.load(f))
+        logger.info(f"Loaded keyword stats for {stats.document_count} postings ({len(stats.idf)} terms)")
+    else:
+        stats = KeywordStats(0, 1.0, {})
+        logger.info("No keyword stats file found, weighting keywords uniformly")
+
+    with _stats_lock:
+        _stats = stats
+    return stats
+
+
+def get_keyword_stats() -> KeywordStats:
+    """Get the active keyword statistics, loading them on first use."""
+    if _stats is None:
+        return load_keyword_stats()
+    return _stats
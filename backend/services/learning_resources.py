@@ -5,13 +5,22 @@ Provides curated learning resources for skill development
 
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from services.nlp_engine import normalize_skill
+from services.skill_taxonomy import get_taxonomy
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Load resources from JSON file
 _resources_cache: Optional[Dict] = None
+# Resources keyed by canonical skill id, rebuilt when the taxonomy version changes
+_resources_index: Optional[Tuple[str, Dict[str, Dict]]] = None
+# Parsed resource durations per resource entry id, rebuilt with the index
+_resource_hours: Optional[Tuple[str, Dict[str, List[Optional[float]]]]] = None
+
+# Hours assumed for a skill whose resources are self-paced or not curated, when ranking by gain per hour
+DEFAULT_SKILL_HOURS = 20.0
 
 def get_resources_path() -> str:
     """Get the path to the learning resources JSON file."""
@@ -39,31 +48,103 @@ def load_resources() -> Dict:
         return {}
 
 def normalize_skill_key(skill: str) -> str:
-    """Normalize skill name to match resource keys."""
-    return skill.lower().strip().replace('.js', '').replace('.', '')
+    """Normalize skill name to match resource keys (canonical skill id)."""
+    return normalize_skill(skill)
 
-def get_resources_for_skill(skill: str, max_resources: int = 3) -> List[Dict]:
+def get_resources_index() -> Dict[str, Dict]:
+    """Get learning resources keyed by canonical skill id for the active taxonomy."""
+    global _resources_index
+    
+    version = get_taxonomy().version
+    if _resources_index is not None and _resources_index[0] == version:
+        return _resources_index[1]
+    
+    index = {}
+    for key, value in load_resources().items():
+        index.setdefault(normalize_skill_key(key), value)
+    
+    _resources_index = (version, index)
+    return index
+
+def get_resource_id(skill: str) -> Optional[str]:
     """
-    Get learning resources for a specific skill.
+    Get the id (canonical skill id) of the resource entry covering a skill.
     
     Args:
-        skill: The skill name to get resources for
-        max_resources: Maximum number of resources to return
+        skill: The skill name to look up
         
     Returns:
-        List of resource dictionaries
+        Resource entry id, or None if no curated resources cover the skill
     """
-    resources = load_resources()
+    resources = get_resources_index()
     skill_key = normalize_skill_key(skill)
     
     # Try exact match first
     if skill_key in resources:
-        return resources[skill_key].get("resources", [])[:max_resources]
+        return skill_key
     
     # Try partial match
-    for key, value in resources.items():
+    for key in resources:
         if skill_key in key or key in skill_key:
-            return value.get("resources", [])[:max_resources]
+            return key
+    
+    return None
+
+def parse_duration_hours(duration: str) -> Optional[float]:
+    """Hours in a resource duration such as "4.5 hours", or None when it isn't given in hours."""
+    if "hour" not in duration.lower():
+        return None
+    try:
+        return float(duration.split()[0])
+    except (ValueError, IndexError):
+        return None
+
+def get_resource_hours() -> Dict[str, List[Optional[float]]]:
+    """Get the parsed duration of each resource, per resource entry id, for the active taxonomy."""
+    global _resource_hours
+    
+    version = get_taxonomy().version
+    if _resource_hours is not None and _resource_hours[0] == version:
+        return _resource_hours[1]
+    
+    hours = {
+        resource_id: [parse_duration_hours(resource.get("duration", "")) for resource in entry.get("resources", [])]
+        for resource_id, entry in get_resources_index().items()
+    }
+    _resource_hours = (version, hours)
+    return hours
+
+def estimate_learning_hours(skill: str, max_resources: int = 3) -> Optional[float]:
+    """
+    Estimate the hours needed to learn a skill from its first resources.
+    
+    Args:
+        skill: The skill name
+        max_resources: Resources counted (as many as the roadmap lists)
+        
+    Returns:
+        Total hours of the resources with a duration in hours, or None if none has one
+    """
+    resource_id = get_resource_id(skill)
+    if resource_id is None:
+        return None
+    hours = [h for h in get_resource_hours()[resource_id][:max_resources] if h is not None]
+    return sum(hours) if hours else None
+
+def get_resources_for_skill(skill: str, max_resources: int = 3) -> List[Dict]:
+    """
+    Get learning resources for a specific skill.
+    
+    Args:
+        skill: The skill name to get resources for
+        max_resources: Maximum number of resources to return
+        
+    Returns:
+        List of resource dictionaries
+    """
+    resource_id = get_resource_id(skill)
+    if resource_id is not None:
+        return get_resources_index()[resource_id].get("resources", [])[:max_resources]
     
     # Return generic learning suggestion
     return [
@@ -120,30 +201,22 @@ def get_priority_learning_path(
     for skill_item in sorted_skills:
         skill_name = skill_item.get("skill", "")
         resources = get_resources_for_skill(skill_name, max_resources_per_skill)
+        hours = estimate_learning_hours(skill_name, max_resources_per_skill)
         
         learning_path.append({
             "skill": skill_name,
             "priority": skill_item.get("priority", "Medium"),
             "frequency": skill_item.get("frequency", 0),
             "resources": resources,
-            "estimatedTime": _estimate_learning_time(resources)
+            "estimatedTime": _estimate_learning_time(hours),
+            "estimatedHours": hours
         })
     
     return learning_path
 
-def _estimate_learning_time(resources: List[Dict]) -> str:
-    """Estimate total learning time based on resources."""
-    total_hours = 0
-    for resource in resources:
-        duration = resource.get("duration", "")
-        if "hour" in duration.lower():
-            try:
-                hours = float(duration.split()[0])
-                total_hours += hours
-            except (ValueError, IndexError):
-                pass
-    
-    if total_hours == 0:
+def _estimate_learning_time(total_hours: Optional[float]) -> str:
+    """Describe the total learning time of a skill's resources."""
+    if not total_hours:
         return "Self-paced"
     elif total_hours < 5:
         return f"~{int(total_hours)} hours"
@@ -0,0 +1,203 @@
+"""
+Market Profile Service
+Precomputes skill demand for the jobs database's domains, or the built-in ones, used when no job postings are supplied
+"""
+
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from config import get_settings
+from services.nlp_engine import calculate_skill_frequency, skill_display_name
+from services.gap_analyzer import missing_priority, matched_demand
+from services.skill_taxonomy import get_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN = "Frontend Developer"
+
+# Cache for mock jobs data
+_mock_jobs_cache: Optional[Dict[str, List[Dict]]] = None
+_mock_jobs_repeat: int = 1
+
+# Compiled profiles: (taxonomy version, domain) -> MarketProfile
+_profiles: Dict[Tuple[str, str], "MarketProfile"] = {}
+_profiles_lock = threading.Lock()
+
+# Profiles of the jobs database: (taxonomy version, domain) -> (job stats they were built at, MarketProfile)
+_database_profiles: Dict[Tuple[str, Optional[str]], Tuple[Tuple[int, Optional[str], int], "MarketProfile"]] = {}
+_database_profiles_lock = threading.Lock()
+
+
+class MarketProfile:
+    """
+    Skill demand for one market, computed once and shared by every request.
+
+    Response entries are materialized up front, so a gap analysis against
+    the profile only walks the user's skills and the top of the ranking.
+    """
+
+    def __init__(self, domain: str, frequency: Dict[str, int], posting_count: int):
+        self.domain = domain
+        self.frequency = frequency
+        self.posting_count = posting_count
+        self.total_weight = sum(frequency.values())
+
+        # Skills ranked by demand (most in-demand first), ties broken by skill id
+        self.ranked: List[str] = sorted(frequency, key=lambda skill: (-frequency[skill], skill))
+        self.missing_candidates: List[Tuple[str, Dict]] = [
+            (skill, {
+                "skill": skill_display_name(skill),
+                "frequency": frequency[skill],
+                "priority": missing_priority(frequency[skill])
+            })
+            for skill in self.ranked
+        ]
+        self.matched_entries: Dict[str, Dict] = {
+            skill: {
+                "skill": skill_display_name(skill),
+                "frequency": count,
+                "demand": matched_demand(count)
+            }
+            for skill, count in frequency.items()
+        }
+
+    def matched_skills(self, user_skills: List[str]) -> List[Dict]:
+        """Matched skill entries for the user's normalized skills, most in-demand first."""
+        matched_ids = sorted(
+            {s for s in user_skills if s in self.matched_entries},
+            key=lambda skill: (-self.frequency[skill], skill)
+        )
+        return [dict(self.matched_entries[skill]) for skill in matched_ids]
+
+    def missing_skills(self, user_skills: Set[str], top_n: int = 10) -> List[Dict]:
+        """Top in-demand skill entries the user is missing."""
+        missing = []
+        for skill, entry in self.missing_candidates:
+            if skill in user_skills:
+                continue
+            missing.append(dict(entry))
+            if len(missing) >= top_n:
+                break
+        return missing
+
+
+def load_mock_jobs() -> Dict[str, List[Dict]]:
+    """Load the built-in mock job postings with caching."""
+    global _mock_jobs_cache, _mock_jobs_repeat
+
+    if _mock_jobs_cache is not None:
+        return _mock_jobs_cache
+
+    try:
+        with open(get_settings().mock_jobs_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        _mock_jobs_repeat = max(int(data.get("repeat", 1)), 1)
+        _mock_jobs_cache = data.get("domains", {})
+        logger.info(f"Loaded mock jobs for {len(_mock_jobs_cache)} domains")
+        return _mock_jobs_cache
+    except FileNotFoundError:
+        logger.warning("Mock jobs file not found")
+        return {}
+    except json.JSONDecodeError as e:
+        logger.error(f"Error parsing mock jobs JSON: {e}")
+        return {}
+
+
+def get_mock_jobs() -> Dict[str, List[Dict]]:
+    """Get the mock job postings per domain, expanded to their full market volume."""
+    domains = load_mock_jobs()
+    return {domain: postings * _mock_jobs_repeat for domain, postings in domains.items()}
+
+
+def build_market_profile(domain: str, postings: Iterable[Dict], repeat: int = 1) -> MarketProfile:
+    """Build a market profile from postings (a list or a stream), each counted repeat times."""
+    posting_count = 0
+
+    def counted():
+        nonlocal posting_count
+        for posting in postings:
+            posting_count += 1
+            yield posting
+
+    frequency = calculate_skill_frequency(counted())
+    if repeat > 1:
+        frequency = {skill: count * repeat for skill, count in frequency.items()}
+    return MarketProfile(domain, frequency, posting_count * repeat)
+
+
+def get_database_market_profile(domain: Optional[str]) -> Optional[MarketProfile]:
+    """
+    Get the market profile of a domain's postings in the jobs database.
+
+    Near-duplicate postings count once per cluster. Their skills are streamed
+    from a server-side cursor straight into the frequency count, and the
+    profile is reused until the domain's posting count, newest posting or
+    clustering changes (checked with one prepared statement).
+
+    Args:
+        domain: Domain, or None for all postings
+
+    Returns:
+        The profile, or None when no database is configured or it has no postings for the domain
+    """
+    from db.job_store import iter_extracted_skills, job_stats
+    from db.pool import get_pool
+
+    pool = get_pool()
+    if pool is None:
+        return None
+    stats = job_stats(pool, domain)
+    if stats[0] == 0:
+        return None
+
+    key = (get_taxonomy().version, domain or None)
+    cached = _database_profiles.get(key)
+    if cached is not None and cached[0] == stats:
+        return cached[1]
+
+    with _database_profiles_lock:
+        cached = _database_profiles.get(key)
+        if cached is not None and cached[0] == stats:
+            return cached[1]
+        postings = iter_extracted_skills(pool, domain, get_settings().database_stream_batch_size)
+        profile = build_market_profile(domain or "All", postings)
+        for stale in [k for k in _database_profiles if k[0] != key[0]]:
+            del _database_profiles[stale]
+        _database_profiles[key] = (stats, profile)
+    logger.info(f"Built market profile for '{domain or 'All'}' from {profile.posting_count} database postings")
+    return profile
+
+
+def get_market_profile(domain: Optional[str]) -> MarketProfile:
+    """
+    Get the precomputed market profile for a built-in domain.
+
+    Unknown domains fall back to the default domain. Profiles are rebuilt
+    when the skill taxonomy version changes.
+    """
+    domains = load_mock_jobs()
+    if domain not in domains:
+        domain = DEFAULT_DOMAIN
+
+    key = (get_taxonomy().version, domain)
+    profile = _profiles.get(key)
+    if profile is not None:
+        return profile
+
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is None:
+            profile = build_market_profile(domain, domains.get(domain, []), _mock_jobs_repeat)
+            # Drop profiles compiled against older taxonomy versions
+            for stale in [k for k in _profiles if k[0] != key[0]]:
+                del _profiles[stale]
+            _profiles[key] = profile
+    return profile
+
+
+def warm_market_profiles():
+    """Precompute the profiles of every built-in domain."""
+    for domain in load_mock_jobs():
+        get_market_profile(domain)
+    logger.info(f"Precomputed {len(_profiles)} market profiles")
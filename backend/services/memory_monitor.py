@@ -0,0 +1,296 @@
+"""
+Memory Monitoring Service
+RSS and SpaCy vocabulary gauges, tracemalloc snapshot diffs, and the model and worker recycling policy
+"""
+
+import gc
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from config import get_settings
+from services import nlp_engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Frames kept per traced allocation (grouping is by line, so one is enough and keeps tracing cheap)
+TRACE_FRAMES = 1
+MAX_SNAPSHOTS = 10
+
+# Allocations of the tracer and the import system, left out of snapshot diffs
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of the process, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS where /proc is unavailable (kilobytes on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def vocab_stats() -> Optional[Dict[str, int]]:
+    """Size of the loaded SpaCy model's StringStore and lexeme table, None before the model is loaded."""
+    model = nlp_engine.nlp
+    if model is None:
+        return None
+    return {"strings": len(model.vocab.strings), "lexemes": len(model.vocab)}
+
+
+class SnapshotStore:
+    """tracemalloc snapshots taken on demand, for allocation diffs between them."""
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def take(self, label: str = "") -> Dict:
+        """
+        Take a snapshot, starting allocation tracing first if needed.
+
+        Only allocations made after tracing starts are seen, so the first
+        snapshot is the baseline for later ones.
+
+        Args:
+            label: Free-form note (e.g. "after load test")
+
+        Returns:
+            The snapshot's metadata
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            logger.info("Started allocation tracing")
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        traced, peak = tracemalloc.get_traced_memory()
+
+        with self._lock:
+            entry = {
+                "id": self._next_id,
+                "label": label,
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                "tracedMb": round(traced / MB, 2),
+                "peakTracedMb": round(peak / MB, 2),
+                "rssMb": _mb(rss_bytes()),
+                "vocab": vocab_stats(),
+                "snapshot": snapshot,
+            }
+            self._snapshots[entry["id"]] = entry
+            self._next_id += 1
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return self.metadata(entry)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [self.metadata(entry) for entry in self._snapshots.values()]
+
+    def diff(self, snapshot_id: int, against: Optional[int] = None, limit: int = 25) -> Dict:
+        """
+        Allocation growth by source line between two snapshots.
+
+        Args:
+            snapshot_id: Later snapshot
+            against: Earlier snapshot (defaults to the one taken before snapshot_id)
+            limit: Number of lines returned, largest growth first
+
+        Returns:
+            Totals and the top allocation differences
+
+        Raises:
+            KeyError: When a snapshot doesn't exist (or was evicted)
+        """
+        with self._lock:
+            if snapshot_id not in self._snapshots:
+                raise KeyError(snapshot_id)
+            if against is None:
+                earlier = [i for i in self._snapshots if i < snapshot_id]
+                if not earlier:
+                    raise KeyError(f"No snapshot before {snapshot_id}")
+                against = earlier[-1]
+            if against not in self._snapshots:
+                raise KeyError(against)
+            newer, older = self._snapshots[snapshot_id], self._snapshots[against]
+
+        stats = newer["snapshot"].compare_to(older["snapshot"], "lineno")
+        return {
+            "from": self.metadata(older),
+            "to": self.metadata(newer),
+            "sizeDiffMb": round(sum(stat.size_diff for stat in stats) / MB, 3),
+            "top": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "sizeDiffKb": round(stat.size_diff / 1024, 1),
+                    "sizeKb": round(stat.size / 1024, 1),
+                    "countDiff": stat.count_diff,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+    def clear(self):
+        """Drop all snapshots and stop allocation tracing."""
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("Stopped allocation tracing")
+
+    @staticmethod
+    def metadata(entry: Dict) -> Dict:
+        return {key: value for key, value in entry.items() if key != "snapshot"}
+
+
+snapshot_store = SnapshotStore()
+
+# Recycling state: RSS once the model was first loaded, and when the current instance was
+_state_lock = threading.Lock()
+_process_baseline: Optional[int] = None
+_model_baseline: Optional[int] = None
+_model_loaded_at: Optional[float] = None
+_model_recycles = 0
+_worker_recycle_requested = False
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / MB, 1) if value is not None else None
+
+
+def recycle_model(reason: str = "manual") -> Dict:
+    """
+    Replace the SpaCy model with a fresh instance (see nlp_engine.recycle_nlp).
+
+    Requests in flight keep the instance they started with, so none are dropped.
+
+    Args:
+        reason: Why the model is recycled, for the log
+
+    Returns:
+        Memory statistics after the swap
+    """
+    global _model_baseline, _model_loaded_at, _model_recycles
+    before = rss_bytes()
+    nlp_engine.recycle_nlp()
+    gc.collect()
+    with _state_lock:
+        _model_baseline = rss_bytes()
+        _model_loaded_at = time.time()
+        _model_recycles += 1
+    logger.info(f"Recycled the SpaCy model ({reason}): RSS {_mb(before)} MB -> {_mb(_model_baseline)} MB")
+    return memory_stats()
+
+
+def check_memory_policy():
+    """
+    Apply the recycling policy: a fresh model after too many documents or too
+    much growth since it was loaded, and a graceful worker restart (SIGTERM, so
+    the server finishes in-flight requests and the process manager starts a
+    replacement) when the process as a whole has grown too much.
+    """
+    global _process_baseline, _model_baseline, _model_loaded_at, _worker_recycle_requested
+    settings = get_settings()
+    if nlp_engine.nlp is None:
+        return
+    rss = rss_bytes()
+    counts = nlp_engine.doc_counts()
+
+    with _state_lock:
+        if _process_baseline is None:
+            _process_baseline = rss
+        if _model_baseline is None:
+            _model_baseline, _model_loaded_at = rss, time.time()
+        model_growth = rss - _model_baseline if rss is not None and _model_baseline is not None else 0
+        process_growth = rss - _process_baseline if rss is not None and _process_baseline is not None else 0
+
+    if not _worker_recycle_requested and (
+        (settings.worker_recycle_docs > 0 and counts["total"] >= settings.worker_recycle_docs)
+        or (settings.worker_recycle_growth_mb > 0 and process_growth >= settings.worker_recycle_growth_mb * MB)
+    ):
+        _worker_recycle_requested = True
+        logger.warning(
+            f"Worker reached its recycling limit ({counts['total']} docs, {_mb(process_growth)} MB growth), "
+            "shutting down gracefully"
+        )
+        os.kill(os.getpid(), signal.SIGTERM)
+        return
+
+    if settings.model_recycle_docs > 0 and counts["model"] >= settings.model_recycle_docs:
+        recycle_model(f"{counts['model']} docs")
+    elif settings.model_recycle_growth_mb > 0 and model_growth >= settings.model_recycle_growth_mb * MB:
+        recycle_model(f"{_mb(model_growth)} MB growth")
+
+
+def memory_stats() -> Dict:
+    """Memory gauges and recycling state."""
+    settings = get_settings()
+    rss = rss_bytes()
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    with _state_lock:
+        return {
+            "rssMb": _mb(rss),
+            "rssGrowthMb": _mb(rss - _process_baseline) if rss is not None and _process_baseline is not None else None,
+            "modelRssGrowthMb": _mb(rss - _model_baseline) if rss is not None and _model_baseline is not None else None,
+            "vocab": vocab_stats(),
+            "docs": nlp_engine.doc_counts(),
+            "modelLoadedAt": datetime.fromtimestamp(_model_loaded_at, timezone.utc).isoformat() if _model_loaded_at else None,
+            "modelRecycles": _model_recycles,
+            "tracing": tracemalloc.is_tracing(),
+            "tracedMb": _mb(traced),
+            "policy": {
+                "modelRecycleDocs": settings.model_recycle_docs,
+                "modelRecycleGrowthMb": settings.model_recycle_growth_mb,
+                "workerRecycleDocs": settings.worker_recycle_docs,
+                "workerRecycleGrowthMb": settings.worker_recycle_growth_mb,
+            },
+        }
+
+
+class MemoryMonitor:
+    """Background thread that checks memory use against the recycling policy."""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval if interval is not None else get_settings().memory_check_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                check_memory_policy()
+            except Exception as e:
+                logger.error(f"Memory policy check failed: {e}")
@@ -0,0 +1,150 @@
+"""
+Near-Duplicate Detection Service
+MinHash signatures over posting text and skills, and an LSH index that clusters reposts of the same posting
+"""
+
+import hashlib
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Signature length and LSH banding: 16 bands of 8 rows make postings with a
+# Jaccard similarity of 0.8 candidates 95% of the time, and ones at 0.5 under 6%
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Estimated Jaccard similarity from which two postings count as the same one
+DEFAULT_THRESHOLD = 0.8
+# Words per text shingle
+SHINGLE_SIZE = 5
+
+_WORD = re.compile(r'\w+')
+_PRIME = (1 << 31) - 1
+
+
+def _permutation_params() -> np.ndarray:
+    """Coefficients of the NUM_PERM hash functions, derived from fixed seeds so stored signatures stay comparable."""
+    params = np.empty((2, NUM_PERM), dtype=np.uint64)
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=8).digest()
+        params[0, i] = int.from_bytes(digest[:4], "little") % (_PRIME - 1) + 1
+        params[1, i] = int.from_bytes(digest[4:], "little") % _PRIME
+    return params
+
+
+_A, _B = _permutation_params()
+
+
+def posting_shingles(text: str, skills: Iterable[str] = ()) -> List[str]:
+    """Overlapping word windows of the text (case and punctuation ignored) plus one token per skill."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    shingles.update(f"skill:{skill.strip().lower()}" for skill in skills if skill.strip())
+    return sorted(shingles)
+
+
+def minhash_signature(shingles: List[str]) -> Optional[np.ndarray]:
+    """
+    MinHash signature of a shingle set.
+
+    Args:
+        shingles: Shingles of one posting (posting_shingles)
+
+    Returns:
+        NUM_PERM uint32 minimums, or None for an empty set
+    """
+    if not shingles:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode()) % _PRIME for s in shingles), dtype=np.uint64, count=len(shingles))
+    # (a * x + b) mod p stays below 2**63 since a, b, x < 2**31
+    return ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def posting_signature(text: str, extracted_skills: Optional[Dict[str, List[str]]] = None) -> Optional[np.ndarray]:
+    """MinHash signature of a posting's description and extracted skills."""
+    skills = [skill for group in (extracted_skills or {}).values() for skill in group]
+    return minhash_signature(posting_shingles(text, skills))
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over cluster representatives.
+
+    Each cluster is represented by its first posting. A new posting is
+    compared only with representatives of the same domain sharing at least
+    one band of its signature, and joins the most similar one at or above
+    the threshold; otherwise it starts a cluster of its own. Clusters never
+    span domains, since each domain's market profile counts its own
+    representatives.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.buckets: List[Dict[Tuple[Optional[str], bytes], List[str]]] = [{} for _ in range(BANDS)]
+        self.representatives: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _bands(signature: np.ndarray, domain: Optional[str]) -> List[Tuple[Optional[str], bytes]]:
+        return [(domain, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def add_representative(self, cluster_id: str, signature: np.ndarray, domain: Optional[str] = None):
+        """Register a cluster's representative (when loading stored clusters)."""
+        if cluster_id in self.representatives:
+            return
+        self.representatives[cluster_id] = signature
+        for bucket, key in zip(self.buckets, self._bands(signature, domain)):
+            bucket.setdefault(key, []).append(cluster_id)
+
+    def find(self, signature: np.ndarray, domain: Optional[str] = None) -> Optional[str]:
+        """The domain's cluster a signature belongs to, or None when it matches none."""
+        candidates = {
+            cluster_id
+            for bucket, key in zip(self.buckets, self._bands(signature, domain))
+            for cluster_id in bucket.get(key, ())
+        }
+        best, best_similarity = None, 0.0
+        for cluster_id in sorted(candidates):
+            similarity = estimated_similarity(signature, self.representatives[cluster_id])
+            if similarity >= self.threshold and similarity > best_similarity:
+                best, best_similarity = cluster_id, similarity
+        return best
+
+    def assign(self, posting_id: str, signature: Optional[np.ndarray], domain: Optional[str] = None) -> str:
+        """
+        Assign a posting to a cluster.
+
+        Args:
+            posting_id: Id of the posting
+            signature: Its MinHash signature (None for postings without text)
+            domain: Its domain; only clusters of the same domain are matched
+
+        Returns:
+            The cluster id: a matching cluster's, or posting_id when it starts a new one
+        """
+        if signature is None:
+            return posting_id
+        cluster_id = self.find(signature, domain)
+        if cluster_id is not None:
+            return cluster_id
+        self.add_representative(posting_id, signature, domain)
+        return posting_id
+
+    def __len__(self) -> int:
+        return len(self.representatives)
+
+
+def signature_from_bytes(value) -> np.ndarray:
+    """Signature stored by the job store (bytes, or a memoryview from psycopg2)."""
+    return np.frombuffer(bytes(value), dtype=np.uint32)
@@ -0,0 +1,189 @@
+"""
+NLP Micro-Batching Service
+Collects single documents from concurrent requests and runs them through the SpaCy pipeline together
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Longest a caller waits for its document before giving up (a stuck model must not hang requests)
+PARSE_TIMEOUT = 30.0
+
+
+class MicroBatcher:
+    """
+    Dispatcher thread in front of a SpaCy model.
+
+    Callers block on `parse` while the dispatcher groups queued texts into one
+    `nlp.pipe` call. Documents that arrive while a batch is running are picked
+    up by the next one without waiting. On top of that, the dispatcher may wait
+    a short window for more documents: the window doubles (up to max_wait)
+    after batches that found company and halves back to zero after batches of
+    one, so an idle server answers a lone request immediately while a busy one
+    fills its batches.
+    """
+
+    def __init__(
+        self,
+        load_model: Callable,
+        max_batch_size: int = 16,
+        max_wait: float = 0.005,
+        timeout: float = PARSE_TIMEOUT
+    ):
+        self.load_model = load_model
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.min_wait = max_wait / 8
+        self.window = 0.0
+        self._queue: "queue.SimpleQueue[Tuple[str, Future]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.documents = 0
+        self.largest_batch = 0
+
+    def parse(self, text: str):
+        """
+        Process one text with the model, batched with whatever else is queued.
+
+        Args:
+            text: Input text
+
+        Returns:
+            The SpaCy doc for the text
+
+        Raises:
+            concurrent.futures.TimeoutError: When the document isn't processed within the timeout
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result(timeout=self.timeout)
+
+    def parse_many(self, texts: Iterable[str], window: int = 32) -> Iterator:
+        """
+        Process several texts with the model, in order.
+
+        Texts are queued `window` at a time (joining batches with other
+        callers' documents), so at most that many docs are held at once.
+
+        Args:
+            texts: Input texts
+            window: Texts queued before waiting for their docs
+
+        Yields:
+            The SpaCy doc of each text
+        """
+        self._ensure_started()
+        texts = iter(texts)
+        while True:
+            futures = []
+            for text in islice(texts, max(window, 1)):
+                future: Future = Future()
+                self._queue.put((text, future))
+                futures.append(future)
+            if not futures:
+                return
+            for future in futures:
+                yield future.result(timeout=self.timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="nlp-batcher", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Stop the dispatcher thread; queued documents are still processed by the next parse call."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            try:
+                self._fill(batch)
+                self._process(batch)
+                self._adapt(len(batch))
+            except Exception as e:
+                # Keep dispatching: a dead thread would leave every later caller waiting
+                logger.error(f"NLP batch dispatch failed: {e}", exc_info=True)
+                self._fail(batch, e)
+
+    def _fill(self, batch: List[Tuple[str, Future]]):
+        """Add queued documents to the batch, waiting up to the current window for more."""
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, Future]], error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _process(self, batch: List[Tuple[str, Future]]):
+        try:
+            nlp_model = self.load_model()
+        except Exception as e:
+            logger.error(f"Could not load the SpaCy model for a batch of {len(batch)} documents: {e}")
+            self._fail(batch, e)
+            return
+
+        texts = [text for text, _ in batch]
+        try:
+            docs = list(nlp_model.pipe(texts, batch_size=len(texts)))
+        except Exception as e:
+            # One bad document must not fail the rest of the batch: retry them one at a time
+            logger.warning(f"Batch of {len(batch)} documents failed, processing individually: {e}")
+            for text, future in batch:
+                try:
+                    future.set_result(nlp_model(text))
+                except Exception as doc_error:
+                    future.set_exception(doc_error)
+        else:
+            for (_, future), doc in zip(batch, docs):
+                future.set_result(doc)
+
+        self.batches += 1
+        self.documents += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def _adapt(self, batch_size: int):
+        if batch_size > 1:
+            self.window = min(self.max_wait, max(self.min_wait, self.window * 2))
+        else:
+            self.window = self.window / 2 if self.window / 2 >= self.min_wait else 0.0
+
+    def stats(self) -> Dict:
+        """Batching counters for metrics."""
+        return {
+            "batches": self.batches,
+            "documents": self.documents,
+            "averageBatchSize": round(self.documents / self.batches, 2) if self.batches else 0.0,
+            "largestBatch": self.largest_batch,
+            "windowMs": round(self.window * 1000, 3),
+            "queued": self._queue.qsize(),
+        }
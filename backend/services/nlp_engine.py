@@ -1,134 +1,218 @@
 import spacy
-from typing import List, Dict, Set
-import re
+import threading
+from itertools import groupby
+from typing import List, Dict, Set, Optional, Iterable, Iterator
+from config import get_settings
+from services.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from services.nlp_batcher import MicroBatcher
+from services.text_segments import split_chunks
 
 # Load SpaCy model (singleton)
 nlp = None
 
+MODEL_NAME = "en_core_web_md"
+
+# Micro-batcher shared by single-document requests
+_batcher: Optional[MicroBatcher] = None
+_batcher_lock = threading.Lock()
+# A SpaCy pipeline isn't safe to run from several threads at once: with batching enabled
+# only the batcher's dispatcher thread runs it, otherwise callers take turns on this lock
+_model_lock = threading.Lock()
+
+# Documents run through the model: since the current instance was loaded, and since the process started
+_docs_lock = threading.Lock()
+_model_docs = 0
+_total_docs = 0
+
+def _load_model():
+    model = spacy.load(MODEL_NAME)
+    # Texts reach the model in chunks of at most nlp_chunk_chars, so anything longer is a bug, not an input
+    model.max_length = get_settings().nlp_chunk_chars
+    return model
+
 def get_nlp():
     """Get or load the SpaCy NLP model."""
     global nlp
     if nlp is None:
-        nlp = spacy.load("en_core_web_md")
+        nlp = _load_model()
     return nlp
 
-# Technical skill taxonomy
-SKILL_PATTERNS = {
-    "languages": [
-        "python", "javascript", "typescript", "java", "c++", "c#", "php", "ruby",
-        "go", "rust", "swift", "kotlin", "scala", "r", "sql", "html", "html5",
-        "css", "css3", "bash", "shell", "perl", "dart", "elixir", "clojure"
-    ],
-    "frameworks": [
-        "react", "react.js", "reactjs", "vue", "vue.js", "vuejs", "angular",
-        "next.js", "nextjs", "nuxt", "svelte", "django", "flask", "fastapi",
-        "express", "express.js", "expressjs", "nestjs", "spring", "spring boot",
-        "laravel", "rails", "ruby on rails", "asp.net", ".net", "tensorflow",
-        "pytorch", "keras", "scikit-learn", "pandas", "numpy", "react native",
-        "flutter", "ionic", "xamarin", "tailwind", "tailwind css", "bootstrap",
-        "material-ui", "mui", "chakra ui", "redux", "mobx", "zustand", "graphql",
-        "apollo", "prisma", "typeorm", "sequelize", "mongoose", "hibernate"
-    ],
-    "databases": [
-        "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch",
-        "cassandra", "dynamodb", "sqlite", "oracle", "sql server", "mariadb",
-        "neo4j", "couchdb", "firebase", "supabase"
-    ],
-    "tools": [
-        "git", "github", "gitlab", "bitbucket", "docker", "kubernetes", "k8s",
-        "jenkins", "travis ci", "circle ci", "github actions", "aws", "azure",
-        "gcp", "google cloud", "heroku", "vercel", "netlify", "terraform",
-        "ansible", "puppet", "chef", "vagrant", "nginx", "apache", "webpack",
-        "vite", "rollup", "babel", "eslint", "prettier", "jest", "mocha",
-        "chai", "cypress", "selenium", "postman", "insomnia", "figma",
-        "adobe xd", "sketch", "photoshop", "illustrator", "jira", "confluence",
-        "slack", "trello", "asana", "notion", "vs code", "intellij", "pycharm",
-        "jupyter", "tableau", "power bi", "grafana", "prometheus", "elk",
-        "kafka", "rabbitmq", "celery", "airflow", "spark", "hadoop", "mlflow"
-    ],
-    "concepts": [
-        "restful api", "rest api", "api", "microservices", "serverless",
-        "ci/cd", "devops", "agile", "scrum", "tdd", "bdd", "oop", "functional programming",
-        "machine learning", "deep learning", "nlp", "computer vision", "data science",
-        "data analysis", "data visualization", "etl", "big data", "cloud computing",
-        "responsive design", "mobile development", "web development", "full stack",
-        "frontend", "backend", "ui/ux", "accessibility", "seo", "performance optimization",
-        "security", "authentication", "authorization", "jwt", "oauth", "solid principles",
-        "design patterns", "algorithms", "data structures", "testing", "debugging"
-    ]
-}
+def recycle_nlp():
+    """
+    Load a fresh SpaCy model and swap it in.
+    
+    Every text the model processes adds its tokens to the shared vocabulary and
+    StringStore, which never shrink. Swapping in a fresh instance lets the old
+    one be freed once the calls still holding it finish.
+    """
+    global nlp, _model_docs
+    fresh = _load_model()
+    with _docs_lock:
+        nlp, _model_docs = fresh, 0
+    return fresh
+
+def count_docs(count: int = 1):
+    """Record documents processed by the model, for the memory recycling policy."""
+    global _model_docs, _total_docs
+    with _docs_lock:
+        _model_docs += count
+        _total_docs += count
+
+def doc_counts() -> Dict[str, int]:
+    """Documents processed by the current model instance and by the process."""
+    with _docs_lock:
+        return {"model": _model_docs, "total": _total_docs}
+
+def get_nlp_batcher() -> Optional[MicroBatcher]:
+    """Get the micro-batcher in front of the SpaCy model, or None when batching is disabled."""
+    global _batcher
+    if _batcher is None:
+        settings = get_settings()
+        if settings.nlp_batch_max_size <= 1:
+            return None
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(get_nlp, settings.nlp_batch_max_size, settings.nlp_batch_max_wait_ms / 1000)
+    return _batcher
+
+def parse_text(text: str):
+    """Run one text through the SpaCy pipeline, batched with concurrent requests when batching is enabled."""
+    count_docs()
+    batcher = get_nlp_batcher()
+    if batcher is None:
+        with _model_lock:
+            return get_nlp()(text)
+    return batcher.parse(text)
 
 def normalize_skill(skill: str) -> str:
-    """Normalize skill names for consistent matching."""
-    skill = skill.lower().strip()
-    
-    # Normalize common variations
-    normalizations = {
-        "react.js": "react",
-        "reactjs": "react",
-        "vue.js": "vue",
-        "vuejs": "vue",
-        "next.js": "nextjs",
-        "express.js": "express",
-        "node.js": "nodejs",
-        "postgresql": "postgres",
-        "mongodb": "mongo",
-        "kubernetes": "k8s",
-        "javascript": "js",
-        "typescript": "ts",
-    }
+    """Normalize skill names to their canonical id for consistent matching."""
+    return get_taxonomy().normalize(skill)
+
+def skill_display_name(skill: str) -> str:
+    """Get the canonical display name for a skill."""
+    return get_taxonomy().display_name(skill)
+
+def text_chunks(text: str) -> List[str]:
+    """
+    Split text into paragraph/sentence-aligned chunks the SpaCy pipeline processes one at a time.
     
-    return normalizations.get(skill, skill)
+    Parser time and memory grow with document length, so long texts are run
+    through the model in chunks of at most nlp_chunk_chars; shorter ones are
+    passed through unchanged.
+    """
+    max_chars = get_settings().nlp_chunk_chars
+    if len(text) <= max_chars:
+        return [text]
+    return split_chunks(text, max_chars)
 
-def extract_skills_from_text(text: str) -> Dict[str, List[str]]:
+def extract_skills_from_text(text: str, taxonomy: Optional[SkillTaxonomy] = None) -> Dict[str, List[str]]:
     """
     Extract technical skills from text using SpaCy NLP and pattern matching.
     
+    Long texts are processed in chunks (see text_chunks).
+    
     Args:
         text: Input text (CV, job description, etc.)
+        taxonomy: Taxonomy snapshot to match against (defaults to the active one)
         
     Returns:
         Dictionary with categorized skills
     """
+    taxonomy = taxonomy or get_taxonomy()
+    
     if not text:
-        return {"languages": [], "frameworks": [], "databases": [], "tools": [], "concepts": []}
+        return taxonomy.empty_result()
+    
+    if len(text) > get_settings().nlp_chunk_chars:
+        return extract_skills_batch([text], taxonomy)[0]
+    
+    doc = parse_text(text)
+    
+    return extract_skills_from_doc(text, doc, taxonomy)
+
+def pipe_texts(texts: Iterable[str], batch_size: int = 32) -> Iterator:
+    """
+    Run texts through the SpaCy pipeline and yield their docs in order.
+    
+    With batching enabled the texts go through the batcher's dispatcher thread
+    (batch_size at a time, so only that many docs are held at once); otherwise
+    the model is piped directly while holding it.
+    """
+    batcher = get_nlp_batcher()
+    if batcher is not None:
+        yield from batcher.parse_many(texts, batch_size)
+        return
+    with _model_lock:
+        yield from get_nlp().pipe(texts, batch_size=batch_size)
+
+def extract_skills_batch(
+    texts: List[str],
+    taxonomy: Optional[SkillTaxonomy] = None,
+    batch_size: int = 32
+) -> List[Dict[str, List[str]]]:
+    """
+    Extract skills from several texts, running them through the SpaCy pipeline together.
     
+    Long texts are piped chunk by chunk, and each chunk's doc is released
+    once its skills are collected, so memory stays flat whatever the length.
+    
+    Args:
+        texts: Input texts
+        taxonomy: Taxonomy snapshot to match against (defaults to the active one)
+        batch_size: Number of texts (or chunks) per nlp.pipe batch
+        
+    Returns:
+        Categorized skills for each text, in input order
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    results = [taxonomy.empty_result() for _ in texts]
+    
+    non_empty = [i for i, text in enumerate(texts) if text]
+    if not non_empty:
+        return results
+    
+    chunks = [(i, chunk) for i in non_empty for chunk in text_chunks(texts[i])]
+    count_docs(len(chunks))
+    docs = pipe_texts((chunk for _, chunk in chunks), batch_size)
+    # Chunks of one text are consecutive, so its docs are grouped as they stream out
+    owned_docs = zip((i for i, _ in chunks), docs)
+    for i, group in groupby(owned_docs, key=lambda owned: owned[0]):
+        results[i] = extract_skills_from_docs(texts[i], (doc for _, doc in group), taxonomy)
+    
+    return results
+
+def extract_skills_from_doc(text: str, doc, taxonomy: SkillTaxonomy) -> Dict[str, List[str]]:
+    """Extract categorized skills from text and its already-processed SpaCy doc."""
+    return extract_skills_from_docs(text, [doc], taxonomy)
+
+def extract_skills_from_docs(text: str, docs: Iterable, taxonomy: SkillTaxonomy) -> Dict[str, List[str]]:
+    """Extract categorized skills from text and the SpaCy docs of its chunks (consumed one at a time)."""
     text_lower = text.lower()
-    nlp_model = get_nlp()
-    doc = nlp_model(text)
     
     # Extract skills by category
     found_skills: Dict[str, Set[str]] = {
-        "languages": set(),
-        "frameworks": set(),
-        "databases": set(),
-        "tools": set(),
-        "concepts": set()
+        category: set() for category in taxonomy.categories
     }
     
-    # Pattern-based extraction
-    for category, patterns in SKILL_PATTERNS.items():
-        for pattern in patterns:
-            # Use word boundaries for accurate matching
-            regex = r'\b' + re.escape(pattern) + r'\b'
-            if re.search(regex, text_lower):
-                found_skills[category].add(pattern.title())
-    
-    # Entity-based extraction (for proper nouns and organizations)
-    for ent in doc.ents:
-        if ent.label_ in ["ORG", "PRODUCT", "GPE"]:
-            ent_lower = ent.text.lower()
-            # Check if entity matches any known skill
-            for category, patterns in SKILL_PATTERNS.items():
-                if ent_lower in patterns:
-                    found_skills[category].add(ent.text.title())
-    
-    # Noun chunk extraction for multi-word skills
-    for chunk in doc.noun_chunks:
-        chunk_lower = chunk.text.lower()
-        for category, patterns in SKILL_PATTERNS.items():
-            if chunk_lower in patterns:
-                found_skills[category].add(chunk.text.title())
+    # Pattern-based extraction with precompiled word-boundary matchers
+    for category, display_name, regex in taxonomy.matchers:
+        if regex.search(text_lower):
+            found_skills[category].add(display_name)
+    
+    for doc in docs:
+        # Entity-based extraction (for proper nouns and organizations)
+        for ent in doc.ents:
+            if ent.label_ in ["ORG", "PRODUCT", "GPE"]:
+                ent_lower = ent.text.lower()
+                # Check if entity matches any known skill
+                for category in taxonomy.pattern_categories.get(ent_lower, ()):
+                    found_skills[category].add(taxonomy.display_name(ent_lower))
+        
+        # Noun chunk extraction for multi-word skills
+        for chunk in doc.noun_chunks:
+            chunk_lower = chunk.text.lower()
+            for category in taxonomy.pattern_categories.get(chunk_lower, ()):
+                found_skills[category].add(taxonomy.display_name(chunk_lower))
     
     # Convert sets to sorted lists
     result = {
@@ -138,6 +222,18 @@ def extract_skills_from_text(text: str) -> Dict[str, List[str]]:
     
     return result
 
+def merge_skill_results(results: Iterable[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """Merge categorized skills extracted from several parts of one document."""
+    merged: Dict[str, Set[str]] = {}
+    for result in results:
+        for category, skills in result.items():
+            merged.setdefault(category, set()).update(skills)
+    
+    return {
+        category: sorted(skills)
+        for category, skills in merged.items()
+    }
+
 def get_all_skills_flat(skills_dict: Dict[str, List[str]]) -> List[str]:
     """Flatten categorized skills into a single list."""
     all_skills = []
@@ -145,12 +241,12 @@ def get_all_skills_flat(skills_dict: Dict[str, List[str]]) -> List[str]:
         all_skills.extend(category_skills)
     return all_skills
 
-def calculate_skill_frequency(job_descriptions: List[Dict]) -> Dict[str, int]:
+def calculate_skill_frequency(job_descriptions: Iterable[Dict]) -> Dict[str, int]:
     """
     Calculate frequency of skills across multiple job descriptions.
     
     Args:
-        job_descriptions: List of job dicts with 'extractedSkills' or 'skills' field
+        job_descriptions: Job dicts with 'extractedSkills' or 'skills' field (a list or a stream)
         
     Returns:
         Dictionary mapping skill names to their frequency count
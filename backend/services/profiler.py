@@ -0,0 +1,193 @@
+"""
+Request Profiling Service
+Sampling profiler producing flamegraph folded stacks, and a store of captured request profiles
+"""
+
+import os
+import sys
+import sysconfig
+import threading
+import uuid
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import numpy as np
+from config import BASE_DIR
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Profiles recorded at the same time (each runs a sampler thread)
+MAX_CONCURRENT_PROFILES = 2
+# Request durations kept for the slow request threshold, and how many are needed before using it
+DURATION_WINDOW = 1000
+MIN_DURATIONS = 50
+
+# Innermost frames of threads that are parked rather than working (idle pools, the event loop's poll)
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+
+_active = threading.BoundedSemaphore(MAX_CONCURRENT_PROFILES)
+
+
+def _frame_label(code) -> str:
+    """Function name with a short source location, e.g. "extract_skills_from_doc (services/nlp_engine.py:95)"."""
+    filename = code.co_filename
+    marker = f"site-packages{os.sep}"
+    if marker in filename:
+        filename = filename.split(marker, 1)[1]
+    elif filename.startswith(BASE_DIR):
+        filename = os.path.relpath(filename, BASE_DIR)
+    elif filename.startswith(STDLIB_DIR):
+        filename = os.path.relpath(filename, STDLIB_DIR)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of every thread running application code.
+
+    Async routes run on the event loop thread while their heavy work may run in
+    threadpool or batcher threads, so all threads are sampled; parked threads
+    and stacks that never enter this repository's code are skipped. Concurrent
+    requests share those threads, so a profile is cleanest when taken under
+    light load.
+    """
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the folded stack counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.stacks
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                labels = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    in_app = in_app or (code.co_filename.startswith(BASE_DIR) and "site-packages" not in code.co_filename)
+                    labels.append(_frame_label(code))
+                    frame = frame.f_back
+                if in_app:
+                    labels.append(names.get(thread_id, str(thread_id)))
+                    self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+
+def start_profiler(interval: float) -> Optional[SamplingProfiler]:
+    """Start a profiler unless too many are already running."""
+    if not _active.acquire(blocking=False):
+        return None
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    return profiler
+
+
+def stop_profiler(profiler: SamplingProfiler) -> Counter:
+    """Stop a profiler started with start_profiler."""
+    try:
+        return profiler.stop()
+    finally:
+        _active.release()
+
+
+def folded_stacks(stacks: Counter) -> str:
+    """Render stack counts in the folded format read by flamegraph.pl, speedscope and inferno."""
+    return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+
+class ProfileStore:
+    """The most recent captured profiles, kept in memory."""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex[:16]
+
+    def add(self, profile_id: str, stacks: Counter, samples: int, **info) -> Dict:
+        """
+        Store a profile.
+
+        Args:
+            profile_id: Id from new_id (already handed to the client)
+            stacks: Folded stack counts
+            samples: Number of sampling ticks
+            **info: Request details (method, path, durationMs, trigger)
+
+        Returns:
+            The stored profile's metadata
+        """
+        profile = {
+            "id": profile_id,
+            **info,
+            "samples": samples,
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "folded": folded_stacks(stacks),
+        }
+        with self._lock:
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return self.metadata(profile)
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict]:
+        """Metadata of the stored profiles, newest first."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [self.metadata(profile) for profile in reversed(profiles)]
+
+    @staticmethod
+    def metadata(profile: Dict) -> Dict:
+        return {key: value for key, value in profile.items() if key != "folded"}
+
+
+class SlowRequestTracker:
+    """Rolling request durations, to tell whether a request is among the slowest N%."""
+
+    def __init__(self, slow_percent: float = 5.0, window: int = DURATION_WINDOW):
+        self.slow_percent = slow_percent
+        self._durations: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, duration: float) -> bool:
+        """Record a request duration. Returns whether it is in the slowest N% of the window."""
+        with self._lock:
+            self._durations.append(duration)
+            if len(self._durations) < MIN_DURATIONS:
+                return False
+            threshold = np.percentile(np.fromiter(self._durations, dtype=float), 100 - self.slow_percent)
+        return duration >= threshold
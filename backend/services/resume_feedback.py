@@ -4,7 +4,7 @@ Provides AI-driven feedback on resume quality, structure, and content
 """
 
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 from services.nlp_engine import extract_skills_from_text
 import logging
 
@@ -87,11 +87,22 @@ METRICS_PATTERNS = [
 ]
 
 
+ALL_ACTION_VERBS = {verb for verbs in ACTION_VERBS.values() for verb in verbs}
+
+
+def find_action_verbs(text: str) -> Set[str]:
+    """Find the known action verbs used in a piece of text."""
+    words = set(re.findall(r'\b[a-z]+\b', text.lower()))
+    return words & ALL_ACTION_VERBS
+
+
 def analyze_action_verbs(text: str) -> Dict:
     """Analyze usage of action verbs in resume."""
-    text_lower = text.lower()
-    words = set(re.findall(r'\b[a-z]+\b', text_lower))
-    
+    return score_action_verbs(find_action_verbs(text))
+
+
+def score_action_verbs(words: Set[str]) -> Dict:
+    """Score action verb usage from the set of verbs found in the resume."""
     found_verbs = {}
     total_found = 0
     
@@ -137,17 +148,33 @@ def generate_verb_feedback(score: int, weak_categories: List[str]) -> List[str]:
     return feedback
 
 
-def detect_soft_skills(text: str) -> Dict:
-    """Detect soft skills mentioned in resume."""
+def find_soft_skill_matches(text: str) -> Dict[str, List[str]]:
+    """Find soft skill evidence in a piece of text, keyed by soft skill."""
     text_lower = text.lower()
-    detected = {}
-    total_evidence = 0
+    found_matches = {}
     
     for skill, patterns in SOFT_SKILLS_PATTERNS.items():
         matches = []
         for pattern in patterns:
             found = re.findall(pattern, text_lower, re.IGNORECASE)
             matches.extend(found)
+        found_matches[skill] = matches
+    
+    return found_matches
+
+
+def detect_soft_skills(text: str) -> Dict:
+    """Detect soft skills mentioned in resume."""
+    return score_soft_skills(find_soft_skill_matches(text))
+
+
+def score_soft_skills(found_matches: Dict[str, List[str]]) -> Dict:
+    """Score soft skills from the evidence found for each of them."""
+    detected = {}
+    total_evidence = 0
+    
+    for skill in SOFT_SKILLS_PATTERNS:
+        matches = found_matches.get(skill, [])
         
         if matches:
             detected[skill] = {
@@ -203,20 +230,34 @@ def generate_soft_skills_feedback(detected: Dict) -> List[str]:
     return feedback
 
 
-def analyze_quantified_achievements(text: str) -> Dict:
-    """Analyze presence of quantified achievements."""
-    found_metrics = []
+def find_metrics(text: str) -> List[List[Dict]]:
+    """Find quantified achievements in a piece of text, one list per metrics pattern."""
+    metrics_by_pattern = []
     
     for pattern, metric_type in METRICS_PATTERNS:
+        found = []
         matches = re.findall(pattern, text, re.IGNORECASE)
         for match in matches:
             if isinstance(match, tuple):
                 match = match[0]
-            found_metrics.append({
+            found.append({
                 "type": metric_type,
                 "value": match
             })
+        metrics_by_pattern.append(found)
     
+    return metrics_by_pattern
+
+
+def analyze_quantified_achievements(text: str) -> Dict:
+    """Analyze presence of quantified achievements."""
+    return score_quantified_achievements(
+        [metric for found in find_metrics(text) for metric in found]
+    )
+
+
+def score_quantified_achievements(found_metrics: List[Dict]) -> Dict:
+    """Score quantified achievements from the metrics found in the resume."""
     # Calculate score (max 5 metrics for full score)
     score = min(100, (len(found_metrics) / 5) * 100)
     
@@ -244,16 +285,31 @@ def generate_metrics_feedback(score: int, count: int) -> List[str]:
     return feedback
 
 
-def analyze_bullet_points(text: str) -> Dict:
-    """Analyze quality of bullet points in resume."""
+def find_bullet_candidates(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Find bullet point candidates in a piece of text.
+    
+    Returns:
+        Tuple of (bullet lines, sentences usable as bullets when there are none)
+    """
     # Find lines that look like bullet points
     bullets = re.findall(r'[•\-\*]\s*(.+)', text)
     
-    if not bullets:
-        # Try to detect sentences that could be bullet points
-        sentences = re.findall(r'[A-Z][^.!?]*[.!?]', text)
-        bullets = [s for s in sentences if len(s.split()) >= 5][:15]
+    # Sentences that could be bullet points
+    sentences = re.findall(r'[A-Z][^.!?]*[.!?]', text)
+    sentences = [s for s in sentences if len(s.split()) >= 5]
     
+    return bullets, sentences
+
+
+def analyze_bullet_points(text: str) -> Dict:
+    """Analyze quality of bullet points in resume."""
+    bullets, sentences = find_bullet_candidates(text)
+    return score_bullet_points(bullets or sentences[:15])
+
+
+def score_bullet_points(bullets: List[str]) -> Dict:
+    """Score the quality of the resume's bullet points."""
     analysis = {
         "totalBullets": len(bullets),
         "quality": [],
@@ -333,6 +389,46 @@ def generate_bullet_feedback(score: int, quality: List[Dict]) -> List[str]:
     return feedback
 
 
+def collect_feedback_evidence(text: str) -> Dict:
+    """
+    Collect the raw evidence the quality analysis is scored from.
+    
+    Evidence from separate parts of a resume can be merged with
+    merge_feedback_evidence, so unchanged parts never need re-scanning.
+    """
+    bullets, sentences = find_bullet_candidates(text)
+    
+    return {
+        "actionVerbs": find_action_verbs(text),
+        "softSkills": find_soft_skill_matches(text),
+        "metrics": find_metrics(text),
+        "bullets": bullets,
+        "sentences": sentences
+    }
+
+
+def merge_feedback_evidence(evidence_list: List[Dict]) -> Dict:
+    """Merge evidence collected from consecutive parts of a resume."""
+    merged = {
+        "actionVerbs": set(),
+        "softSkills": {skill: [] for skill in SOFT_SKILLS_PATTERNS},
+        "metrics": [[] for _ in METRICS_PATTERNS],
+        "bullets": [],
+        "sentences": []
+    }
+    
+    for evidence in evidence_list:
+        merged["actionVerbs"] |= evidence["actionVerbs"]
+        for skill, matches in evidence["softSkills"].items():
+            merged["softSkills"][skill].extend(matches)
+        for found, metrics in zip(merged["metrics"], evidence["metrics"]):
+            found.extend(metrics)
+        merged["bullets"].extend(evidence["bullets"])
+        merged["sentences"].extend(evidence["sentences"])
+    
+    return merged
+
+
 def analyze_resume_quality(resume_text: str) -> Dict:
     """
     Comprehensive resume quality analysis.
@@ -344,12 +440,18 @@ def analyze_resume_quality(resume_text: str) -> Dict:
     - Bullet point quality
     """
     logger.info("Analyzing resume quality...")
-    
+    return build_resume_feedback(collect_feedback_evidence(resume_text))
+
+
+def build_resume_feedback(evidence: Dict) -> Dict:
+    """Score collected resume evidence into the full quality analysis."""
     # Run all analyses
-    action_verbs = analyze_action_verbs(resume_text)
-    soft_skills = detect_soft_skills(resume_text)
-    achievements = analyze_quantified_achievements(resume_text)
-    bullet_points = analyze_bullet_points(resume_text)
+    action_verbs = score_action_verbs(evidence["actionVerbs"])
+    soft_skills = score_soft_skills(evidence["softSkills"])
+    achievements = score_quantified_achievements(
+        [metric for found in evidence["metrics"] for metric in found]
+    )
+    bullet_points = score_bullet_points(evidence["bullets"] or evidence["sentences"][:15])
     
     # Calculate overall score (weighted average)
     overall_score = round(
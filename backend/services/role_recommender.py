@@ -3,16 +3,24 @@ Role Recommender Service
 Suggests suitable internship roles based on user's skills and readiness
 """
 
+import heapq
 import json
 import os
-from typing import Dict, List
-from services.nlp_engine import get_all_skills_flat, normalize_skill
+from typing import Dict, List, Optional, Set, Tuple
+from services.nlp_engine import get_all_skills_flat, normalize_skill, skill_display_name
+from services.skill_taxonomy import get_taxonomy
+from services.skill_embeddings import get_skill_embeddings, partial_match_entries
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Cache for roles data
 _roles_cache: List[Dict] = None
+# Normalized (required, preferred) skill sets per role, keyed by taxonomy version
+_role_skill_sets: Optional[Tuple[str, List[Tuple[Set[str], Set[str]]]]] = None
+
+# Status priority used to break fit score ties
+STATUS_ORDER = {"Ready": 0, "Stretch Goal": 1, "Future": 2}
 
 
 def get_roles_path() -> str:
@@ -43,47 +51,131 @@ def load_roles() -> List[Dict]:
         return []
 
 
+def get_role_skill_sets() -> List[Tuple[Set[str], Set[str]]]:
+    """Get each role's normalized required and preferred skills for the active taxonomy."""
+    global _role_skill_sets
+    
+    version = get_taxonomy().version
+    if _role_skill_sets is not None and _role_skill_sets[0] == version:
+        return _role_skill_sets[1]
+    
+    skill_sets = [
+        (
+            set(normalize_skill(s) for s in role.get("requiredSkills", [])),
+            set(normalize_skill(s) for s in role.get("preferredSkills", []))
+        )
+        for role in load_roles()
+    ]
+    _role_skill_sets = (version, skill_sets)
+    return skill_sets
+
+
+def _fit_score(
+    user_flat: Set[str],
+    required: Set[str],
+    preferred: Set[str],
+    partial_credit: Optional[Dict[str, float]] = None
+) -> int:
+    """Fit score (0-100) from required and preferred skill coverage."""
+    required_covered = len(user_flat & required)
+    preferred_covered = len(user_flat & preferred)
+    if partial_credit:
+        required_covered += sum(partial_credit.get(s, 0.0) for s in required if s not in user_flat)
+        preferred_covered += sum(partial_credit.get(s, 0.0) for s in preferred if s not in user_flat)
+    
+    # Required skills weight more
+    required_score = (required_covered / max(len(required), 1)) * 70
+    preferred_score = (preferred_covered / max(len(preferred), 1)) * 30
+    return round(required_score + preferred_score)
+
+
+def _role_status(readiness_score: int, min_readiness: int) -> str:
+    """Whether a role is within reach for the given readiness score."""
+    if readiness_score >= min_readiness:
+        return "Ready"
+    if min_readiness <= readiness_score + 20:
+        return "Stretch Goal"
+    return "Future"
+
+
 def calculate_role_fit(
     user_skills: Dict[str, List[str]], 
-    role: Dict
+    role: Dict,
+    skill_sets: Optional[Tuple[Set[str], Set[str]]] = None,
+    semantic: bool = False
 ) -> Dict:
     """
     Calculate how well a user fits a specific role.
     
+    Args:
+        user_skills: User's categorized skills
+        role: Role data
+        skill_sets: The role's precomputed normalized (required, preferred) skills
+        semantic: Give partial credit for near-equivalent skills
+    
     Returns:
         Dictionary with fit score and skill analysis
     """
     user_flat = set(normalize_skill(s) for s in get_all_skills_flat(user_skills))
     
-    required = set(normalize_skill(s) for s in role.get("requiredSkills", []))
-    preferred = set(normalize_skill(s) for s in role.get("preferredSkills", []))
+    if skill_sets is not None:
+        required, preferred = skill_sets
+    else:
+        required = set(normalize_skill(s) for s in role.get("requiredSkills", []))
+        preferred = set(normalize_skill(s) for s in role.get("preferredSkills", []))
     
     # Calculate matches
     required_matched = user_flat.intersection(required)
     preferred_matched = user_flat.intersection(preferred)
     required_missing = required - user_flat
     
+    partial_matches = {}
+    partial_credit = None
+    if semantic:
+        embeddings = get_skill_embeddings()
+        partial_matches = embeddings.partial_matches(user_flat, required | preferred)
+        partial_credit = embeddings.partial_credits(partial_matches)
+    
     # Calculate fit score (required skills weight more)
-    required_score = (len(required_matched) / max(len(required), 1)) * 70
-    preferred_score = (len(preferred_matched) / max(len(preferred), 1)) * 30
-    fit_score = round(required_score + preferred_score)
+    fit_score = _fit_score(user_flat, required, preferred, partial_credit)
     
-    return {
+    fit_data = {
         "fitScore": fit_score,
-        "requiredMatched": list(required_matched),
-        "requiredMissing": list(required_missing),
-        "preferredMatched": list(preferred_matched),
+        "requiredMatched": sorted(skill_display_name(s) for s in required_matched),
+        "requiredMissing": sorted(skill_display_name(s) for s in required_missing),
+        "preferredMatched": sorted(skill_display_name(s) for s in preferred_matched),
         "requiredMatchCount": len(required_matched),
         "requiredTotalCount": len(required),
         "preferredMatchCount": len(preferred_matched),
         "preferredTotalCount": len(preferred)
     }
+    if semantic:
+        fit_data["partialMatches"] = partial_match_entries(partial_matches)
+    
+    return fit_data
+
+
+def role_summary(role: Dict) -> Dict:
+    """Get the static description of a role, as served by the role catalog."""
+    return {
+        "id": role.get("id"),
+        "title": role.get("title"),
+        "difficulty": role.get("difficulty"),
+        "description": role.get("description"),
+        "companyTypes": role.get("company_types", []),
+        "avgSalary": role.get("avgSalary"),
+        "growthPath": role.get("growthPath"),
+        "requiredSkills": role.get("requiredSkills", []),
+        "preferredSkills": role.get("preferredSkills", []),
+        "minReadiness": role.get("minReadiness", 0),
+    }
 
 
 def recommend_roles(
     user_skills: Dict[str, List[str]],
     readiness_score: int,
-    max_roles: int = 5
+    max_roles: int = 5,
+    semantic: bool = False
 ) -> List[Dict]:
     """
     Recommend suitable internship roles based on user's profile.
@@ -92,56 +184,59 @@ def recommend_roles(
         user_skills: User's categorized skills
         readiness_score: User's readiness score (0-100)
         max_roles: Maximum number of roles to recommend
+        semantic: Give partial credit for near-equivalent skills
         
     Returns:
         List of recommended roles with fit analysis
     """
     roles = load_roles()
-    recommendations = []
+    skill_sets = get_role_skill_sets()
+    user_flat = set(normalize_skill(s) for s in get_all_skills_flat(user_skills))
     
-    for role in roles:
+    # One similarity pass over the skills of every role
+    partial_credit = None
+    if semantic:
+        embeddings = get_skill_embeddings()
+        role_skills = set()
+        for required, preferred in skill_sets:
+            role_skills.update(required, preferred)
+        partial_credit = embeddings.partial_credits(embeddings.partial_matches(user_flat, role_skills))
+    
+    # Score every role cheaply; (-fit score, status priority, file order) ranks them
+    candidates = []
+    for index, role in enumerate(roles):
         min_readiness = role.get("minReadiness", 0)
         
-        # Calculate fit for each role
-        fit_data = calculate_role_fit(user_skills, role)
-        
-        # Determine if role is suitable
-        is_ready = readiness_score >= min_readiness
-        is_stretch = (min_readiness <= readiness_score + 20) and not is_ready
-        
         # Skip roles that are too far above the user's level
         if readiness_score < min_readiness - 20:
             continue
         
-        recommendation = {
-            "id": role.get("id"),
-            "title": role.get("title"),
-            "difficulty": role.get("difficulty"),
-            "description": role.get("description"),
-            "companyTypes": role.get("company_types", []),
-            "avgSalary": role.get("avgSalary"),
-            "growthPath": role.get("growthPath"),
-            "requiredSkills": role.get("requiredSkills", []),
-            "preferredSkills": role.get("preferredSkills", []),
-            "minReadiness": min_readiness,
+        required, preferred = skill_sets[index]
+        status = _role_status(readiness_score, min_readiness)
+        candidates.append((-_fit_score(user_flat, required, preferred, partial_credit), STATUS_ORDER[status], index))
+    
+    # Partial selection, then build full recommendations only for the returned roles
+    recommendations = []
+    for _, _, index in heapq.nsmallest(max_roles, candidates):
+        role = roles[index]
+        min_readiness = role.get("minReadiness", 0)
+        fit_data = calculate_role_fit(user_skills, role, skill_sets[index], semantic)
+        status = _role_status(readiness_score, min_readiness)
+        
+        recommendations.append({
+            **role_summary(role),
             "fitScore": fit_data["fitScore"],
             "requiredMatched": fit_data["requiredMatched"],
             "requiredMissing": fit_data["requiredMissing"],
             "preferredMatched": fit_data["preferredMatched"],
             "skillCoverage": f"{fit_data['requiredMatchCount']}/{fit_data['requiredTotalCount']}",
-            "status": "Ready" if is_ready else ("Stretch Goal" if is_stretch else "Future"),
-            "statusColor": "green" if is_ready else ("yellow" if is_stretch else "red")
-        }
-        
-        recommendations.append(recommendation)
-    
-    # Sort by fit score (highest first), then by status priority
-    status_order = {"Ready": 0, "Stretch Goal": 1, "Future": 2}
-    recommendations.sort(
-        key=lambda x: (-x["fitScore"], status_order.get(x["status"], 3))
-    )
+            "status": status,
+            "statusColor": {"Ready": "green", "Stretch Goal": "yellow"}.get(status, "red")
+        })
+        if semantic:
+            recommendations[-1]["partialMatches"] = fit_data["partialMatches"]
     
-    return recommendations[:max_roles]
+    return recommendations
 
 
 def get_role_by_id(role_id: str) -> Dict:
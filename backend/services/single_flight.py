@@ -0,0 +1,129 @@
+"""
+Single-Flight Service
+Coalesces identical concurrent computations into one execution whose result every caller shares
+"""
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from services.cache import content_hash
+import logging
+
+logger = logging.getLogger(__name__)
+
+_flights: Dict[str, "SingleFlight"] = {}
+_flights_lock = threading.Lock()
+
+
+def request_key(*parts: Any) -> str:
+    """Hash JSON-serializable request parts into a canonical key (dict key order does not matter)."""
+    return content_hash(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
+
+
+class SingleFlight:
+    """
+    At most one running computation per key.
+
+    The first caller for a key runs the computation; callers arriving with the
+    same key while it runs wait for it instead of starting their own. Every
+    caller, the first one included, gets its own deep copy of the result, so
+    a route adding fields to its copy can't affect one still being copied.
+    Exceptions are shared the same way.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Get the in-flight call for a key, starting one if there is none. Returns (future, is_leader)."""
+        with self._lock:
+            self.calls += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self.executions += 1
+            return future, True
+
+    def _execute(self, key: str, future: Future, fn: Callable, args: tuple):
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            with self._lock:
+                self.failures += 1
+                del self._calls[key]
+            future.set_exception(e)
+        else:
+            with self._lock:
+                del self._calls[key]
+            future.set_result(result)
+
+    @staticmethod
+    def _share(future: Future):
+        return copy.deepcopy(future.result())
+
+    def do(self, key: str, fn: Callable, *args) -> Any:
+        """
+        Run fn(*args) in the calling thread, or wait for the identical call already running.
+
+        Args:
+            key: Canonical request key (see request_key)
+            fn: Computation to run
+            *args: Arguments for fn
+
+        Returns:
+            The computation's result
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._execute(key, future, fn, args)
+        return self._share(future)
+
+    async def do_async(self, key: str, fn: Callable, *args) -> Any:
+        """Like do, but runs the computation in the threadpool and waits without blocking the event loop."""
+        future, leader = self._join(key)
+        if leader:
+            await run_in_threadpool(self._execute, key, future, fn, args)
+        else:
+            # Shielded: a disconnecting waiter must not cancel the call other requests share
+            await asyncio.shield(asyncio.wrap_future(future))
+        return self._share(future)
+
+    def stats(self) -> Dict:
+        """Counters for metrics: every call is either an execution or coalesced into one."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "failures": self.failures,
+                "inFlight": len(self._calls),
+            }
+
+
+def get_flight(name: str) -> SingleFlight:
+    """Get the shared single-flight group for a kind of computation."""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+
+def single_flight_stats() -> Dict[str, Dict]:
+    """Coalescing counters of every single-flight group."""
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
@@ -0,0 +1,216 @@
+"""
+Skill Embedding Service
+Precomputed word-vector matrix over the skill vocabulary for similarity-based partial credit
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config import get_settings
+from services.skill_taxonomy import SkillTaxonomy, get_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Embeddings for the active taxonomy version
+_embeddings: Optional["SkillEmbeddings"] = None
+_embeddings_lock = threading.Lock()
+
+
+class SkillEmbeddings:
+    """
+    Unit-normalized float32 vectors for every canonical skill of one taxonomy version.
+
+    Skills without a word vector get an all-zero row, so they never count as
+    similar to anything. Near-equivalent pairs (cosine similarity at or above
+    the threshold) are found once when the matrix is loaded.
+    """
+
+    def __init__(self, key: str, skill_ids: List[str], matrix: np.ndarray,
+                 threshold: float = 0.65, credit_weight: float = 0.5):
+        self.key = key
+        self.skill_ids = skill_ids
+        self.index: Dict[str, int] = {skill: i for i, skill in enumerate(skill_ids)}
+        self.matrix = matrix
+        self.threshold = threshold
+        self.credit_weight = credit_weight
+
+        # Skill -> near-equivalent skills, from the full vocabulary x vocabulary similarity matrix
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        self.near_equivalents: Dict[str, Dict[str, float]] = {}
+        for i, j in zip(*np.nonzero(similarity >= threshold)):
+            self.near_equivalents.setdefault(skill_ids[i], {})[skill_ids[j]] = float(similarity[i, j])
+
+    def partial_matches(self, user_skills: Iterable[str], targets: Iterable[str]) -> Dict[str, Tuple[str, float]]:
+        """
+        Find the user's closest skill for each target skill they don't have.
+
+        Args:
+            user_skills: User's canonical skill ids
+            targets: Canonical skill ids to match (market, JD or role skills)
+
+        Returns:
+            Target -> (most similar user skill, similarity) for near-equivalent targets only
+        """
+        user_set = set(user_skills)
+        user_ids = [skill for skill in user_set if skill in self.near_equivalents]
+        if not user_ids:
+            return {}
+
+        # Only targets that are near-equivalent to at least one user skill can match
+        candidates = set()
+        for skill in user_ids:
+            candidates.update(self.near_equivalents[skill])
+        target_ids = [skill for skill in dict.fromkeys(targets) if skill in candidates and skill not in user_set]
+        if not target_ids:
+            return {}
+
+        # Target x user cosine similarities in one product
+        user_rows = self.matrix[[self.index[skill] for skill in user_ids]]
+        target_rows = self.matrix[[self.index[skill] for skill in target_ids]]
+        similarity = target_rows @ user_rows.T
+        best = similarity.argmax(axis=1)
+        best_similarity = similarity[np.arange(len(target_ids)), best]
+
+        return {
+            target_ids[i]: (user_ids[best[i]], round(float(best_similarity[i]), 3))
+            for i in np.nonzero(best_similarity >= self.threshold)[0]
+        }
+
+    def credit(self, similarity: float) -> float:
+        """Share of a skill's weight earned through a near-equivalent skill."""
+        return self.credit_weight * similarity
+
+    def partial_credits(self, matches: Dict[str, Tuple[str, float]]) -> Dict[str, float]:
+        """Credit share earned for each partially matched skill."""
+        return {skill: self.credit(similarity) for skill, (_, similarity) in matches.items()}
+
+
+def partial_match_entries(
+    matches: Dict[str, Tuple[str, float]],
+    frequency: Optional[Dict[str, int]] = None
+) -> List[Dict]:
+    """
+    Response entries for partial matches, most similar (or most in-demand) first.
+
+    Args:
+        matches: Target -> (user skill, similarity) from SkillEmbeddings.partial_matches
+        frequency: Market demand per skill, to include and sort by
+
+    Returns:
+        List of {"skill", "similarTo", "similarity"} dicts (plus "frequency" when given)
+    """
+    taxonomy = get_taxonomy()
+    if frequency is not None:
+        order = sorted(matches, key=lambda skill: (-frequency.get(skill, 0), skill))
+    else:
+        order = sorted(matches, key=lambda skill: (-matches[skill][1], skill))
+
+    entries = []
+    for skill in order:
+        user_skill, similarity = matches[skill]
+        entry = {
+            "skill": taxonomy.display_name(skill),
+            "similarTo": taxonomy.display_name(user_skill),
+            "similarity": similarity
+        }
+        if frequency is not None:
+            entry["frequency"] = frequency.get(skill, 0)
+        entries.append(entry)
+    return entries
+
+
+def skill_vocabulary(taxonomy: SkillTaxonomy) -> List[str]:
+    """Every canonical skill id of a taxonomy version, in a stable order."""
+    skills = set(taxonomy.display_names)
+    for patterns in taxonomy.categories.values():
+        skills.update(taxonomy.normalize(pattern) for pattern in patterns)
+    return sorted(skills)
+
+
+def build_embedding_matrix(taxonomy: SkillTaxonomy, skill_ids: List[str]) -> np.ndarray:
+    """
+    Look up the SpaCy vector of each skill's display name and normalize the rows.
+
+    Only the tokenizer runs, so this costs one vocabulary lookup per token.
+    """
+    from services.nlp_engine import get_nlp
+
+    nlp_model = get_nlp()
+    width = nlp_model.vocab.vectors.shape[1] if nlp_model.vocab.vectors.size else 0
+    matrix = np.zeros((len(skill_ids), max(width, 1)), dtype=np.float32)
+
+    if width:
+        for i, skill in enumerate(skill_ids):
+            doc = nlp_model.make_doc(taxonomy.display_name(skill))
+            if doc.has_vector:
+                matrix[i] = doc.vector
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def embeddings_key(taxonomy: SkillTaxonomy) -> str:
+    """Identify an embedding matrix by taxonomy version and SpaCy model."""
+    from services.nlp_engine import get_nlp
+
+    meta = get_nlp().meta
+    return f"{taxonomy.version}:{meta.get('name', '')}-{meta.get('version', '')}"
+
+
+def load_skill_embeddings(taxonomy: SkillTaxonomy) -> SkillEmbeddings:
+    """
+    Load the embedding matrix for a taxonomy version from disk, building and saving it if needed.
+
+    Args:
+        taxonomy: Taxonomy snapshot whose vocabulary to embed
+
+    Returns:
+        Skill embeddings for the taxonomy
+    """
+    settings = get_settings()
+    path = settings.skill_embeddings_path
+    key = embeddings_key(taxonomy)
+
+    if os.path.exists(path):
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["key"]) == key:
+                    logger.info(f"Loaded skill embeddings from {path}")
+                    return SkillEmbeddings(
+                        key, [str(s) for s in data["skills"]], data["matrix"],
+                        settings.skill_similarity_threshold, settings.skill_partial_credit
+                    )
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable skill embeddings file {path}: {e}")
+
+    skill_ids = skill_vocabulary(taxonomy)
+    matrix = build_embedding_matrix(taxonomy, skill_ids)
+
+    try:
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, key=np.array(key), skills=np.array(skill_ids), matrix=matrix)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved embeddings for {len(skill_ids)} skills to {path}")
+    except OSError as e:
+        logger.warning(f"Could not save skill embeddings: {e}")
+
+    return SkillEmbeddings(key, skill_ids, matrix, settings.skill_similarity_threshold, settings.skill_partial_credit)
+
+
+def get_skill_embeddings() -> SkillEmbeddings:
+    """Get the skill embeddings for the active taxonomy version."""
+    global _embeddings
+
+    taxonomy = get_taxonomy()
+    embeddings = _embeddings
+    if embeddings is not None and embeddings.key.startswith(taxonomy.version + ":"):
+        return embeddings
+
+    with _embeddings_lock:
+        if _embeddings is None or not _embeddings.key.startswith(taxonomy.version + ":"):
+            _embeddings = load_skill_embeddings(taxonomy)
+        return _embeddings
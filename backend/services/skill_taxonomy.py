@@ -0,0 +1,282 @@
+"""
+Skill Taxonomy Service
+Loads the skill taxonomy from disk, compiles it into matchers and lookup
+indexes, and hot-swaps new versions without interrupting running requests
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+from config import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Characters dropped for the loose alias lookup ("React JS" -> "reactjs")
+_LOOSE_CHARS = str.maketrans("", "", " .-_")
+_WHITESPACE = re.compile(r'\s+')
+_MEMO_LIMIT = 50000
+
+
+def fold_skill(skill: str) -> str:
+    """Case-fold a skill name and collapse whitespace and stray punctuation."""
+    return _WHITESPACE.sub(" ", skill.casefold()).strip(" ,;:()[]'\"")
+
+
+def loose_skill_key(folded: str) -> str:
+    """Drop separator punctuation from an already folded skill name."""
+    return folded.translate(_LOOSE_CHARS)
+
+
+def validate_taxonomy(data) -> None:
+    """
+    Check the shape of raw taxonomy data before it is compiled.
+
+    Raises:
+        ValueError: If categories or skills are missing, empty or malformed
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Taxonomy must be a JSON object")
+
+    categories = data.get("categories")
+    if not isinstance(categories, dict) or not categories:
+        raise ValueError("Taxonomy 'categories' must be a non-empty object")
+    for category, patterns in categories.items():
+        if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+            raise ValueError(f"Taxonomy category '{category}' must be a list of strings")
+
+    skills = data.get("skills")
+    if not isinstance(skills, dict) or not skills:
+        raise ValueError("Taxonomy 'skills' must be a non-empty object")
+    for canonical, entry in skills.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"Taxonomy skill '{canonical}' must be an object")
+        if not isinstance(entry.get("name", ""), str):
+            raise ValueError(f"Taxonomy skill '{canonical}' has a non-string name")
+        aliases = entry.get("aliases", [])
+        if not isinstance(aliases, list) or not all(isinstance(a, str) for a in aliases):
+            raise ValueError(f"Taxonomy skill '{canonical}' aliases must be a list of strings")
+
+
+class SkillTaxonomy:
+    """
+    Compiled snapshot of the skill taxonomy.
+
+    A request holds on to a single snapshot for its whole lifetime, so a
+    reload only affects requests that start after the swap. The compiled
+    data never changes after construction. The one mutable part is the
+    normalize() memo, which is shared by every thread using the snapshot.
+    Each of its reads, writes and clears is a single dict operation, so a
+    race only costs a recomputed entry.
+    """
+
+    def __init__(self, data: Dict, version: str, source: str = ""):
+        validate_taxonomy(data)
+        self.version = version
+        self.source = source
+        self.categories: Dict[str, List[str]] = {
+            category: [p.lower().strip() for p in patterns]
+            for category, patterns in data.get("categories", {}).items()
+        }
+
+        # Canonical skill registry: canonical id -> display name, alias -> canonical id
+        self.display_names: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        self._loose_aliases: Dict[str, str] = {}
+        self._memo: Dict[str, str] = {}
+
+        for canonical, entry in data.get("skills", {}).items():
+            canonical = fold_skill(canonical)
+            self.display_names[canonical] = entry.get("name") or canonical.title()
+            self._register_alias(canonical, canonical)
+            self._register_alias(entry.get("name", ""), canonical)
+            for alias in entry.get("aliases", []):
+                self._register_alias(alias, canonical)
+
+        # Every taxonomy pattern resolves to itself unless the registry says otherwise
+        for patterns in self.categories.values():
+            for pattern in patterns:
+                self._register_alias(pattern, pattern)
+
+        # Word-boundary matchers compiled once per version instead of per request,
+        # paired with the canonical display name each pattern reports as
+        self.matchers: List[Tuple[str, str, Pattern]] = []
+        # Lower-cased pattern -> categories it belongs to, for entity/noun chunk lookups
+        self.pattern_categories: Dict[str, List[str]] = {}
+
+        for category, patterns in self.categories.items():
+            for pattern in patterns:
+                regex = re.compile(r'\b' + re.escape(pattern) + r'\b')
+                self.matchers.append((category, self.display_name(pattern), regex))
+                self.pattern_categories.setdefault(pattern, []).append(category)
+
+    def _register_alias(self, alias: str, canonical: str):
+        folded = fold_skill(alias)
+        if not folded:
+            return
+        # Explicit registry entries are registered first and win over patterns
+        self.aliases.setdefault(folded, canonical)
+        self._loose_aliases.setdefault(loose_skill_key(folded), canonical)
+
+    def normalize(self, skill: str) -> str:
+        """Map any spelling of a skill to its canonical id using this taxonomy version."""
+        canonical = self._memo.get(skill)
+        if canonical is not None:
+            return canonical
+
+        folded = fold_skill(skill)
+        canonical = self.aliases.get(folded)
+        if canonical is None:
+            canonical = self._loose_aliases.get(loose_skill_key(folded), folded)
+
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[skill] = canonical
+        return canonical
+
+    def display_name(self, skill: str) -> str:
+        """Get the display name for a skill (canonical id or any alias)."""
+        canonical = self.normalize(skill)
+        return self.display_names.get(canonical) or canonical.title()
+
+    def empty_result(self) -> Dict[str, List[str]]:
+        """Get an empty categorized skills dict for this taxonomy."""
+        return {category: [] for category in self.categories}
+
+    def summary(self) -> Dict:
+        """Get a short description of this taxonomy version."""
+        return {
+            "version": self.version,
+            "categories": {category: len(patterns) for category, patterns in self.categories.items()},
+            "totalPatterns": len(self.matchers),
+            "canonicalSkills": len(self.display_names),
+            "aliases": len(self.aliases),
+        }
+
+
+def compute_version(data: Dict) -> str:
+    """Compute a stable content hash used as the taxonomy version id."""
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:12]
+
+
+def compile_taxonomy(data: Dict, source: str = "") -> SkillTaxonomy:
+    """Compile raw taxonomy data into a matcher snapshot."""
+    return SkillTaxonomy(data, compute_version(data), source)
+
+
+def read_taxonomy_file(path: str) -> Dict:
+    """Read raw taxonomy data from a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Active snapshot; replaced by a single reference assignment, which is atomic
+_active: Optional[SkillTaxonomy] = None
+_reload_lock = threading.Lock()
+_pinned: contextvars.ContextVar[Optional[SkillTaxonomy]] = contextvars.ContextVar(
+    "pinned_taxonomy", default=None
+)
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Get the taxonomy for the current request, loading it on first use."""
+    pinned = _pinned.get()
+    if pinned is not None:
+        return pinned
+
+    taxonomy = _active
+    if taxonomy is None:
+        taxonomy = reload_taxonomy()
+    return taxonomy
+
+
+def reload_taxonomy(path: Optional[str] = None, force: bool = False) -> SkillTaxonomy:
+    """
+    Load and compile the taxonomy file, then swap it in if it changed.
+
+    Args:
+        path: Taxonomy file path (defaults to the configured path)
+        force: Swap in the compiled snapshot even if the version is unchanged
+
+    Returns:
+        The active taxonomy snapshot after the reload
+    """
+    global _active
+    path = path or get_settings().taxonomy_path
+
+    with _reload_lock:
+        data = read_taxonomy_file(path)
+        version = compute_version(data)
+        if _active is not None and _active.version == version and not force:
+            return _active
+
+        # Compile fully before publishing so readers never see a partial snapshot
+        taxonomy = SkillTaxonomy(data, version, path)
+        previous = _active.version if _active is not None else None
+        _active = taxonomy
+
+    logger.info(f"Skill taxonomy {version} active ({len(taxonomy.matchers)} patterns, previous: {previous})")
+    return taxonomy
+
+
+@contextmanager
+def pinned_taxonomy(taxonomy: Optional[SkillTaxonomy] = None) -> Iterator[SkillTaxonomy]:
+    """Pin the current (or given) taxonomy snapshot for the duration of a request."""
+    taxonomy = taxonomy or get_taxonomy()
+    token = _pinned.set(taxonomy)
+    try:
+        yield taxonomy
+    finally:
+        _pinned.reset(token)
+
+
+class TaxonomyWatcher:
+    """Background thread that recompiles the taxonomy when its file changes."""
+
+    def __init__(self, path: Optional[str] = None, interval: Optional[float] = None):
+        settings = get_settings()
+        self.path = path or settings.taxonomy_path
+        self.interval = interval if interval is not None else settings.taxonomy_reload_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._mtime: Optional[float] = None
+
+    def start(self):
+        """Start watching the taxonomy file."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._mtime = self._current_mtime()
+        self._thread = threading.Thread(target=self._run, name="taxonomy-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            mtime = self._current_mtime()
+            if mtime is None or mtime == self._mtime:
+                continue
+            self._mtime = mtime
+            try:
+                reload_taxonomy(self.path)
+            except Exception as e:
+                # Keep serving the previous version (and watching) if the new file is broken
+                logger.error(f"Failed to reload skill taxonomy: {e}")
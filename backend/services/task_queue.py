@@ -0,0 +1,309 @@
+"""
+Task Queue Service
+Durable SQLite-backed queue for running heavy analyses asynchronously
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    lease_expires_at REAL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_claim_idx ON tasks (status, priority DESC, available_at, created_at);
+"""
+
+
+class PermanentTaskError(Exception):
+    """Raised by a handler when retrying the task cannot succeed (e.g. invalid input)."""
+
+
+class TaskQueue:
+    """
+    Durable priority queue stored in a SQLite file.
+
+    Tasks survive restarts; a task whose worker died is re-queued once its
+    lease runs out (or failed, when that was its last attempt). Running tasks
+    renew their lease, and only the holder of the current lease can record an
+    outcome, so a task that outlived its lease can't overwrite the rerun's.
+    Finished results are kept for result_ttl seconds.
+    """
+
+    def __init__(self, path: str, result_ttl: float = 3600.0, lease_seconds: float = 300.0):
+        self.path = path
+        self.result_ttl = result_ttl
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._available = threading.Event()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the queue database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict, priority: int = 0, max_attempts: int = 3) -> str:
+        """Add a task to the queue and return its id."""
+        task_id = uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO tasks (id, kind, payload, priority, status, max_attempts, created_at, updated_at, available_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (task_id, kind, json.dumps(payload), priority, QUEUED, max(max_attempts, 1), now, now, now)
+        )
+        self.notify()
+        return task_id
+
+    def claim(self) -> Optional[Dict]:
+        """Atomically take the highest-priority runnable task, or None if there is none."""
+        conn = self._connection()
+        now = time.time()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Tasks whose worker disappeared go back to the queue, unless that was their last attempt
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ?, expires_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                (FAILED, "Worker stopped responding on the last attempt", now, now + self.result_ttl, RUNNING, now)
+            )
+            conn.execute(
+                "UPDATE tasks SET status = ?, lease_expires_at = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ?",
+                (QUEUED, now, RUNNING, now)
+            )
+            row = conn.execute(
+                "SELECT * FROM tasks WHERE status = ? AND available_at <= ? "
+                "ORDER BY priority DESC, available_at, created_at LIMIT 1",
+                (QUEUED, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE tasks SET status = ?, attempts = attempts + 1, lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (RUNNING, now + self.lease_seconds, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        task = dict(row)
+        task["attempts"] += 1
+        task["lease_expires_at"] = now + self.lease_seconds
+        task["payload"] = json.loads(task["payload"])
+        return task
+
+    def renew(self, task: Dict) -> bool:
+        """Extend a running task's lease. Returns False when the lease was lost (expired and re-claimed)."""
+        lease = time.time() + self.lease_seconds
+        cursor = self._connection().execute(
+            "UPDATE tasks SET lease_expires_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = ? AND lease_expires_at = ?",
+            (lease, time.time(), task["id"], RUNNING, task["lease_expires_at"])
+        )
+        if cursor.rowcount:
+            task["lease_expires_at"] = lease
+        return bool(cursor.rowcount)
+
+    def complete(self, task: Dict, result) -> bool:
+        """Store a task's result and mark it done. Returns False when the task's lease was lost."""
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_expires_at = NULL, "
+            "updated_at = ?, expires_at = ? WHERE id = ? AND status = ? AND lease_expires_at = ?",
+            (DONE, json.dumps(result), now, now + self.result_ttl, task["id"], RUNNING, task["lease_expires_at"])
+        )
+        return bool(cursor.rowcount)
+
+    def fail(self, task: Dict, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt, re-queueing the task with backoff while attempts remain.
+        Returns False when the task's lease was lost.
+        """
+        now = time.time()
+        if retry and task["attempts"] < task["max_attempts"]:
+            backoff = 2 ** task["attempts"]
+            cursor = self._connection().execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ?, "
+                "available_at = ? WHERE id = ? AND status = ? AND lease_expires_at = ?",
+                (QUEUED, error, now, now + backoff, task["id"], RUNNING, task["lease_expires_at"])
+            )
+        else:
+            cursor = self._connection().execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ?, "
+                "expires_at = ? WHERE id = ? AND status = ? AND lease_expires_at = ?",
+                (FAILED, error, now, now + self.result_ttl, task["id"], RUNNING, task["lease_expires_at"])
+            )
+        return bool(cursor.rowcount)
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        """Get a task's status and, once done, its result."""
+        row = self._connection().execute(
+            "SELECT id, kind, priority, status, attempts, max_attempts, result, error, "
+            "created_at, updated_at, expires_at FROM tasks WHERE id = ?",
+            (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        task = dict(row)
+        if task["expires_at"] is not None and task["expires_at"] < time.time():
+            return None
+        task["result"] = json.loads(task["result"]) if task["result"] is not None else None
+        return task
+
+    def position(self, task_id: str) -> Optional[int]:
+        """Number of queued tasks that will run before this one."""
+        row = self._connection().execute(
+            "SELECT priority, available_at, created_at FROM tasks WHERE id = ? AND status = ?",
+            (task_id, QUEUED)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM tasks WHERE status = ? AND (priority > ? OR "
+            "(priority = ? AND (available_at < ? OR (available_at = ? AND created_at < ?))))",
+            (QUEUED, row["priority"], row["priority"], row["available_at"], row["available_at"], row["created_at"])
+        ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        """Delete finished tasks whose results have expired."""
+        cursor = self._connection().execute(
+            "DELETE FROM tasks WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),)
+        )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in each status."""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def notify(self):
+        """Wake up workers waiting for tasks."""
+        self._available.set()
+
+    def wait_for_work(self, timeout: float):
+        """Block until a task may be available (or the timeout passes)."""
+        self._available.wait(timeout)
+        self._available.clear()
+
+
+class TaskWorkerPool:
+    """Worker threads that pull tasks from a queue and run the registered handler for each kind."""
+
+    def __init__(self, queue: TaskQueue, handlers: Dict[str, Callable[[Dict], Dict]], workers: int = 2,
+                 poll_interval: float = 1.0):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"task-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop taking new tasks and wait for running ones to finish."""
+        self._stop.set()
+        self.queue.notify()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        last_purge = 0.0
+        while not self._stop.is_set():
+            if time.time() - last_purge > 60:
+                self.queue.purge_expired()
+                last_purge = time.time()
+
+            task = self.queue.claim()
+            if task is None:
+                self.queue.wait_for_work(self.poll_interval)
+                continue
+            self.run_task(task)
+
+    def _keep_lease(self, task: Dict, done: threading.Event):
+        """Renew a running task's lease until it finishes (heartbeat thread)."""
+        interval = self.queue.lease_seconds / 3
+        while not done.wait(interval):
+            try:
+                if not self.queue.renew(task):
+                    logger.warning(f"Task {task['id']} lost its lease; its outcome will be discarded")
+                    return
+            except Exception as e:
+                logger.error(f"Renewing the lease of task {task['id']} failed: {e}")
+
+    def run_task(self, task: Dict):
+        """Run one claimed task and record its outcome."""
+        handler = self.handlers.get(task["kind"])
+        if handler is None:
+            self.queue.fail(task, f"Unknown task kind: {task['kind']}", retry=False)
+            return
+
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._keep_lease, args=(task, done), name=f"task-lease-{task['id'][:8]}", daemon=True
+        )
+        heartbeat.start()
+        started = time.perf_counter()
+        result, error, retry = None, None, True
+        try:
+            result = handler(task["payload"])
+        except PermanentTaskError as e:
+            logger.warning(f"Task {task['id']} ({task['kind']}) rejected: {e}")
+            error, retry = str(e), False
+        except Exception as e:
+            logger.error(f"Task {task['id']} ({task['kind']}) attempt {task['attempts']} failed: {e}", exc_info=True)
+            error = str(e)
+        finally:
+            done.set()
+            heartbeat.join()
+
+        recorded = self.queue.fail(task, error, retry) if error is not None else self.queue.complete(task, result)
+        if not recorded:
+            logger.warning(f"Task {task['id']} ({task['kind']}) finished after losing its lease; outcome discarded")
+            return
+        if error is None:
+            logger.info(f"Task {task['id']} ({task['kind']}) done in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,98 @@
+"""
+Text Segmentation Helpers
+Splits documents into paragraph/sentence-aligned segments of bounded size
+"""
+
+import re
+from typing import List
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_segments(text: str, max_chars: int = 800) -> List[str]:
+    """
+    Split text into paragraph-aligned segments of at most max_chars.
+
+    Paragraphs are kept whole when they fit; longer ones are split on lines,
+    then sentences, then whitespace, and packed back up to the size limit.
+
+    Args:
+        text: Input text
+        max_chars: Maximum segment length in characters
+
+    Returns:
+        List of non-empty segments in document order
+    """
+    segments = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            segments.append(paragraph)
+            continue
+
+        lines = [line.strip() for line in paragraph.splitlines() if line.strip()]
+        segments.extend(_pack(lines, max_chars, "\n"))
+
+    return segments
+
+
+def split_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars, packing whole paragraphs together.
+
+    Unlike split_segments, consecutive paragraphs share a chunk as long as they
+    fit, so a long document yields as few chunks as the size limit allows.
+    """
+    return _pack(split_segments(text, max_chars), max_chars, "\n\n")
+
+
+def _pack(pieces: List[str], max_chars: int, separator: str) -> List[str]:
+    """Pack pieces into chunks of at most max_chars, splitting oversized pieces further."""
+    chunks = []
+    current = ""
+
+    for piece in pieces:
+        if len(piece) > max_chars:
+            if separator == "\n":
+                smaller = _pack(_SENTENCE_BREAK.split(piece), max_chars, " ")
+            else:
+                smaller = _split_words(piece, max_chars)
+        else:
+            smaller = [piece]
+
+        for part in smaller:
+            if current and len(current) + len(separator) + len(part) > max_chars:
+                chunks.append(current)
+                current = part
+            else:
+                current = current + separator + part if current else part
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_words(text: str, max_chars: int) -> List[str]:
+    """Split a run-on piece of text on whitespace, hard-cutting words longer than max_chars."""
+    chunks = []
+    current = ""
+
+    for word in text.split():
+        while len(word) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            chunks.append(current)
+            current = word
+        else:
+            current = current + " " + word if current else word
+
+    if current:
+        chunks.append(current)
+    return chunks
@@ -14,43 +14,36 @@ export async function POST(request: NextRequest) {
             );
         }
 
-        // Fetch job descriptions from database (filtered by domain if provided)
-        const jobs = await prisma.job.findMany({
-            where: domain ? { domain } : undefined,
-            select: {
-                id: true,
-                title: true,
-                company: true,
-                domain: true,
-                extractedSkills: true,
-            },
-        });
-
-        // If no jobs found, send null to trigger backend mock data
-        const jobsToSend = jobs.length === 0 ? null : jobs;
-
-        if (jobs.length === 0) {
-            console.warn('No jobs found in database, backend will use mock data');
-        }
-
-        // Call Python backend for gap analysis
-        const analysis = await pythonClient.analyzeGap(
-            userSkills,
-            jobsToSend,
-            domain
-        );
+        // The backend reads the domain's jobs from the database itself (falling back to its
+        // built-in market data), so they are no longer loaded here and sent in the request
+        const analysis = await pythonClient.analyzeGap(userSkills, null, domain);
 
         // Store analysis result in database if userId is provided and is not a guest
         if (userId && !userId.startsWith('guest')) {
-            await prisma.analysisResult.create({
+            const saved = await prisma.analysisResult.create({
                 data: {
                     userId,
+                    domain,
                     readinessScore: analysis.readinessScore,
+                    extractedSkills: userSkills,
                     matchedSkills: analysis.matchedSkills,
                     missingSkills: analysis.missingSkills,
                     generatedRoadmap: JSON.stringify(analysis.generatedRoadmap), // Convert to string as per schema
                 },
             });
+
+            // Keep candidate search current; the backend also picks up new rows on its next sync.
+            // Without a key the candidate endpoints are disabled.
+            if (process.env.CANDIDATE_API_KEY) {
+                pythonClient
+                    .indexCandidate(userId, {
+                        extractedSkills: userSkills,
+                        readinessScore: analysis.readinessScore,
+                        domain,
+                        analysisId: saved.id,
+                    })
+                    .catch((error) => console.warn('Failed to index candidate:', error.message));
+            }
         }
 
         return NextResponse.json(analysis);
@@ -104,6 +104,23 @@ class PythonClient {
         }
     }
 
+    async indexCandidate(
+        userId: string,
+        profile: { extractedSkills: any; readinessScore: number; domain?: string; analysisId?: string }
+    ) {
+        try {
+            // Server-side only: the key is not exposed to the browser
+            const response = await this.jsonClient.put(
+                `/api/candidates/${encodeURIComponent(userId)}`,
+                profile,
+                { headers: { 'X-API-Key': process.env.CANDIDATE_API_KEY ?? '' } }
+            );
+            return response.data;
+        } catch (error) {
+            throw this.handleError(error);
+        }
+    }
+
     async getResumeFeedback(resumeText: string) {
         try {
             const response = await this.jsonClient.post('/api/resume-feedback', {